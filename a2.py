@@ -1,12 +1,22 @@
+import copy
+import heapq
+import itertools
 import math
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from typing import Callable, Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator, Mapping, NamedTuple, Optional, Union
 
 from support import *
 
 # Implement the classes, methods & functions described in the task sheet here
 
+NO_EFFECT: Mapping[str, int] = MappingProxyType({})  # Shared, read-only empty effect table
+
 
 '''4.1.1 Weapon()'''
 class Weapon:
@@ -14,13 +24,20 @@ class Weapon:
     Represents an abstract weapon class that provides basic properties and behaviors
     for all weapons in the game. Specific weapons should inherit from this class and
     override relevant attributes.
+
+    Weapons hold no per-instance state: their properties are class attributes and
+    their effect tables are shared read-only mappings. Targets, their offsets and
+    the weapon's reach are worked out once per class from its _range. A subclass
+    that still sets _range on the instance in __init__ gets the targets of that
+    range from get_targets, and the model takes its slower, general path for it.
     """
+    __slots__ = ()
 
-    def __init__(self):
-        self._name = "AbstractWeapon"  # Name of the weapon
-        self._symbol = WEAPON_SYMBOL  # Symbol used to represent the weapon
-        self._effect = {}  # Dictionary of effects the weapon can apply
-        self._range = 0  # The range of the weapon's effect
+    _name = "AbstractWeapon"  # Name of the weapon
+    _symbol = WEAPON_SYMBOL  # Symbol used to represent the weapon
+    _effect = NO_EFFECT  # Effects the weapon can apply
+    _range = 0  # The range of the weapon's effect
+    _reach = 0  # The largest Manhattan distance of a target, set per subclass
 
     def get_name(self) -> str:
         """
@@ -34,13 +51,19 @@ class Weapon:
         """
         return self._symbol
 
-    def get_effect(self) -> dict[str, int]:
+    def get_effect(self) -> Mapping[str, int]:
         """
-        Returns a dictionary containing the effects of the weapon.
+        Returns a read-only mapping containing the effects of the weapon.
         For example, {'poison': 2} would mean the weapon applies poison damage.
         """
         return self._effect
 
+    def get_range(self) -> int:
+        """
+        Returns how many cells along its row and column the weapon reaches.
+        """
+        return self._range
+
     def get_targets(self, position: Position) -> list[Position]:
         """
         Returns a list of positions that the weapon can target based on its range.
@@ -52,17 +75,56 @@ class Weapon:
         Returns:
             list[Position]: A list of positions that the weapon can target.
         """
-        targets = []
-
         row, column = position
+        if self._range != type(self)._range:  # Range set on the instance
+            offsets = self._get_cross_offsets(self._range)
+        else:
+            offsets = self.get_target_offsets()
+        return [(row + d_row, column + d_col) for d_row, d_col in offsets]
+
+    @staticmethod
+    def _get_cross_offsets(weapon_range: int) -> tuple[Position, ...]:
+        """
+        Returns the offsets of the cells in the same row and column within the range.
+        """
+        offsets = []
+        for i in range(1, weapon_range + 1):
+            offsets.extend(((i, 0), (-i, 0), (0, i), (0, -i)))
+        return tuple(offsets)
+
+    @classmethod
+    def get_target_offsets(cls) -> tuple[Position, ...]:
+        """
+        Returns the offsets of the targets from the weapon's position, in the order
+        get_targets lists them. They are worked out once per weapon class.
+
+        Returns:
+            tuple[Position, ...]: The (row, column) offsets of the targets.
+        """
+        offsets = cls.__dict__.get('_target_offsets')
+        if offsets is None:
+            offsets = cls._get_cross_offsets(cls._range)
+            cls._target_offsets = offsets
+        return offsets
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Works out the reach of each weapon class when it is defined.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._reach = max((abs(d_row) + abs(d_col) for d_row, d_col in cls.get_target_offsets()),
+                         default=0)
+
+    @classmethod
+    def get_reach(cls) -> int:
+        """
+        Returns the largest Manhattan distance from the weapon's position to one of
+        its target offsets. Nothing farther away can be hit.
 
-        # Add all target positions within the weapon's range
-        for i in range(1, self._range + 1):
-            targets.append((row + i, column))
-            targets.append((row - i, column))
-            targets.append((row, column + i))
-            targets.append((row, column - i))
-        return targets
+        Returns:
+            int: The reach of the weapon.
+        """
+        return cls._reach
 
     def __str__(self):
         """
@@ -83,13 +145,12 @@ class PoisonDart(Weapon):
     Represents a specific type of weapon called PoisonDart.
     This weapon applies poison damage to its target.
     """
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._name = 'PoisonDart'  # Name of the weapon
-        self._symbol = POISON_DART_SYMBOL  # Symbol of PoisonDart
-        self._effect = {'poison': 2}  # Effect of the PoisonDart
-        self._range = 2  # The range of the PoisonDart
+    _name = 'PoisonDart'  # Name of the weapon
+    _symbol = POISON_DART_SYMBOL  # Symbol of PoisonDart
+    _effect = MappingProxyType({'poison': 2})  # Effect of the PoisonDart
+    _range = 2  # The range of the PoisonDart
 
     def __repr__(self):
         """
@@ -104,13 +165,12 @@ class PoisonSword(Weapon):
     Represents a specific type of weapon called PoisonSword.
     This weapon applies both regular damage and poison damage to its target.
     """
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._name = 'PoisonSword'  # Name of the weapon
-        self._symbol = POISON_SWORD_SYMBOL  # Symbol of the PoisonSword
-        self._effect = {'damage': 2, 'poison': 1}  # Effect of the PoisonSword
-        self._range = 1  # The range of the PoisonSword
+    _name = 'PoisonSword'  # Name of the weapon
+    _symbol = POISON_SWORD_SYMBOL  # Symbol of the PoisonSword
+    _effect = MappingProxyType({'damage': 2, 'poison': 1})  # Effect of the PoisonSword
+    _range = 1  # The range of the PoisonSword
 
     def __repr__(self):
         """
@@ -126,12 +186,12 @@ class HealingRock(Weapon):
     Represents a specific type of weapon called HealingRock.
     This weapon heals its target when used.
     """
-    def __init__(self):
-        super().__init__()
-        self._name = 'HealingRock'  # Name of the weapon
-        self._symbol = HEALING_ROCK_SYMBOL  # Symbol of HealingRock
-        self._effect = {'healing': 2}  # Effect of the HealingRock
-        self._range = 2  # The range of the HealingRock
+    __slots__ = ()
+
+    _name = 'HealingRock'  # Name of the weapon
+    _symbol = HEALING_ROCK_SYMBOL  # Symbol of HealingRock
+    _effect = MappingProxyType({'healing': 2})  # Effect of the HealingRock
+    _range = 2  # The range of the HealingRock
 
     def __repr__(self):
         """
@@ -146,6 +206,8 @@ class Tile:
     Represents a tile in the dungeon map. A tile can either be blocking or non-blocking,
     and can optionally hold a weapon. Tiles are used to build the dungeon environment.
     """
+    __slots__ = ('_symbol', '_is_blocking', '_weapon')  # One tile per cell, so no __dict__
+
     def __init__(self, symbol: str, is_blocking: bool) -> None:
         """
         Initializes a Tile with a symbol and blocking property.
@@ -178,7 +240,9 @@ class Tile:
 
     def set_weapon(self, weapon: Weapon) -> None:
         """
-        Sets a weapon on the tile.
+        Sets a weapon on the tile. The tiles of a game should be given weapons through
+        SlugDungeonModel.set_tile_weapon instead, which keeps the model's occupancy
+        flags in step with them.
 
         Args:
             weapon (Weapon): The weapon to place on the tile.
@@ -216,7 +280,29 @@ class Tile:
         return f"Tile('{self._symbol}', {self._is_blocking})"
 
 
+# Weapons carry no state, so every weapon lying on a tile shares one instance per kind
+TILE_WEAPONS: dict[str, Weapon] = {
+    POISON_DART_SYMBOL: PoisonDart(),
+    POISON_SWORD_SYMBOL: PoisonSword(),
+    HEALING_ROCK_SYMBOL: HealingRock(),
+}
+
+
 # 4.1.6 create_tile(symbol: str) -> Tile
+def get_weapon_kind(weapon: Optional[Weapon]) -> Optional[tuple[type, int]]:
+    """
+    Returns what tells a weapon apart from others: its class and its range. Weapons
+    have no other state, so two weapons of the same kind behave the same.
+
+    Args:
+        weapon (Optional[Weapon]): The weapon, or None for no weapon.
+
+    Returns:
+        Optional[tuple[type, int]]: The class and range of the weapon, or None.
+    """
+    return None if weapon is None else (type(weapon), weapon.get_range())
+
+
 def create_tile(symbol: str) -> Tile:
     """
     Creates a Tile object based on the given symbol.
@@ -241,14 +327,9 @@ def create_tile(symbol: str) -> Tile:
         return Tile(FLOOR_TILE, False)  # Non-blocking tile for player start position
     elif symbol in [NICE_SLUG_SYMBOL, ANGRY_SLUG_SYMBOL, SCARED_SLUG_SYMBOL]:
         return Tile(FLOOR_TILE, False)  # Non-blocking tile for slug positions
-    elif symbol in [POISON_DART_SYMBOL, POISON_SWORD_SYMBOL, HEALING_ROCK_SYMBOL]:
+    elif symbol in TILE_WEAPONS:
         tile = Tile(FLOOR_TILE, False)  # Non-blocking tile with a weapon
-        if symbol == POISON_DART_SYMBOL:
-            tile.set_weapon(PoisonDart())
-        elif symbol == POISON_SWORD_SYMBOL:
-            tile.set_weapon(PoisonSword())
-        elif symbol == HEALING_ROCK_SYMBOL:
-            tile.set_weapon(HealingRock())
+        tile.set_weapon(TILE_WEAPONS[symbol])
         return tile
     else:
         return Tile(FLOOR_TILE, False)  # Default to non-blocking floor tile
@@ -292,6 +373,15 @@ class Entity:
         """
         return "Entity"
 
+    def get_max_health(self) -> int:
+        """
+        Returns the most health the entity can be healed to.
+
+        Returns:
+            int: The maximum health of the entity.
+        """
+        return self._max_health
+
     def get_health(self) -> int:
         """
         Returns the current health of the entity.
@@ -342,23 +432,23 @@ class Entity:
             return self._weapon.get_targets(position)
         return []
 
-    def get_weapon_effect(self) -> dict[str, int]:
+    def get_weapon_effect(self) -> Mapping[str, int]:
         """
         Returns the effects of the equipped weapon, if any.
 
         Returns:
-            dict[str, int]: A dictionary of the weapon's effects.
+            Mapping[str, int]: A read-only mapping of the weapon's effects.
         """
         if self._weapon:
             return self._weapon.get_effect()
-        return {}
+        return NO_EFFECT
 
-    def apply_effects(self, effects: dict[str, int]) -> None:
+    def apply_effects(self, effects: Mapping[str, int]) -> None:
         """
         Applies a set of effects to the entity. Effects can include damage, healing, or poison.
 
         Args:
-            effects (dict[str, int]): A dictionary of effects to apply (e.g., {'damage': 2, 'poison': 1}).
+            effects (Mapping[str, int]): The effects to apply (e.g., {'damage': 2, 'poison': 1}).
         """
         if 'damage' in effects:
             self._health = max(0, self._health - effects['damage'])
@@ -508,6 +598,25 @@ class Slug(Entity):
         """
         raise NotImplementedError("Slug subclasses must implement a choose_move method.")
 
+    def choose_move_with_field(self, candidates: list[Position], current_position: Position,
+                               player_position: Position,
+                               distance: Callable[[Position], float]) -> Position:
+        """
+        Determines the slug's movement when the model's distance field AI is turned on.
+        By default the distance field is ignored and choose_move decides.
+
+        Args:
+            candidates (list[Position]): List of valid positions the slug can move to.
+            current_position (Position): The slug's current position.
+            player_position (Position): The player's current position.
+            distance (Callable[[Position], float]): The walking distance from a cell to
+                the player.
+
+        Returns:
+            Position: The chosen position to move to.
+        """
+        return self.choose_move(candidates, current_position, player_position)
+
     def can_move(self) -> bool:
         """
         Determines if the slug can move on this turn.
@@ -665,6 +774,31 @@ class AngrySlug(Slug):
         (pos[0] - player_position[0]) ** 2 + (pos[1] - player_position[1]) ** 2, pos))
         return closest_position
 
+    def choose_move_with_field(self, candidates: list[Position], current_position: Position,
+                               player_position: Position,
+                               distance: Callable[[Position], float]) -> Position:
+        """
+        Determines the AngrySlug's movement by walking distance. The slug moves to the
+        position that is closest to the player around walls; Euclidean distance then
+        breaks ties.
+
+        Args:
+            candidates (list[Position]): List of valid positions the slug can move to.
+            current_position (Position): The AngrySlug's current position.
+            player_position (Position): The player's current position.
+            distance (Callable[[Position], float]): The walking distance from a cell to
+                the player.
+
+        Returns:
+            Position: The position closest to the player. If no valid positions, returns the current position.
+        """
+        if not candidates:
+            return current_position
+
+        return min(candidates, key=lambda pos: (
+            distance(pos),
+            (pos[0] - player_position[0]) ** 2 + (pos[1] - player_position[1]) ** 2, pos))
+
     def get_symbol(self) -> str:
         """
         Returns the symbol "A" that represents an AngrySlug.
@@ -760,6 +894,30 @@ class ScaredSlug(Slug):
         furthest_position = max(candidates, key=lambda pos: self.distance(pos, player_position))
         return furthest_position
 
+    def choose_move_with_field(self, candidates: list[Position], current_position: Position,
+                               player_position: Position,
+                               distance: Callable[[Position], float]) -> Position:
+        """
+        Determines the ScaredSlug's movement by walking distance. The slug moves to the
+        position that is farthest from the player around walls; Euclidean distance then
+        breaks ties.
+
+        Args:
+            candidates (list[Position]): List of valid positions the slug can move to.
+            current_position (Position): The ScaredSlug's current position.
+            player_position (Position): The player's current position.
+            distance (Callable[[Position], float]): The walking distance from a cell to
+                the player.
+
+        Returns:
+            Position: The position farthest from the player. If no valid positions, returns the current position.
+        """
+        if not candidates:
+            return current_position
+
+        return max(candidates, key=lambda pos: (distance(pos),
+                                                self.distance(pos, player_position)))
+
     def get_symbol(self) -> str:
         """
         Returns the symbol "L" that represents a ScaredSlug.
@@ -806,15 +964,145 @@ class ScaredSlug(Slug):
         return f"ScaredSlug()"
 
 
+# Occupancy flags stored per cell in SlugDungeonModel._occupancy
+WALL_CELL = 1
+GOAL_CELL = 2
+WEAPON_CELL = 4
+SLUG_CELL = 8
+PLAYER_CELL = 16
+SLUG_BLOCKING = WALL_CELL | SLUG_CELL | PLAYER_CELL  # Cells a slug cannot move into
+PLAYER_BLOCKING = WALL_CELL | SLUG_CELL  # Cells the player cannot move into
+
+
+class ModelSnapshot(NamedTuple):
+    """
+    The mutable state of a SlugDungeonModel at one moment, as taken by snapshot().
+    """
+    player_state: tuple[int, int, Optional[Weapon]]  # Health, poison and weapon
+    player_position: Position
+    player_past_position: Position
+    slugs: tuple[tuple[Position, Slug, int, int, bool], ...]  # Position, slug, health, poison, can move
+    tile_weapons: dict[Position, Optional[Weapon]]  # Weapons on the cells the game has changed
+
+
+# Outcomes of a game
+WON = "won"
+LOST = "lost"
+UNFINISHED = "unfinished"
+
+
+class MovesResult(NamedTuple):
+    """
+    The state of the game after handle_player_moves().
+    """
+    outcome: str  # WON, LOST or UNFINISHED
+    moves: int  # Number of moves handled, up to and including the one that ended the game
+    player_position: Position
+    player_health: int
+    slugs_left: int
+
+
+class Moved(NamedTuple):
+    """
+    An entity moved to another cell.
+    """
+    entity: Entity
+    old_position: Position
+    new_position: Position
+
+
+class Attacked(NamedTuple):
+    """
+    An entity's weapon hit another entity. Its effects follow as separate events.
+    """
+    attacker: Entity
+    attacker_position: Position
+    target: Entity
+    target_position: Position
+    weapon: Weapon
+
+
+class Damaged(NamedTuple):
+    """
+    An entity's health changed, from a weapon or poison.
+    """
+    entity: Entity
+    position: Position
+    amount: int  # Health lost, negative if the entity was healed
+    health: int  # Health left
+
+
+class Poisoned(NamedTuple):
+    """
+    An entity's poison level went up.
+    """
+    entity: Entity
+    position: Position
+    amount: int  # Poison added
+    poison: int  # Poison level now
+
+
+class Died(NamedTuple):
+    """
+    An entity's health fell to 0.
+    """
+    entity: Entity
+    position: Position
+
+
+class Removed(NamedTuple):
+    """
+    A slug was taken off the map, still alive, because a later slug moved onto the
+    same cell in the same turn.
+    """
+    entity: Entity
+    position: Position
+
+
+class WeaponDropped(NamedTuple):
+    """
+    A dying slug left its weapon on its cell.
+    """
+    position: Position
+    weapon: Weapon
+
+
+class WeaponPickedUp(NamedTuple):
+    """
+    The player picked up the weapon lying on the cell it moved to.
+    """
+    entity: Entity
+    position: Position
+    weapon: Weapon
+
+
+class TurnEnded(NamedTuple):
+    """
+    Every slug has taken its turn.
+    """
+    player_position: Position
+    slugs_left: int
+
+
+ModelEvent = Union[Moved, Attacked, Damaged, Poisoned, Died, Removed, WeaponDropped,
+                   WeaponPickedUp, TurnEnded]
+EventListener = Callable[[ModelEvent], None]
+
+
 #4.1.13 SlugDungeonModel()
 class SlugDungeonModel:
     """
     Represents the game model for the Slug Dungeon. This model handles the game's
     core mechanics including player actions, slug movements, attacks, and turn-based
     interactions.
+
+    The model keeps flags of what occupies every cell in step with its tiles, so the
+    weapons on its tiles must be changed with set_tile_weapon. A weapon put straight
+    on a tile from get_tile is not seen by the player or by attacks.
     """
     def __init__(self, tiles: list[list[Tile]], slugs: dict[Position, Slug],
-                 player: Player, player_position: Position) -> None:
+                 player: Player, player_position: Position,
+                 terrain: Optional[bytearray] = None, shared_tiles: bool = False) -> None:
         """
         Initializes the SlugDungeonModel with the game board, slugs, player,
         and the player's starting position.
@@ -824,13 +1112,166 @@ class SlugDungeonModel:
             slugs (dict[Position, Slug]): A dictionary mapping positions to slug entities.
             player (Player): The player entity in the game.
             player_position (Position): The starting position of the player.
-        """
-        self._tiles = tiles  # The dungeon map
+            terrain (Optional[bytearray]): The wall, goal and weapon flags of every cell,
+                row by row, if already known. The model takes ownership of it and adds
+                the slug and player flags. Any writable buffer of bytes will do, such as
+                a memoryview of a copy-on-write file mapping. When omitted it is built
+                from the tiles.
+            shared_tiles (bool): Whether the rows and tiles are shared with other models
+                and must be copied before the model changes them.
+        """
+        self._tiles = list(tiles) if shared_tiles else tiles  # The dungeon map
+        # Rows and cells copied from shared tiles, or None if the model owns all its tiles
+        self._copied_rows: Optional[set[int]] = set() if shared_tiles else None
+        self._copied_tiles: set[Position] = set()
+        self._original_weapons: dict[Position, Optional[Weapon]] = {}  # Before the game changed them
+        self._tile_weapons: dict[Position, Optional[Weapon]] = {}  # Now, on the same cells
         self._slugs = slugs  # Dictionary of slug entities and their positions
+        self._slug_positions = {slug: pos for pos, slug in slugs.items()}  # Reverse index
         self._player = player  # The player entity
         self._player_position = player_position  # Current position of the player
         self._dimensions = (len(tiles), len(tiles[0]))  # Dimensions of the dungeon map
         self._player_past_position = player_position  # Track player's past position
+        # Cells changed since the view last asked, or None until a view first asks
+        self._changed_cells: Optional[set[Position]] = None
+        self._hit_cells: dict[type, frozenset[int]] = {}  # Cells each weapon kind hits the player from
+        self._hit_cells_position: Optional[Position] = None  # Player position _hit_cells is for
+        self._flow_field_ai = False  # Whether slugs move by walking distance instead of Euclidean
+        self._move_recorder: Optional[Callable[[Position], None]] = None  # Told of every player move
+        self._listeners: list[EventListener] = []  # Told of every event, see add_listener()
+        # Active region simulation, see set_active_radius()
+        self._active_radius: Optional[int] = None  # Slugs farther from the player lie dormant
+        self._turn = 0  # Turns ended with the active region on
+        self._slug_buckets: dict[tuple[int, int], set[Position]] = {}  # Slug positions by bucket
+        self._slug_order: dict[Slug, int] = {}  # The order slugs take their turns in
+        self._active_slugs: set[Slug] = set()  # Slugs that took the last turn
+        self._dormant: dict[Slug, tuple[int, int]] = {}  # Turn caught up to and sleep number
+        self._deaths: list[tuple[int, int, Slug]] = []  # Heap of poison deaths of dormant slugs
+        self._sleeps = 0  # Sleep numbers handed out, to tell stale deaths apart
+        self._build_occupancy(terrain)
+
+    def _build_occupancy(self, terrain: Optional[bytearray] = None) -> None:
+        """
+        Builds the flat occupancy layer, one byte of flags per cell, so that validity
+        checks become a single indexed read instead of tile method calls and dict lookups.
+
+        Args:
+            terrain (Optional[bytearray]): Precomputed wall, goal and weapon flags to
+                start from instead of scanning the tiles.
+        """
+        rows, cols = self._dimensions
+        if terrain is not None:
+            occupancy = terrain
+        else:
+            occupancy = bytearray(rows * cols)
+            for row, tile_row in enumerate(self._tiles):
+                base = row * cols
+                for col, tile in enumerate(tile_row):
+                    flags = 0
+                    if tile.is_blocking():
+                        flags |= WALL_CELL
+                    if tile.get_symbol() == GOAL_TILE:
+                        flags |= GOAL_CELL
+                    if tile.get_weapon():
+                        flags |= WEAPON_CELL
+                    occupancy[base + col] = flags
+        for row, col in self._slugs:
+            occupancy[row * cols + col] |= SLUG_CELL
+        if self._player_position is not None:
+            row, col = self._player_position
+            occupancy[row * cols + col] |= PLAYER_CELL
+        self._occupancy = occupancy
+
+    def _cell_index(self, position: Position) -> int:
+        """
+        Returns the index of the given position in the flat occupancy layer.
+
+        Args:
+            position (Position): The coordinates (row, column) of the cell.
+
+        Returns:
+            int: The flat index of the cell.
+        """
+        return position[0] * self._dimensions[1] + position[1]
+
+    def get_occupancy(self, position: Position) -> int:
+        """
+        Returns the occupancy flags of the cell at the specified position.
+        Positions outside the map are reported as walls.
+
+        Args:
+            position (Position): The coordinates (row, column) of the cell.
+
+        Returns:
+            int: A combination of WALL_CELL, GOAL_CELL, WEAPON_CELL, SLUG_CELL and PLAYER_CELL.
+        """
+        row, col = position
+        rows, cols = self._dimensions
+        if 0 <= row < rows and 0 <= col < cols:
+            return self._occupancy[row * cols + col]
+        return WALL_CELL
+
+    def get_occupancy_layer(self) -> memoryview:
+        """
+        Returns a read-only view of the occupancy flags of every cell, row by row, as
+        get_occupancy gives them one at a time. The view follows the game as it goes on.
+
+        Returns:
+            memoryview: One byte of flags per cell.
+        """
+        return memoryview(self._occupancy).toreadonly()
+
+    def set_tile_weapon(self, position: Position, weapon: Optional[Weapon]) -> None:
+        """
+        Places a weapon on the tile at the given position, keeping the occupancy layer in sync.
+        This is the way to change the weapon on a tile of a game in progress.
+        A cell given back the kind of weapon it started with (see get_weapon_kind) is
+        no longer tracked as changed, so equal states have equal snapshots.
+
+        Args:
+            position (Position): The position of the tile.
+            weapon (Optional[Weapon]): The weapon to place, or None to clear the tile.
+        """
+        tile = self._get_own_tile(position)
+        original = self._original_weapons.setdefault(position, tile.get_weapon())
+        if get_weapon_kind(weapon) == get_weapon_kind(original):
+            del self._original_weapons[position]
+            self._tile_weapons.pop(position, None)
+        else:
+            self._tile_weapons[position] = weapon
+        tile.set_weapon(weapon)
+        if self._changed_cells is not None:
+            self._changed_cells.add(position)
+        index = self._cell_index(position)
+        if weapon:
+            self._occupancy[index] |= WEAPON_CELL
+        else:
+            self._occupancy[index] &= ~WEAPON_CELL
+
+    def _get_own_tile(self, position: Position) -> Tile:
+        """
+        Returns the tile at the given position for changing it. If the tiles are shared
+        with other models, the row and the tile are copied first (copy-on-write).
+
+        Args:
+            position (Position): The position of the tile.
+
+        Returns:
+            Tile: A tile that only this model uses.
+        """
+        if self._copied_rows is None or position in self._copied_tiles:
+            return self.get_tile(position)
+
+        row, col = position
+        if row not in self._copied_rows:
+            self._tiles[row] = list(self._tiles[row])
+            self._copied_rows.add(row)
+        shared = self._tiles[row][col]
+        tile = Tile(shared.get_symbol(), shared.is_blocking())
+        tile.set_weapon(shared.get_weapon())
+        self._tiles[row][col] = tile
+        self._copied_tiles.add(position)
+        return tile
 
     def get_tiles(self) -> list[list[Tile]]:
         """
@@ -850,6 +1291,15 @@ class SlugDungeonModel:
         """
         return {pos: slug for pos, slug in self._slugs.items()}
 
+    def get_slug_count(self) -> int:
+        """
+        Returns the number of slugs left, without copying them as get_slugs does.
+
+        Returns:
+            int: The number of slugs in the game.
+        """
+        return len(self._slugs)
+
     def get_player(self) -> Player:
         """
         Returns the player entity.
@@ -881,6 +1331,20 @@ class SlugDungeonModel:
         row, col = position
         return self._tiles[row][col]
 
+    def pop_changed_cells(self) -> set[Position]:
+        """
+        Returns the cells whose weapon, player or slug changed since the last call,
+        and starts collecting changes afresh. Changes are only collected once this
+        has been called, so the first call returns no cells and a view should draw
+        everything then.
+
+        Returns:
+            set[Position]: The positions of the changed cells.
+        """
+        changed = self._changed_cells
+        self._changed_cells = set()
+        return changed or set()
+
     def get_dimensions(self) -> tuple[int, int]:
         """
         Returns the dimensions of the dungeon map.
@@ -903,7 +1367,34 @@ class SlugDungeonModel:
         if not slug.can_move():
             return []
 
-        current_position = next(pos for pos, s in self._slugs.items() if s == slug)
+        return self._get_valid_moves_from(self._slug_positions[slug])
+
+    def get_valid_slug_positions_at(self, position: Position) -> list[Position]:
+        """
+        Returns a list of valid positions the slug at the given position can move to.
+        This avoids looking the slug's position up when the caller already knows it.
+
+        Args:
+            position (Position): The current position of the slug.
+
+        Returns:
+            list[Position]: List of valid positions for the slug.
+        """
+        if not self._slugs[position].can_move():
+            return []
+
+        return self._get_valid_moves_from(position)
+
+    def _get_valid_moves_from(self, current_position: Position) -> list[Position]:
+        """
+        Returns the current position followed by every neighbouring position that is a valid move.
+
+        Args:
+            current_position (Position): The position to move from.
+
+        Returns:
+            list[Position]: List of valid positions.
+        """
         valid_positions = [current_position]
 
         for delta in POSITION_DELTAS:
@@ -924,12 +1415,55 @@ class SlugDungeonModel:
             bool: True if the move is valid, False otherwise.
         """
         row, col = position
-        if 0 <= row < self._dimensions[0] and 0 <= col < self._dimensions[1]:
-            tile = self.get_tile(position)
-            return (not tile.is_blocking() and position not in self._slugs
-                    and position != self._player_position)
+        rows, cols = self._dimensions
+        if 0 <= row < rows and 0 <= col < cols:
+            return not self._occupancy[row * cols + col] & SLUG_BLOCKING
         return False
 
+    def get_target_cells(self, weapon: Weapon, position: Position) -> list[int]:
+        """
+        Returns the flat occupancy indices of the cells the weapon hits from the given
+        position, clipped to the map.
+
+        Args:
+            weapon (Weapon): The weapon used.
+            position (Position): The position from which the weapon is used.
+
+        Returns:
+            list[int]: The indices of the target cells that lie on the map.
+        """
+        rows, cols = self._dimensions
+        if (type(weapon).get_targets is not Weapon.get_targets
+                or weapon._range != type(weapon)._range):
+            return [row * cols + col for row, col in weapon.get_targets(position)
+                    if 0 <= row < rows and 0 <= col < cols]
+
+        row, col = position
+        return [(row + d_row) * cols + col + d_col
+                for d_row, d_col in weapon.get_target_offsets()
+                if 0 <= row + d_row < rows and 0 <= col + d_col < cols]
+
+    def _get_player_hit_cells(self, weapon: Weapon) -> frozenset[int]:
+        """
+        Returns the cells from which the given kind of weapon hits the player where it
+        stands now. Weapon targets form a symmetric cross, so these are the weapon's
+        own targets around the player. Cached until the player moves.
+
+        Args:
+            weapon (Weapon): A weapon that uses Weapon.get_targets and its class's range.
+
+        Returns:
+            frozenset[int]: The flat indices of the cells.
+        """
+        if self._hit_cells_position != self._player_position:
+            self._hit_cells = {}
+            self._hit_cells_position = self._player_position
+        cells = self._hit_cells.get(type(weapon))
+        if cells is None:
+            cells = frozenset(self.get_target_cells(weapon, self._player_position))
+            self._hit_cells[type(weapon)] = cells
+        return cells
+
     def perform_attack(self, entity: Entity, position: Position) -> None:
         """
         Executes an attack from the given entity at the specified position.
@@ -939,150 +1473,1004 @@ class SlugDungeonModel:
             entity (Entity): The attacking entity (player or slug).
             position (Position): The position from which the entity attacks.
         """
-        targets = entity.get_weapon_targets(position)
-
-        for p in targets:
-            x, y = p
-            if 0 <= x < len(self._tiles) and 0 <= y < len(self._tiles[0]):
-                if isinstance(entity, Player):
-                    if p in self._slugs:
-                        slug = self._slugs[p]
-                        slug.apply_effects(entity.get_weapon_effect())
-                        if not slug.is_alive():
-                            self.get_tile(p).set_weapon(slug.get_weapon())
-                            del self._slugs[p]
-                elif isinstance(entity, Slug):
-                    if p == self._player_position:
-                        self._player.apply_effects(entity.get_weapon_effect())
+        weapon = entity.get_weapon()
+        if not weapon:
+            return
+
+        if isinstance(entity, Slug):
+            if (type(weapon).get_targets is Weapon.get_targets
+                    and weapon._range == type(weapon)._range):
+                # A distance check rules out most slugs before the exact one
+                player_row, player_col = self._player_position
+                if (abs(position[0] - player_row) + abs(position[1] - player_col)
+                        > weapon._reach):
+                    return
+                cols = self._dimensions[1]
+                hit = position[0] * cols + position[1] in self._get_player_hit_cells(weapon)
+            else:
+                occupancy = self._occupancy
+                hit = any(occupancy[index] & PLAYER_CELL
+                          for index in self.get_target_cells(weapon, position))
+            if hit:
+                self._hit(entity, position, self._player, self._player_position)
+        elif isinstance(entity, Player):
+            cols = self._dimensions[1]
+            occupancy = self._occupancy
+            for index in self.get_target_cells(weapon, position):
+                if occupancy[index] & SLUG_CELL:
+                    p = divmod(index, cols)
+                    slug = self._slugs[p]
+                    if slug in self._dormant:
+                        self._wake(slug)
+                    self._hit(entity, position, slug, p)
+                    if not slug.is_alive():
+                        self.set_tile_weapon(p, slug.get_weapon())
+                        if self._listeners and slug.get_weapon():
+                            self._emit(WeaponDropped(p, slug.get_weapon()))
+                        del self._slugs[p]
+                        del self._slug_positions[slug]
+                        if self._changed_cells is not None:
+                            self._changed_cells.add(p)
+                        occupancy[index] &= ~SLUG_CELL
+                        if self._active_radius is not None:
+                            self._remove_from_bucket(p)
+                            self._active_slugs.discard(slug)
+                            del self._slug_order[slug]
 
     def end_turn(self) -> None:
         """
         Handles end of turn actions including applying poison effects, slug movements,
         and updating the state of the game for the next turn.
         """
-        self._player.apply_poison()
+        if self._listeners:
+            self._apply_poison(self._player, self._player_position)
+        else:
+            self._player.apply_poison()
+
+        if self._active_radius is not None:
+            self._end_active_turn()
+            self._player_past_position = self._player_position
+            if self._listeners:
+                self._emit(TurnEnded(self._player_position, len(self._slugs)))
+            return
 
         # Create a new dictionary to store updated slug positions
         new_slugs = {}
+        distance = self.get_distance_field() if self._flow_field_ai else None
 
         # Handle poison effects and slug movements
         for slug_pos, slug in list(self._slugs.items()):
-            slug.apply_poison()
-            if not slug.is_alive():
-                if slug.get_weapon():
-                    self.get_tile(slug_pos).set_weapon(slug.get_weapon())
-                continue  # Do not add to new dictionary
-
-            # Handle slug movement and attack
-            new_pos = slug_pos
-            if slug.can_move():
-                valid_positions = self.get_valid_slug_positions(slug)
-                chosen_pos = slug.choose_move(valid_positions,
-                                              slug_pos, self._player_past_position)
-                if chosen_pos in valid_positions:
-                    new_pos = chosen_pos
-
-            # Add slug to the new position
-            new_slugs[new_pos] = slug
-
-            # Perform attack
-            self.perform_attack(slug, new_pos)
-            slug.end_turn()
+            new_pos = self._take_slug_turn(slug, slug_pos, distance)
+            if new_pos is not None:
+                if self._listeners and new_pos in new_slugs:
+                    self._emit(Removed(new_slugs[new_pos], new_pos))
+                new_slugs[new_pos] = slug
 
         # Update the slugs dictionary
-        self._slugs = new_slugs
+        self._replace_slugs(new_slugs)
         self._player_past_position = self._player_position
+        if self._listeners:
+            self._emit(TurnEnded(self._player_position, len(self._slugs)))
 
-    def handle_player_move(self, position_delta: Position) -> None:
+    def _take_slug_turn(self, slug: Slug, slug_pos: Position,
+                        distance: Optional[Callable[[Position], float]]) -> Optional[Position]:
         """
-        Moves the player based on the given position delta, picking up weapons and
-        triggering attacks as necessary.
+        Applies poison to a slug, then lets it move and attack. The slug's new position
+        is returned, not stored, as slugs move against the positions at the start of
+        the turn.
 
         Args:
-            position_delta (Position): The change in position for the player's move.
+            slug (Slug): The slug taking its turn.
+            slug_pos (Position): The position of the slug at the start of the turn.
+            distance (Optional[Callable[[Position], float]]): The distance field, if the
+                distance field AI is on.
+
+        Returns:
+            Optional[Position]: The slug's new position, or None if it died.
         """
-        new_position = (
-            self._player_position[0] + position_delta[0],
-            self._player_position[1] + position_delta[1]
-        )
+        if self._listeners:
+            self._apply_poison(slug, slug_pos)
+        else:
+            slug.apply_poison()
+        if not slug.is_alive():
+            if slug.get_weapon():
+                self.set_tile_weapon(slug_pos, slug.get_weapon())
+                if self._listeners:
+                    self._emit(WeaponDropped(slug_pos, slug.get_weapon()))
+            return None
+
+        # Handle slug movement and attack
+        new_pos = slug_pos
+        if slug.can_move():
+            valid_positions = self.get_valid_slug_positions_at(slug_pos)
+            if distance is None:
+                chosen_pos = slug.choose_move(valid_positions,
+                                              slug_pos, self._player_past_position)
+            else:
+                chosen_pos = slug.choose_move_with_field(valid_positions, slug_pos,
+                                                         self._player_past_position, distance)
+            if chosen_pos in valid_positions:
+                new_pos = chosen_pos
+                if self._listeners and new_pos != slug_pos:
+                    self._emit(Moved(slug, slug_pos, new_pos))
+
+        # Perform attack
+        self.perform_attack(slug, new_pos)
+        slug.end_turn()
+        return new_pos
+
+    def set_active_radius(self, radius: Optional[int]) -> None:
+        """
+        Turns active region simulation on or off. When on, only the slugs within radius
+        rows and columns of the player take their turns; the others lie dormant where
+        they are, so a turn costs in proportion to the slugs near the player. A dormant
+        slug's poison and every-other-turn movement are caught up exactly when it
+        becomes active again, is attacked, or the game is snapshot, and a slug poisoned
+        to death while dormant dies on the turn it would have. The radius should be at
+        least the reach of the slugs' weapons. It is off by default.
 
-        if (0 <= new_position[0] < len(self._tiles)
-                and 0 <= new_position[1] < len(self._tiles[0])
-                and not self.get_tile(new_position).is_blocking()
-                and new_position not in self._slugs):
-            self._player_position = new_position
-            current_tile = self.get_tile(new_position)
+        Args:
+            radius (Optional[int]): How far from the player slugs take their turns, or
+                None to simulate every slug.
 
-            # Pick up weapon
-            weapon = current_tile.get_weapon()
-            if weapon:
-                self._player.equip(weapon)
-                current_tile.remove_weapon()
+        Raises:
+            ValueError: If the radius is negative.
+        """
+        if radius is not None and radius < 0:
+            raise ValueError(f"The active radius cannot be negative, got {radius}")
+        self._slugs = dict(self._get_settled_slugs())
+        self._active_radius = radius
+        self._reset_activity()
 
-            # Perform attack
-            self.perform_attack(self._player, self._player_position)
+    def get_active_radius(self) -> Optional[int]:
+        """
+        Returns how far from the player slugs take their turns, or None if every slug does.
+        """
+        return self._active_radius
 
-            self.end_turn()
+    def _reset_activity(self) -> None:
+        """
+        Marks every slug as up to date and rebuilds the slug buckets and turn order,
+        or clears them if the active region is off.
+        """
+        self._dormant = {}
+        self._deaths = []
+        self._slug_buckets = {}
+        if self._active_radius is None:
+            self._slug_order = {}
+            self._active_slugs = set()
+            return
+        self._slug_order = {slug: order for order, slug in enumerate(self._slugs.values())}
+        self._active_slugs = set(self._slugs.values())
+        for position in self._slugs:
+            self._add_to_bucket(position)
 
-    def has_won(self) -> bool:
+    def _get_bucket(self, position: Position) -> tuple[int, int]:
         """
-        Checks if the player has won the game (all slugs are defeated, and the player is on the goal).
+        Returns the key of the bucket of the slug index holding a position. Buckets
+        are squares as wide as the active radius.
+        """
+        size = max(self._active_radius, 1)
+        return position[0] // size, position[1] // size
 
-        Returns:
-            bool: True if the player has won, False otherwise.
+    def _add_to_bucket(self, position: Position) -> None:
+        """
+        Adds a slug's position to the slug index.
         """
-        return not self._slugs and self.get_tile(self._player_position).get_symbol() == GOAL_TILE
+        self._slug_buckets.setdefault(self._get_bucket(position), set()).add(position)
 
-    def has_lost(self) -> bool:
+    def _remove_from_bucket(self, position: Position) -> None:
         """
-        Checks if the player has lost the game (player health is 0 or below).
+        Removes a slug's position from the slug index.
+        """
+        key = self._get_bucket(position)
+        bucket = self._slug_buckets[key]
+        bucket.discard(position)
+        if not bucket:
+            del self._slug_buckets[key]
 
-        Returns:
-            bool: True if the player has lost, False otherwise.
+    def _get_slugs_near_player(self) -> list[tuple[Position, Slug]]:
         """
-        return self._player.get_health() <= 0
+        Returns the slugs within the active radius of the player, in turn order.
+        """
+        radius = self._active_radius
+        size = max(radius, 1)
+        row, col = self._player_position
+        buckets = self._slug_buckets
+        slugs = self._slugs
+        near = []
+        for bucket_row in range((row - radius) // size, (row + radius) // size + 1):
+            for bucket_col in range((col - radius) // size, (col + radius) // size + 1):
+                for position in buckets.get((bucket_row, bucket_col), ()):
+                    if abs(position[0] - row) <= radius and abs(position[1] - col) <= radius:
+                        near.append((position, slugs[position]))
+        order = self._slug_order
+        near.sort(key=lambda item: order[item[1]])
+        return near
 
+    def _get_settled_slugs(self) -> Iterable[tuple[Position, Slug]]:
+        """
+        Catches every dormant slug up to the current turn, and returns the slugs in
+        the order they take their turns.
+        """
+        if self._active_radius is None:
+            return self._slugs.items()
+        for slug in self._dormant:
+            self._catch_up(slug)
+        order = self._slug_order
+        return sorted(self._slugs.items(), key=lambda item: order[item[1]])
 
-# 4.1.14 load_level(filename: str) -> SlugDungeonModel
-def load_level(filename: str) -> SlugDungeonModel:
+    def _put_to_sleep(self, slug: Slug) -> None:
+        """
+        Makes a slug dormant as of the current turn, and schedules its death if its
+        poison alone will kill it.
+        """
+        self._sleeps += 1
+        self._dormant[slug] = (self._turn, self._sleeps)
+        self._active_slugs.discard(slug)
+
+        turn = self._turn
+        health, poison = slug.get_health(), slug.get_poison()
+        while poison > 0 and health > 0:
+            turn += 1
+            health -= poison
+            poison -= 1
+        if health <= 0:
+            heapq.heappush(self._deaths, (turn, self._sleeps, slug))
+
+    def _catch_up(self, slug: Slug) -> None:
+        """
+        Applies the poison and movement turns a dormant slug missed since it was last
+        caught up, leaving it dormant.
+        """
+        since, sleep = self._dormant[slug]
+        turns = self._turn - since
+        health, poison = slug.get_health(), slug.get_poison()
+        for _ in range(min(turns, poison)):
+            slug.apply_poison()
+        if self._listeners:
+            self._report_effects(slug, self._slug_positions[slug], health, poison)
+        if turns % 2:
+            slug.end_turn()
+        self._dormant[slug] = (self._turn, sleep)
+
+    def _wake(self, slug: Slug) -> None:
+        """
+        Catches a dormant slug up to the current turn and makes it active.
+        """
+        self._catch_up(slug)
+        del self._dormant[slug]
+        self._active_slugs.add(slug)
+
+    def _end_active_turn(self) -> None:
+        """
+        Lets the slugs near the player take their turns, puts to sleep those that
+        left the active region and removes the dormant slugs whose poison kills them
+        this turn.
+        """
+        near = self._get_slugs_near_player()
+        for slug in self._active_slugs.difference(slug for _, slug in near):
+            self._put_to_sleep(slug)
+        for _, slug in near:
+            if slug in self._dormant:
+                self._wake(slug)
+        self._turn += 1
+
+        new_slugs = {}
+        distance = self.get_distance_field(near) if self._flow_field_ai else None
+        order = self._slug_order
+        for slug_pos, slug in near:
+            new_pos = self._take_slug_turn(slug, slug_pos, distance)
+            if new_pos is not None:
+                if new_pos in new_slugs:
+                    # Replaces the slug that moved there first, and its place in turn
+                    order[slug] = order[new_slugs[new_pos]]
+                    if self._listeners:
+                        self._emit(Removed(new_slugs[new_pos], new_pos))
+                new_slugs[new_pos] = slug
+
+        deaths = self._deaths
+        while deaths and deaths[0][0] <= self._turn:
+            _, sleep, slug = heapq.heappop(deaths)
+            if self._dormant.get(slug, (None, None))[1] != sleep:
+                continue  # Woken or put to sleep again since
+            self._catch_up(slug)
+            del self._dormant[slug]
+            position = self._slug_positions[slug]
+            if slug.get_weapon():
+                self.set_tile_weapon(position, slug.get_weapon())
+                if self._listeners:
+                    self._emit(WeaponDropped(position, slug.get_weapon()))
+            near.append((position, slug))
+
+        self._update_slugs(near, new_slugs)
+        self._active_slugs = set(new_slugs.values())
+
+    def _update_slugs(self, old_slugs: list[tuple[Position, Slug]],
+                      new_slugs: dict[Position, Slug]) -> None:
+        """
+        Replaces some of the slugs in place, keeping the occupancy layer, the slug to
+        position index, the slug buckets and the turn order in sync. Slugs that are
+        old but not new are gone for good.
+
+        Args:
+            old_slugs (list[tuple[Position, Slug]]): The slugs to take off their cells.
+            new_slugs (dict[Position, Slug]): The slugs to put on their cells.
+        """
+        occupancy = self._occupancy
+        cols = self._dimensions[1]
+        changed = self._changed_cells
+        slugs = self._slugs
+        for position, slug in old_slugs:
+            del slugs[position]
+            del self._slug_positions[slug]
+            occupancy[position[0] * cols + position[1]] &= ~SLUG_CELL
+            self._remove_from_bucket(position)
+            if changed is not None and new_slugs.get(position) is not slug:
+                changed.add(position)
+        old_positions = dict(old_slugs)
+        for position, slug in new_slugs.items():
+            slugs[position] = slug
+            self._slug_positions[slug] = position
+            occupancy[position[0] * cols + position[1]] |= SLUG_CELL
+            self._add_to_bucket(position)
+            if changed is not None and old_positions.get(position) is not slug:
+                changed.add(position)
+        for _, slug in old_slugs:
+            if slug not in self._slug_positions:
+                del self._slug_order[slug]
+
+    def set_flow_field_ai(self, enabled: bool) -> None:
+        """
+        Turns the distance field AI on or off. When on, slugs choose their moves with
+        Slug.choose_move_with_field, by walking distance to the player around walls,
+        read from a distance field computed once per turn and shared by every slug.
+        It is off by default.
+
+        Args:
+            enabled (bool): Whether to use the distance field AI.
+        """
+        self._flow_field_ai = enabled
+
+    def get_flow_field_ai(self) -> bool:
+        """
+        Returns whether slugs move by the distance field AI.
+        """
+        return self._flow_field_ai
+
+    def get_distance_field(self, slugs: Optional[Iterable[tuple[Position, Slug]]] = None
+                           ) -> Optional[Callable[[Position], float]]:
+        """
+        Computes the walking distance to the player's past position with a
+        breadth-first search over the cells that are not walls. Slugs and the player
+        do not block the search, as they move. The search stops one step past the
+        farthest slug that can move this turn, which covers every cell such a slug
+        can move to.
+
+        Args:
+            slugs (Optional[Iterable[tuple[Position, Slug]]]): The positions and slugs
+                taking this turn, if not every slug.
+
+        Returns:
+            Optional[Callable[[Position], float]]: A function giving the distance of a
+            cell, or math.inf if the player cannot be reached from it; None if no slug
+            moves this turn.
+        """
+        cols = self._dimensions[1]
+        cells = len(self._occupancy)
+        occupancy = self._occupancy
+        start = self._cell_index(self._player_past_position)
+        # Cells of the slugs that move this turn and are not yet reached
+        if slugs is None:
+            slugs = self._slugs.items()
+        pending = {row * cols + col for (row, col), slug in slugs if slug.can_move()}
+        if not pending:
+            return None
+        pending.discard(start)
+
+        distances = {start: 0}
+        frontier = [start]
+        distance = 0
+        last_layer = None  # Distance of the last layer to search, once every slug is reached
+        while frontier:
+            if last_layer is None and not pending:
+                last_layer = distance + 1
+            if distance == last_layer:
+                break
+            distance += 1
+            next_frontier = []
+            for index in frontier:
+                col = index % cols
+                for neighbour in (index + 1 if col + 1 < cols else -1, index - 1 if col else -1,
+                                  index + cols, index - cols):
+                    if (0 <= neighbour < cells and neighbour not in distances
+                            and not occupancy[neighbour] & WALL_CELL):
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+                        pending.discard(neighbour)
+            frontier = next_frontier
+
+        return lambda position: distances.get(position[0] * cols + position[1], math.inf)
+
+    def _replace_slugs(self, new_slugs: dict[Position, Slug]) -> None:
+        """
+        Replaces the slugs dictionary, moving the slugs in the occupancy layer and
+        rebuilding the slug to position index.
+
+        Args:
+            new_slugs (dict[Position, Slug]): The new mapping of positions to slugs.
+        """
+        occupancy = self._occupancy
+        cols = self._dimensions[1]
+        changed = self._changed_cells
+        for position, slug in self._slugs.items():
+            occupancy[position[0] * cols + position[1]] &= ~SLUG_CELL
+            if changed is not None and new_slugs.get(position) is not slug:
+                changed.add(position)
+        for position, slug in new_slugs.items():
+            occupancy[position[0] * cols + position[1]] |= SLUG_CELL
+            if changed is not None and self._slugs.get(position) is not slug:
+                changed.add(position)
+        self._slugs = new_slugs
+        self._slug_positions = {slug: pos for pos, slug in new_slugs.items()}
+        if self._active_radius is not None:
+            self._reset_activity()
+
+    def _move_player(self, new_position: Position) -> None:
+        """
+        Moves the player to the given position and picks up any weapon lying there.
+
+        Args:
+            new_position (Position): The position the player moves to.
+        """
+        occupancy = self._occupancy
+        cols = self._dimensions[1]
+        row, col = self._player_position
+        occupancy[row * cols + col] &= ~PLAYER_CELL
+        if self._changed_cells is not None:
+            self._changed_cells.update((self._player_position, new_position))
+        if self._listeners and new_position != self._player_position:
+            self._emit(Moved(self._player, self._player_position, new_position))
+        self._player_position = new_position
+        index = new_position[0] * cols + new_position[1]
+        occupancy[index] |= PLAYER_CELL
+
+        # Pick up weapon
+        if occupancy[index] & WEAPON_CELL:
+            weapon = self.get_tile(new_position).get_weapon()
+            self._player.equip(weapon)
+            self.set_tile_weapon(new_position, None)
+            if self._listeners:
+                self._emit(WeaponPickedUp(self._player, new_position, weapon))
+
+    def handle_player_move(self, position_delta: Position) -> None:
+        """
+        Moves the player based on the given position delta, picking up weapons and
+        triggering attacks as necessary.
+
+        Args:
+            position_delta (Position): The change in position for the player's move.
+        """
+        new_position = (
+            self._player_position[0] + position_delta[0],
+            self._player_position[1] + position_delta[1]
+        )
+
+        if not self.get_occupancy(new_position) & PLAYER_BLOCKING:
+            self._move_player(new_position)
+
+            # Perform attack
+            self.perform_attack(self._player, self._player_position)
+
+            self.end_turn()
+
+        if self._move_recorder is not None:
+            self._move_recorder(position_delta)
+
+    def handle_player_moves(self, position_deltas: Iterable[Position]) -> MovesResult:
+        """
+        Handles a sequence of player moves as handle_player_move would, stopping as
+        soon as the game is won or lost.
+
+        Args:
+            position_deltas (Iterable[Position]): The change in position of each move.
+
+        Returns:
+            MovesResult: The outcome, the number of moves handled and the final state.
+        """
+        player = self._player
+        cols = self._dimensions[1]
+        moves = 0
+        outcome = UNFINISHED
+        for position_delta in position_deltas:
+            self.handle_player_move(position_delta)
+            moves += 1
+
+            # Same checks as has_won() and has_lost(), without the method calls
+            if not self._slugs:
+                row, col = self._player_position
+                if self._occupancy[row * cols + col] & GOAL_CELL:
+                    outcome = WON
+                    break
+            if player.get_health() <= 0:
+                outcome = LOST
+                break
+
+        return MovesResult(outcome, moves, self._player_position, player.get_health(),
+                           len(self._slugs))
+
+    def add_listener(self, listener: EventListener) -> None:
+        """
+        Registers a function to be called with every event the game emits: Moved,
+        Attacked, Damaged, Poisoned, Died, Removed, WeaponDropped, WeaponPickedUp and
+        TurnEnded. Events are emitted as they happen, on the thread running the
+        model; restore() and clone() emit none. With no listeners the model builds
+        no events at all.
+
+        Args:
+            listener (EventListener): The function to call with each event.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: EventListener) -> None:
+        """
+        Stops calling a function registered with add_listener().
+
+        Args:
+            listener (EventListener): The function to stop calling.
+
+        Raises:
+            ValueError: If the function is not registered.
+        """
+        self._listeners.remove(listener)
+
+    def _emit(self, event: ModelEvent) -> None:
+        """
+        Calls every listener with the event.
+        """
+        for listener in tuple(self._listeners):
+            listener(event)
+
+    def _hit(self, attacker: Entity, attacker_position: Position,
+             target: Entity, target_position: Position) -> None:
+        """
+        Applies the effects of the attacker's weapon to the target.
+        """
+        if not self._listeners:
+            target.apply_effects(attacker.get_weapon_effect())
+            return
+        health, poison = target.get_health(), target.get_poison()
+        self._emit(Attacked(attacker, attacker_position, target, target_position,
+                            attacker.get_weapon()))
+        target.apply_effects(attacker.get_weapon_effect())
+        self._report_effects(target, target_position, health, poison)
+
+    def _apply_poison(self, entity: Entity, position: Position) -> None:
+        """
+        Applies poison damage to the entity, telling the listeners.
+        """
+        health, poison = entity.get_health(), entity.get_poison()
+        entity.apply_poison()
+        self._report_effects(entity, position, health, poison)
+
+    def _report_effects(self, entity: Entity, position: Position,
+                        health: int, poison: int) -> None:
+        """
+        Emits the Damaged, Poisoned and Died events for the change in an entity's
+        health and poison from the given earlier values.
+        """
+        if entity.get_health() != health:
+            self._emit(Damaged(entity, position, health - entity.get_health(),
+                               entity.get_health()))
+        if entity.get_poison() > poison:
+            self._emit(Poisoned(entity, position, entity.get_poison() - poison,
+                                entity.get_poison()))
+        if health > 0 and not entity.is_alive():
+            self._emit(Died(entity, position))
+
+    def set_move_recorder(self, recorder: Optional[Callable[[Position], None]]) -> None:
+        """
+        Sets the function called with the delta of every call to handle_player_move,
+        after the move has been handled, e.g. to write a replay log.
+
+        Args:
+            recorder (Optional[Callable[[Position], None]]): The function to call, or
+                None to stop recording.
+        """
+        self._move_recorder = recorder
+
+    def snapshot(self) -> ModelSnapshot:
+        """
+        Captures the mutable state of the game: the player, every slug, and the weapons
+        on the cells the game has changed. Terrain is not copied. Dormant slugs are
+        caught up to the current turn first. A cell that holds the same kind of weapon
+        as at the start of the level again counts as unchanged, so two games in the
+        same state have equal snapshots whatever moves led there.
+
+        Returns:
+            ModelSnapshot: The state to pass to restore().
+        """
+        player = self._player
+        return ModelSnapshot(
+            (player._health, player._poison, player._weapon),
+            self._player_position,
+            self._player_past_position,
+            tuple((position, slug, slug._health, slug._poison, slug.can_move_next_turn)
+                  for position, slug in self._get_settled_slugs()),
+            dict(self._tile_weapons),
+        )
+
+    def restore(self, snapshot: ModelSnapshot) -> None:
+        """
+        Returns the game to a state captured by snapshot() on this model. A state
+        built for the same level, such as a replay checkpoint, may be restored as
+        well, as long as its slugs belong to no other model.
+
+        Args:
+            snapshot (ModelSnapshot): The state to return to.
+        """
+        player = self._player
+        player._health, player._poison, player._weapon = snapshot.player_state
+
+        occupancy = self._occupancy
+        occupancy[self._cell_index(self._player_position)] &= ~PLAYER_CELL
+        if self._changed_cells is not None:
+            self._changed_cells.update((self._player_position, snapshot.player_position))
+        self._player_position = snapshot.player_position
+        occupancy[self._cell_index(self._player_position)] |= PLAYER_CELL
+        self._player_past_position = snapshot.player_past_position
+
+        slugs = {}
+        for position, slug, health, poison, can_move in snapshot.slugs:
+            slug._health = health
+            slug._poison = poison
+            slug.can_move_next_turn = can_move
+            slugs[position] = slug
+        self._replace_slugs(slugs)
+
+        if self._tile_weapons != snapshot.tile_weapons:
+            # Cells changed now but not then go back to their original weapon
+            for position in self._tile_weapons.keys() | snapshot.tile_weapons.keys():
+                if position in snapshot.tile_weapons:
+                    weapon = snapshot.tile_weapons[position]
+                else:
+                    weapon = self._original_weapons[position]
+                if self.get_tile(position).get_weapon() is not weapon:
+                    self.set_tile_weapon(position, weapon)
+
+    def clone(self) -> 'SlugDungeonModel':
+        """
+        Returns an independent copy of the game. The copy shares the tiles with this
+        model, and each copies a tile only when the game changes it; the player and
+        the slugs are copied.
+
+        Returns:
+            SlugDungeonModel: The copy of the game.
+        """
+        if isinstance(self._occupancy, memoryview):
+            occupancy = bytearray(self._occupancy)  # A mapped level is copied into memory
+        else:
+            occupancy = self._occupancy.copy()
+
+        # From now on this model must copy tiles before changing them as well
+        self._copied_rows = set()
+        self._copied_tiles = set()
+
+        slugs = {position: copy.copy(slug) for position, slug in self._get_settled_slugs()}
+        model = type(self)(self._tiles, slugs, copy.copy(self._player), self._player_position,
+                           occupancy, shared_tiles=True)
+        model._player_past_position = self._player_past_position
+        model._flow_field_ai = self._flow_field_ai
+        model.set_active_radius(self._active_radius)
+        model._original_weapons = dict(self._original_weapons)
+        model._tile_weapons = dict(self._tile_weapons)
+        return model
+
+    def has_won(self) -> bool:
+        """
+        Checks if the player has won the game (all slugs are defeated, and the player is on the goal).
+
+        Returns:
+            bool: True if the player has won, False otherwise.
+        """
+        return (not self._slugs
+                and bool(self.get_occupancy(self._player_position) & GOAL_CELL))
+
+    def has_lost(self) -> bool:
+        """
+        Checks if the player has lost the game (player health is 0 or below).
+
+        Returns:
+            bool: True if the player has lost, False otherwise.
+        """
+        return self._player.get_health() <= 0
+
+
+def _build_level_symbols() -> dict[str, tuple[str, bool, Optional[Weapon], Optional[type]]]:
     """
-    Loads a game level from a file and initializes the SlugDungeonModel based on
-    the level data.
+    Precompiles the level symbol table used by read_level. Entries are added from
+    lowest to highest priority so that overlapping symbols resolve as in create_tile.
+
+    Returns:
+        dict[str, tuple[str, bool, Optional[Weapon], Optional[type]]]: Maps each level
+        symbol to its tile symbol, whether the tile blocks, the weapon lying on the tile
+        and the class of the slug standing on it.
+    """
+    symbols = {}
+    for symbol, weapon in TILE_WEAPONS.items():
+        symbols[symbol] = (FLOOR_TILE, False, weapon, None)
+    for symbol, slug_class in ((NICE_SLUG_SYMBOL, NiceSlug), (ANGRY_SLUG_SYMBOL, AngrySlug),
+                               (SCARED_SLUG_SYMBOL, ScaredSlug)):
+        symbols[symbol] = (FLOOR_TILE, False, None, slug_class)
+    symbols[FLOOR_TILE] = (FLOOR_TILE, False, None, None)
+    symbols[PLAYER_SYMBOL] = (FLOOR_TILE, False, None, None)
+    symbols[GOAL_TILE] = (GOAL_TILE, False, None, None)
+    symbols[WALL_TILE] = (WALL_TILE, True, None, None)
+    return symbols
+
+
+LEVEL_SYMBOLS = _build_level_symbols()
+DEFAULT_LEVEL_SYMBOL = (FLOOR_TILE, False, None, None)  # Unknown symbols become floor
+
+
+class LevelError(ValueError):
+    """
+    Raised when a level file is malformed. Carries the 1-based line and column
+    of the problem (column is None when the whole line is at fault).
+    """
+
+    def __init__(self, filename: str, line: int, column: Optional[int], message: str) -> None:
+        """
+        Initializes the error with the location of the problem in the level file.
+
+        Args:
+            filename (str): The path to the level file.
+            line (int): The 1-based line number of the problem.
+            column (Optional[int]): The 1-based column of the problem, if known.
+            message (str): A description of the problem.
+        """
+        location = f"{filename}:{line}" if column is None else f"{filename}:{line}:{column}"
+        super().__init__(f"{location}: {message}")
+        self.filename = filename
+        self.line = line
+        self.column = column
+
+
+def read_player_health(file, filename: str, strict: bool) -> int:
+    """
+    Reads the player's health from the first line of an open level file.
+
+    Args:
+        file: The open level file, positioned at its start.
+        filename (str): The path to the level file, for error messages.
+        strict (bool): Whether to raise a LevelError instead of a bare ValueError.
+
+    Returns:
+        int: The player's health.
+    """
+    first_line = file.readline()
+    try:
+        return int(first_line.strip())
+    except ValueError:
+        if not strict:
+            raise
+        raise LevelError(filename, 1, None,
+                         f"expected the player's health, got {first_line.strip()!r}") from None
+
+
+def iter_level_rows(file, filename: str, strict: bool) -> Iterator[tuple[int, str]]:
+    """
+    Streams the rows of an open level file after its health line.
+
+    In strict mode rows keep their surrounding spaces and must all have the same
+    width, and blank lines are only allowed after the last row. Otherwise each row
+    is stripped of surrounding whitespace and yielded as is, blank or not.
+
+    Args:
+        file: The open level file, positioned after the health line.
+        filename (str): The path to the level file, for error messages.
+        strict (bool): Whether to validate the shape of the level.
+
+    Yields:
+        tuple[int, str]: The 1-based line number and text of each row.
+    """
+    width = None
+    blank_line = None  # First blank line seen, which must only be followed by blank lines
+    for line_number, line in enumerate(file, start=2):
+        if not strict:
+            yield line_number, line.strip()
+            continue
+
+        line = line.rstrip("\r\n")
+        if not line:
+            blank_line = blank_line or line_number
+            continue
+        if blank_line is not None:
+            raise LevelError(filename, blank_line, None, "blank line inside the level")
+        if width is None:
+            width = len(line)
+        elif len(line) != width:
+            raise LevelError(filename, line_number, min(len(line), width) + 1,
+                             f"row has {len(line)} columns, expected {width}")
+        yield line_number, line
+
+
+def read_level(filename: str, strict: bool = True) -> SlugDungeonModel:
+    """
+    Streams a level file row by row and builds the SlugDungeonModel from it,
+    dispatching each character through the LEVEL_SYMBOLS table.
+
+    In strict mode the level must have a valid health line, rectangular rows,
+    only known symbols and exactly one player; otherwise a LevelError giving the
+    line and column is raised. Trailing blank lines are allowed. When not strict,
+    rows are stripped of surrounding whitespace and nothing is checked, as load_level
+    has always done.
 
     Args:
         filename (str): The path to the level file.
+        strict (bool): Whether to validate the level.
 
     Returns:
         SlugDungeonModel: The game model initialized from the file.
-    """
-    with open(filename, 'r') as file:
-        lines = file.readlines()
 
-    player_health = int(lines[0].strip())
+    Raises:
+        LevelError: If strict and the level is malformed.
+    """
     tiles = []
     slugs = {}
     player_position = None
+    symbols = LEVEL_SYMBOLS
 
-    for row, line in enumerate(lines[1:]):
-        tile_row = []
-        for col, char in enumerate(line.strip()):
-            tile = create_tile(char)
-            if char == PLAYER_SYMBOL:
-                player_position = (row, col)
-            elif char in [NICE_SLUG_SYMBOL, ANGRY_SLUG_SYMBOL, SCARED_SLUG_SYMBOL]:
-                if char == NICE_SLUG_SYMBOL:
-                    slugs[(row, col)] = NiceSlug()
-                elif char == ANGRY_SLUG_SYMBOL:
-                    slugs[(row, col)] = AngrySlug()
-                elif char == SCARED_SLUG_SYMBOL:
-                    slugs[(row, col)] = ScaredSlug()
-            tile_row.append(tile)
-        tiles.append(tile_row)
+    with open(filename, 'r') as file:
+        player_health = read_player_health(file, filename, strict)
+
+        for line_number, line in iter_level_rows(file, filename, strict):
+            row = len(tiles)
+            tile_row = []
+            for col, char in enumerate(line):
+                entry = symbols.get(char)
+                if entry is None:
+                    if strict:
+                        raise LevelError(filename, line_number, col + 1,
+                                         f"unknown symbol {char!r}")
+                    entry = DEFAULT_LEVEL_SYMBOL
+                tile_symbol, is_blocking, weapon, slug_class = entry
+                tile = Tile(tile_symbol, is_blocking)
+                if weapon is not None:
+                    tile.set_weapon(weapon)
+                elif slug_class is not None:
+                    slugs[(row, col)] = slug_class()
+                elif char == PLAYER_SYMBOL:
+                    if strict and player_position is not None:
+                        raise LevelError(filename, line_number, col + 1,
+                                         "more than one player")
+                    player_position = (row, col)
+                tile_row.append(tile)
+            tiles.append(tile_row)
+
+    if strict:
+        if not tiles:
+            raise LevelError(filename, 2, None, "the level has no rows")
+        if player_position is None:
+            raise LevelError(filename, len(tiles) + 1, None, "the level has no player")
 
     player = Player(player_health)
     return SlugDungeonModel(tiles, slugs, player, player_position)
 
 
+# 4.1.14 load_level(filename: str) -> SlugDungeonModel
+def load_level(filename: str) -> SlugDungeonModel:
+    """
+    Loads a game level from a file and initializes the SlugDungeonModel based on
+    the level data. The file is read leniently; use read_level for validation.
+
+    Args:
+        filename (str): The path to the level file.
+
+    Returns:
+        SlugDungeonModel: The game model initialized from the file.
+    """
+    return read_level(filename, strict=False)
+
+
+class LevelTemplate:
+    """
+    An immutable, parsed level from which fresh game models can be made cheaply.
+    Every model made from a template shares its rows of tiles and copies a tile
+    only when the game changes it.
+    """
+    # Keeps only the wall, goal and weapon flags of an occupancy byte
+    TERRAIN_TABLE = bytes(flags & (WALL_CELL | GOAL_CELL | WEAPON_CELL) for flags in range(256))
+
+    def __init__(self, model: SlugDungeonModel) -> None:
+        """
+        Captures the starting state of a freshly loaded level.
+
+        Args:
+            model (SlugDungeonModel): A model that has not been played yet.
+        """
+        self._tiles = tuple(model.get_tiles())
+        self._terrain = bytes(model._occupancy).translate(self.TERRAIN_TABLE)
+        self._slugs = tuple((position, type(slug)) for position, slug in model.get_slugs().items())
+        self._player_health = model.get_player().get_health()
+        self._player_position = model.get_player_position()
+
+    def new_model(self) -> SlugDungeonModel:
+        """
+        Returns a new model of the level in its starting state.
+
+        Returns:
+            SlugDungeonModel: A model that shares tiles with the template until it changes them.
+        """
+        slugs = {position: slug_class() for position, slug_class in self._slugs}
+        return SlugDungeonModel(self._tiles, slugs, Player(self._player_health),
+                                self._player_position, bytearray(self._terrain),
+                                shared_tiles=True)
+
+
+class LevelCache:
+    """
+    A least-recently-used cache of parsed levels, keyed by path. A cached level is
+    parsed again when the modification time or size of its file changes.
+    """
+
+    def __init__(self, capacity: int = 8) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            capacity (int): The most levels to keep.
+        """
+        self._capacity = capacity
+        self._templates: OrderedDict[str, tuple[int, int, LevelTemplate]] = OrderedDict()
+
+    def get_template(self, filename: str) -> LevelTemplate:
+        """
+        Returns the parsed template of the level, parsing it if it is not cached or
+        the file has changed since.
+
+        Args:
+            filename (str): The path to the level file.
+
+        Returns:
+            LevelTemplate: The parsed level.
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        entry = self._templates.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            self._templates.move_to_end(path)
+            return entry[2]
+
+        template = LevelTemplate(load_level(path))
+        self._templates[path] = (stat.st_mtime_ns, stat.st_size, template)
+        self._templates.move_to_end(path)
+        while len(self._templates) > self._capacity:
+            self._templates.popitem(last=False)
+        return template
+
+    def load_level(self, filename: str) -> SlugDungeonModel:
+        """
+        Returns a fresh game model of the level, using the cached parse if possible.
+
+        Args:
+            filename (str): The path to the level file.
+
+        Returns:
+            SlugDungeonModel: The game model in the level's starting state.
+        """
+        return self.get_template(filename).new_model()
+
+    def clear(self) -> None:
+        """
+        Forgets every cached level.
+        """
+        self._templates.clear()
+
+
+LEVEL_CACHE = LevelCache()  # Levels loaded by the game
+
+
 #4.2 View
 # 4.2.1 DungeonMap(AbstractGrid)
 class DungeonMap(AbstractGrid):
@@ -1107,50 +2495,467 @@ class DungeonMap(AbstractGrid):
             **kwargs: Additional keyword arguments.
         """
         super().__init__(master, dimensions, size, **kwargs)
+        self._drawn_dimensions: Optional[tuple[int, int]] = None  # Dimensions last drawn
+        self._weapon_items: dict[Position, int] = {}  # Weapon annotation item for each cell
+        self._player_items: Optional[tuple[int, int]] = None  # Player oval and label
+        self._slug_items: dict[Slug, tuple[int, int]] = {}  # Oval and label for each slug
+        self._drawn_slugs: dict[Position, Slug] = {}  # Slug drawn at each position
 
-    def redraw(self, tiles: list[list[Tile]],
-               player_position: Position, slugs: dict[Position, Slug]) -> None:
+    def redraw(self, tiles: list[list[Tile]], player_position: Position,
+               slugs: dict[Position, Slug], changed: Optional[set[Position]] = None) -> None:
         """
         Redraws the dungeon map, updating the tiles, player, and slugs.
 
+        When the set of changed cells is given, the canvas items drawn last time are kept
+        and only the weapons and entities on those cells are updated or moved. Otherwise
+        the whole map is drawn from scratch.
+
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+            player_position (Position): The current position of the player.
+            slugs (dict[Position, Slug]): Dictionary of slug positions and their corresponding slugs.
+            changed (Optional[set[Position]]): Cells changed since the last redraw, as given
+                by SlugDungeonModel.pop_changed_cells, or None to draw everything.
+        """
+        # Determine the dimensions of the grid
+        num_rows = len(tiles)
+        num_cols = len(tiles[0]) if num_rows > 0 else 0
+
+        if changed is None or self._drawn_dimensions != (num_rows, num_cols):
+            self._draw_all(tiles, player_position, slugs)
+            return
+
+        weapon_drawn = False
+        for position in changed:
+            weapon_drawn |= self._draw_weapon(position, tiles[position[0]][position[1]].get_weapon())
+        if weapon_drawn:
+            self.tag_raise("entity")  # Keep the player and slugs above the weapon symbols
+        self._move_player(player_position)
+        self._move_slugs(changed, slugs)
+
+    def _draw_all(self, tiles: list[list[Tile]],
+                  player_position: Position, slugs: dict[Position, Slug]) -> None:
+        """
+        Clears the canvas and draws every tile, weapon, the player and all slugs.
+
         Args:
             tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
             player_position (Position): The current position of the player.
             slugs (dict[Position, Slug]): Dictionary of slug positions and their corresponding slugs.
         """
         self.clear()
+        self._weapon_items = {}
+        self._player_items = None
+        self._slug_items = {}
+        self._drawn_slugs = {}
 
-        # Determine the dimensions of the grid
         num_rows = len(tiles)
         num_cols = len(tiles[0]) if num_rows > 0 else 0
         self.set_dimensions((num_rows, num_cols))  # Set new grid dimensions
+        self._drawn_dimensions = (num_rows, num_cols)
+
+        self._draw_tiles(tiles)
+
+        # Draw the player and the slugs
+        self._move_player(player_position)
+        self._move_slugs(slugs.keys(), slugs)
 
-        # Draw the tiles
-        for row in range(num_rows):
-            for col in range(num_cols):
-                tile = tiles[row][col]
+    def _draw_tiles(self, tiles: list[list[Tile]]) -> None:
+        """
+        Draws every tile and the weapons lying on them.
+
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+        """
+        for row, tile_row in enumerate(tiles):
+            for col, tile in enumerate(tile_row):
                 bbb = self.get_bbox((row, col))
-                if str(tile) == WALL_TILE:
-                    color = WALL_COLOUR
-                elif str(tile) == GOAL_TILE:
-                    color = GOAL_COLOUR
-                else:
-                    color = FLOOR_COLOUR
-                self.create_rectangle(bbb, fill=color, outline="black")
+                self.create_rectangle(bbb, fill=self._get_tile_colour(tile), outline="black")
+                if tile.get_weapon():
+                    self._draw_weapon((row, col), tile.get_weapon())
+
+    @staticmethod
+    def _get_tile_colour(tile: Tile) -> str:
+        """
+        Returns the colour a tile is drawn in.
+
+        Args:
+            tile (Tile): The tile to draw.
+
+        Returns:
+            str: WALL_COLOUR, GOAL_COLOUR or FLOOR_COLOUR.
+        """
+        if str(tile) == WALL_TILE:
+            return WALL_COLOUR
+        elif str(tile) == GOAL_TILE:
+            return GOAL_COLOUR
+        return FLOOR_COLOUR
+
+    def _draw_weapon(self, position: Position, weapon: Optional[Weapon]) -> bool:
+        """
+        Shows the symbol of the weapon lying on a cell, or removes it if there is none.
+
+        Args:
+            position (Position): The cell to update.
+            weapon (Optional[Weapon]): The weapon on the cell, if any.
+
+        Returns:
+            bool: True if a new weapon symbol was drawn.
+        """
+        item = self._weapon_items.get(position)
+        if item is not None:
+            if weapon and self.itemcget(item, "text") == weapon.get_symbol():
+                return False
+            self.delete(self._weapon_items.pop(position))
+        if weapon:
+            self._weapon_items[position] = self.create_text(
+                self.get_midpoint(position), text=weapon.get_symbol())
+            return True
+        return False
+
+    def _draw_entity(self, position: Position, colour: str, label: str) -> tuple[int, int]:
+        """
+        Creates the oval and label for an entity at the given position.
+
+        Args:
+            position (Position): Where to draw the entity.
+            colour (str): The fill colour of the oval.
+            label (str): The text drawn on the oval.
+
+        Returns:
+            tuple[int, int]: The canvas item ids of the oval and the label.
+        """
+        oval = self.create_oval(self.get_bbox(position), fill=colour, tags="entity")
+        text = self.create_text(self.get_midpoint(position), text=label, tags="entity")
+        return oval, text
+
+    def _place_entity(self, items: tuple[int, int], position: Position) -> None:
+        """
+        Moves an entity's oval and label to the given position.
+
+        Args:
+            items (tuple[int, int]): The canvas item ids of the oval and the label.
+            position (Position): The new position of the entity.
+        """
+        oval, text = items
+        self.coords(oval, *self.get_bbox(position))
+        self.coords(text, *self.get_midpoint(position))
+
+    def _move_player(self, player_position: Position) -> None:
+        """
+        Draws the player, or moves the existing player items to its position.
+
+        Args:
+            player_position (Position): The current position of the player.
+        """
+        if self._player_items is None:
+            self._player_items = self._draw_entity(player_position, PLAYER_COLOUR, "Player")
+        else:
+            self._place_entity(self._player_items, player_position)
+
+    def _move_slugs(self, positions, slugs: dict[Position, Slug]) -> None:
+        """
+        Brings the slugs drawn on the given cells up to date, moving the items of slugs
+        that changed cells, creating items for new slugs and deleting those of slugs
+        that are gone.
+
+        Args:
+            positions: The cells to update.
+            slugs (dict[Position, Slug]): Dictionary of slug positions and their corresponding slugs.
+        """
+        gone = set()
+        for position in positions:
+            slug = self._drawn_slugs.pop(position, None)
+            if slug is not None:
+                gone.add(slug)
+
+        for position in positions:
+            slug = slugs.get(position)
+            if slug is None:
+                continue
+            items = self._slug_items.get(slug)
+            if items is None:
+                slug_name = "\n".join(slug.__class__.__name__.replace("Slug", " Slug").split())
+                self._slug_items[slug] = self._draw_entity(position, SLUG_COLOUR, slug_name)
+            else:
+                self._place_entity(items, position)
+                gone.discard(slug)
+            self._drawn_slugs[position] = slug
+
+        for slug in gone:
+            self.delete(*self._slug_items.pop(slug))
+
+
+class RasterDungeonMap(DungeonMap):
+    """
+    A DungeonMap that renders the tiles into a single PhotoImage, shown by one canvas
+    item, instead of creating a rectangle per cell. Weapons, the player and slugs are
+    drawn on top of it as canvas items and updated incrementally, as DungeonMap does.
+
+    Walls, floors and goals never change during a game, so the terrain image is kept
+    between redraws and only rendered again when the terrain or the cell size does.
+    """
+    def __init__(
+            self,
+            master: Union[tk.Tk, tk.Frame],
+            dimensions: tuple[int, int],
+            size: tuple[int, int],
+            **kwargs,
+    ) -> None:
+        """
+        Initializes the RasterDungeonMap with the master widget, grid dimensions, and size.
+
+        Args:
+            master (Union[tk.Tk, tk.Frame]): The parent widget.
+            dimensions (tuple[int, int]): The dimensions of the grid (rows, columns).
+            size (tuple[int, int]): The size of the grid (width, height).
+            **kwargs: Additional keyword arguments.
+        """
+        super().__init__(master, dimensions, size, **kwargs)
+        self._terrain_image: Optional[tk.PhotoImage] = None
+        self._terrain_key: Optional[tuple] = None  # Cell size and tile symbols of the image
+
+    def _draw_tiles(self, tiles: list[list[Tile]]) -> None:
+        """
+        Shows the terrain image, rendering it first if the terrain or cell size has
+        changed, and draws the weapons lying on the tiles.
+
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+        """
+        key = (self._get_cell_size(), tuple("".join(map(str, tile_row)) for tile_row in tiles))
+        if key != self._terrain_key:
+            self._terrain_image = self._render_terrain(tiles)
+            self._terrain_key = key
+        self.create_image(0, 0, image=self._terrain_image, anchor="nw")
+
+        for row, tile_row in enumerate(tiles):
+            for col, tile in enumerate(tile_row):
                 if tile.get_weapon():
-                    self.annotate_position((row, col), tile.get_weapon().get_symbol())
+                    self._draw_weapon((row, col), tile.get_weapon())
+
+    def _render_terrain(self, tiles: list[list[Tile]]) -> tk.PhotoImage:
+        """
+        Renders the tile colours and cell outlines into a new image.
+
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+
+        Returns:
+            tk.PhotoImage: The terrain image, one pixel wider and taller than the cells.
+        """
+        cell_width, cell_height = self._get_cell_size()
+        num_rows = len(tiles)
+        num_cols = len(tiles[0]) if num_rows > 0 else 0
+        width, height = num_cols * cell_width, num_rows * cell_height
+        image = tk.PhotoImage(master=self, width=width + 1, height=height + 1)
+
+        # Fill each run of same coloured tiles in a row at once
+        for row, tile_row in enumerate(tiles):
+            colours = [self._get_tile_colour(tile) for tile in tile_row]
+            y = row * cell_height
+            start = 0
+            for col in range(1, num_cols + 1):
+                if col == num_cols or colours[col] != colours[start]:
+                    image.put(colours[start],
+                              to=(start * cell_width, y, col * cell_width, y + cell_height))
+                    start = col
+
+        # Outline the cells, as the rectangles of DungeonMap are
+        for row in range(num_rows + 1):
+            image.put("black", to=(0, row * cell_height, width + 1, row * cell_height + 1))
+        for col in range(num_cols + 1):
+            image.put("black", to=(col * cell_width, 0, col * cell_width + 1, height + 1))
+        return image
+
+
+class ViewportDungeonMap(DungeonMap):
+    """
+    A DungeonMap for levels too big to draw whole. It shows a window of cells that
+    follows the player, at a fixed cell size. Only the cells within a margin around
+    the window are drawn, in the canvas coordinates of the whole level, and the
+    canvas is scrolled as the camera moves. When the window leaves the drawn region,
+    the region is moved and its tile rectangles are reused for the new cells.
+    """
+    def __init__(
+            self,
+            master: Union[tk.Tk, tk.Frame],
+            dimensions: tuple[int, int],
+            size: tuple[int, int],
+            view: tuple[int, int] = (15, 15),
+            margin: int = 5,
+            **kwargs,
+    ) -> None:
+        """
+        Initializes the map with the master widget, level dimensions, size and view.
+
+        Args:
+            master (Union[tk.Tk, tk.Frame]): The parent widget.
+            dimensions (tuple[int, int]): The dimensions of the level (rows, columns).
+            size (tuple[int, int]): The size of the canvas (width, height).
+            view (tuple[int, int]): The number of rows and columns shown at once.
+            margin (int): The number of cells drawn beyond each side of the window.
+            **kwargs: Additional keyword arguments.
+        """
+        self._view = view
+        self._margin = margin
+        super().__init__(master, dimensions, size, **kwargs)
+        self._tile_items: list[int] = []  # Rectangles drawn for the region, reused when it moves
+        self._region: Optional[tuple[int, int, int, int]] = None  # First and end row and column drawn
+        self._camera: Optional[Position] = None  # Top left cell of the window
+
+    def set_dimensions(self, dimensions: tuple[int, int]) -> None:
+        """
+        Sets the dimensions of the level. Cells are sized to fit the view, or the
+        whole level if it is smaller than the view.
+
+        Args:
+            dimensions (tuple[int, int]): The dimensions of the level (rows, columns).
+        """
+        self._level_dimensions = dimensions
+        super().set_dimensions((min(self._view[0], dimensions[0]),
+                                min(self._view[1], dimensions[1])))
+
+    def redraw(self, tiles: list[list[Tile]], player_position: Position,
+               slugs: dict[Position, Slug], changed: Optional[set[Position]] = None) -> None:
+        """
+        Redraws the map around the player, updating only the changed cells that
+        are drawn, as DungeonMap.redraw does for the whole level.
+
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+            player_position (Position): The current position of the player.
+            slugs (dict[Position, Slug]): Dictionary of slug positions and their corresponding slugs.
+            changed (Optional[set[Position]]): Cells changed since the last redraw, as given
+                by SlugDungeonModel.pop_changed_cells, or None to draw everything.
+        """
+        num_rows = len(tiles)
+        num_cols = len(tiles[0]) if num_rows > 0 else 0
+        if changed is None or self._drawn_dimensions != (num_rows, num_cols):
+            self._draw_all(tiles, player_position, slugs)
+            return
+
+        self._follow(player_position)
+        if not self._region_covers_window():
+            self._draw_region(tiles, slugs)
+        super().redraw(tiles, player_position, slugs,
+                       {position for position in changed if self._in_region(position)})
 
-        # Draw the player
-        player_round = self.get_bbox(player_position)
-        self.create_oval(player_round, fill=PLAYER_COLOUR)
-        self.annotate_position(player_position, "Player")
+    def _draw_all(self, tiles: list[list[Tile]],
+                  player_position: Position, slugs: dict[Position, Slug]) -> None:
+        """
+        Clears the canvas and draws the region around the player from scratch.
 
-        # Draw the slugs
-        for slug_pos, slug in slugs.items():
-            slug_round = self.get_bbox(slug_pos)
-            self.create_oval(slug_round, fill=SLUG_COLOUR)
-            slug_name = "\n".join(slug.__class__.__name__.replace("Slug", " Slug").split())
-            self.annotate_position(slug_pos, slug_name)
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+            player_position (Position): The current position of the player.
+            slugs (dict[Position, Slug]): Dictionary of slug positions and their corresponding slugs.
+        """
+        self.clear()
+        self._weapon_items = {}
+        self._player_items = None
+        self._slug_items = {}
+        self._drawn_slugs = {}
+        self._tile_items = []
+        self._region = None
+        self._camera = None
+
+        num_rows = len(tiles)
+        num_cols = len(tiles[0]) if num_rows > 0 else 0
+        self.set_dimensions((num_rows, num_cols))
+        self._drawn_dimensions = (num_rows, num_cols)
+
+        # Scroll in whole cells over the canvas coordinates of the whole level
+        cell_width, cell_height = self._get_cell_size()
+        self.configure(scrollregion=(0, 0, num_cols * cell_width, num_rows * cell_height),
+                       xscrollincrement=cell_width, yscrollincrement=cell_height)
+        self._follow(player_position)
+        self._draw_region(tiles, slugs)
+        self._move_player(player_position)
+
+    def _follow(self, player_position: Position) -> None:
+        """
+        Centres the window on the player, without showing anything beyond the level,
+        and scrolls the canvas to it.
+
+        Args:
+            player_position (Position): The current position of the player.
+        """
+        rows, cols = self._level_dimensions
+        view_rows, view_cols = self._dimensions
+        camera = (min(max(player_position[0] - view_rows // 2, 0), rows - view_rows),
+                  min(max(player_position[1] - view_cols // 2, 0), cols - view_cols))
+        if camera != self._camera:
+            self._camera = camera
+            self.yview_moveto(camera[0] / rows)
+            self.xview_moveto(camera[1] / cols)
+
+    def _region_covers_window(self) -> bool:
+        """
+        Returns whether the drawn region contains every cell of the window.
+        """
+        if self._region is None:
+            return False
+        first_row, first_col, end_row, end_col = self._region
+        row, col = self._camera
+        view_rows, view_cols = self._dimensions
+        return (first_row <= row and row + view_rows <= end_row
+                and first_col <= col and col + view_cols <= end_col)
+
+    def _in_region(self, position: Position) -> bool:
+        """
+        Returns whether a cell is within the drawn region.
+        """
+        first_row, first_col, end_row, end_col = self._region
+        return first_row <= position[0] < end_row and first_col <= position[1] < end_col
+
+    def _draw_region(self, tiles: list[list[Tile]], slugs: dict[Position, Slug]) -> None:
+        """
+        Moves the drawn region to the window plus the margin. The tile rectangles
+        are moved and recoloured for their new cells, and the weapons and slugs
+        that left or entered the region are removed or drawn.
+
+        Args:
+            tiles (list[list[Tile]]): The 2D list of tiles representing the dungeon map.
+            slugs (dict[Position, Slug]): Dictionary of slug positions and their corresponding slugs.
+        """
+        rows, cols = self._level_dimensions
+        view_rows, view_cols = self._dimensions
+        margin = self._margin
+        row, col = self._camera
+        self._region = (max(row - margin, 0), max(col - margin, 0),
+                        min(row + view_rows + margin, rows), min(col + view_cols + margin, cols))
+        first_row, first_col, end_row, end_col = self._region
+        cells = [(row, col) for row in range(first_row, end_row)
+                 for col in range(first_col, end_col)]
+
+        # Reuse the tile rectangles, creating more only if the region has grown
+        for index, position in enumerate(cells):
+            bbox = self.get_bbox(position)
+            colour = self._get_tile_colour(tiles[position[0]][position[1]])
+            if index < len(self._tile_items):
+                item = self._tile_items[index]
+                self.coords(item, *bbox)
+                self.itemconfigure(item, fill=colour, state="normal")
+            else:
+                self._tile_items.append(self.create_rectangle(bbox, fill=colour, outline="black",
+                                                              tags="tile"))
+        for item in self._tile_items[len(cells):]:
+            self.itemconfigure(item, state="hidden")
+        self.tag_lower("tile")
+
+        for position in [position for position in self._weapon_items
+                         if not self._in_region(position)]:
+            self.delete(self._weapon_items.pop(position))
+        for position in cells:
+            self._draw_weapon(position, tiles[position[0]][position[1]].get_weapon())
+        self.tag_raise("entity")
+
+        visible = {position: slugs[position] for position in cells if position in slugs}
+        self._move_slugs(set(self._drawn_slugs) | visible.keys(), visible)
+
+
+MAX_WHOLE_MAP_CELLS = 30  # Larger levels are shown through a ViewportDungeonMap
 
 
 # 4.2.2 DungeonInfo(AbstractGrid)
@@ -1192,24 +2997,215 @@ class DungeonInfo(AbstractGrid):
 
         # Loop through each entity and display its information
         for row_idx, (position, entity) in enumerate(entities.items(), start=1):
-            name = entity.get_name()  # Entity name (e.g., Player, AngrySlug)
-            weapon = entity.get_weapon().get_name() if entity.get_weapon() else "None"
-            health = entity.get_health()  # Entity health
-            poison = entity.get_poison_level()  # Poison level
-
-            # Information to display for each column
-            info = [
-                name,  # Column 1: Entity name
-                f"({position[0]}, {position[1]})",  # Column 2: Position (x, y)
-                weapon,  # Column 3: Weapon name (or "None" if no weapon)
-                str(health),  # Column 4: Health
-                str(poison)  # Column 5: Poison level
-            ]
-
             # Annotate each piece of information in the grid
-            for col_idx, data in enumerate(info):
+            for col_idx, data in enumerate(self._get_row_text(position, entity)):
                 self.annotate_position((row_idx, col_idx), data)
 
+    @staticmethod
+    def _get_row_text(position: Position, entity: Entity) -> list[str]:
+        """
+        Returns the text shown in each column for an entity.
+
+        Args:
+            position (Position): The position of the entity.
+            entity (Entity): The entity to describe.
+
+        Returns:
+            list[str]: The name, position, weapon, health and poison level of the entity.
+        """
+        name = entity.get_name()  # Entity name (e.g., Player, AngrySlug)
+        weapon = entity.get_weapon().get_name() if entity.get_weapon() else "None"
+        health = entity.get_health()  # Entity health
+        poison = entity.get_poison_level()  # Poison level
+
+        # Information to display for each column
+        return [
+            name,  # Column 1: Entity name
+            f"({position[0]}, {position[1]})",  # Column 2: Position (x, y)
+            weapon,  # Column 3: Weapon name (or "None" if no weapon)
+            str(health),  # Column 4: Health
+            str(poison)  # Column 5: Poison level
+        ]
+
+
+class SlugInfoTable(DungeonInfo):
+    """
+    A DungeonInfo for any number of slugs. It shows as many rows as fit below the
+    headers and scrolls through the rest with the mouse wheel. The text items of the
+    visible cells are created once, and a redraw only changes the cells whose text
+    changed. Clicking the Health or Position header sorts the rows by health or by
+    distance to the player; clicking Name goes back to the order of the slugs.
+    While paused, scrolling and sorting do not read the slugs until the table is
+    resumed or redrawn.
+    """
+    HEADERS = ["Name", "Position", "Weapon", "Health", "Poison"]
+    SORT_HEADERS = {"Name": None, "Position": "distance", "Health": "health"}  # Header -> sort
+    SCROLLBAR_WIDTH = 4
+
+    def __init__(self, master, dimensions, size, **kwargs):
+        """
+        Initializes the table with the master widget, dimensions, and size.
+
+        Args:
+            master: The parent widget.
+            dimensions: The dimensions of the grid (rows, columns), including the header row.
+            size: The size of the grid (width, height).
+            **kwargs: Additional keyword arguments.
+        """
+        self._header_items: dict[str, int] = {}
+        self._sort: Optional[str] = None  # None, "health" or "distance"
+        super().__init__(master, dimensions, size, **kwargs)
+        self._first_row = 0  # Index of the entity in the top visible row
+        self._entities: Mapping[Position, Entity] = {}
+        self._player_position: Optional[Position] = None
+        self._paused = False  # Whether the entities may be changing on another thread
+        self._stale = False  # Whether rows were scrolled or sorted while paused
+
+        # Text items of the visible cells, and the text each shows
+        rows, cols = dimensions
+        self._cell_items = [[self.create_text(self.get_midpoint((row, col)), text="")
+                             for col in range(cols)] for row in range(1, rows)]
+        self._cell_text = [[""] * cols for _ in range(1, rows)]
+        self._scrollbar = self.create_rectangle(0, 0, 0, 0, fill="black", state="hidden")
+
+        self.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def _draw_headers(self):
+        """
+        Draws the header row, marking the column the rows are sorted by. Clicking a
+        sortable header sorts by it.
+        """
+        for col_idx, header in enumerate(self.HEADERS):
+            item = self.create_text(self.get_midpoint((0, col_idx)), text=header, font=TITLE_FONT)
+            self._header_items[header] = item
+            if header in self.SORT_HEADERS:
+                sort = self.SORT_HEADERS[header]
+                self.tag_bind(item, "<Button-1>", lambda event, sort=sort: self.sort_by(sort))
+        self._mark_sort()
+
+    def _mark_sort(self) -> None:
+        """
+        Shows which column the rows are sorted by in its header.
+        """
+        for header, sort in self.SORT_HEADERS.items():
+            marked = sort == self._sort and sort is not None
+            self.itemconfigure(self._header_items[header], text=header + (" ▲" if marked else ""))
+
+    def sort_by(self, sort: Optional[str]) -> None:
+        """
+        Sorts the rows and shows them from the top.
+
+        Args:
+            sort (Optional[str]): "health" for lowest health first, "distance" for
+                nearest to the player first, or None for the order of the slugs.
+        """
+        self._sort = sort
+        self._first_row = 0
+        self._mark_sort()
+        self._show_rows_unless_paused()
+
+    def scroll(self, rows: int) -> None:
+        """
+        Scrolls the table by a number of rows, down if positive.
+
+        Args:
+            rows (int): The number of rows to scroll by.
+        """
+        self._first_row += rows
+        self._show_rows_unless_paused()
+
+    def set_paused(self, paused: bool) -> None:
+        """
+        Pauses or resumes the table. A paused table does not read its entities when
+        scrolled or sorted, e.g. while a turn changes them on another thread, and
+        shows the rows on resuming instead.
+
+        Args:
+            paused (bool): Whether to pause the table.
+        """
+        self._paused = paused
+        if not paused and self._stale:
+            self._show_rows()
+
+    def _show_rows_unless_paused(self) -> None:
+        """
+        Shows the visible rows, or remembers to once the table is resumed.
+        """
+        if self._paused:
+            self._stale = True
+        else:
+            self._show_rows()
+
+    def redraw(self, entities: dict[Position, Entity],
+               player_position: Optional[Position] = None) -> None:
+        """
+        Updates the visible rows for the given entities.
+
+        Args:
+            entities (dict[Position, Entity]): Dictionary of entity positions and their corresponding entities.
+            player_position (Optional[Position]): The player's position, needed to sort
+                by distance.
+        """
+        self._entities = entities
+        self._player_position = player_position
+        self._show_rows()
+
+    def _get_visible_entities(self, count: int) -> list[tuple[Position, Entity]]:
+        """
+        Returns the entities of the visible rows in the current order, clamping the
+        scroll position so that no row past the last entity is shown.
+
+        Args:
+            count (int): The number of visible rows.
+
+        Returns:
+            list[tuple[Position, Entity]]: The position and entity of each visible row.
+        """
+        entities = self._entities
+        self._first_row = max(0, min(self._first_row, len(entities) - count))
+        end = self._first_row + count
+        if self._sort == "health":
+            ordered = heapq.nsmallest(end, entities.items(), key=lambda item: item[1].get_health())
+        elif self._sort == "distance" and self._player_position is not None:
+            row, col = self._player_position
+            ordered = heapq.nsmallest(end, entities.items(), key=lambda item: (
+                (item[0][0] - row) ** 2 + (item[0][1] - col) ** 2))
+        else:
+            return list(itertools.islice(entities.items(), self._first_row, end))
+        return ordered[self._first_row:]
+
+    def _show_rows(self) -> None:
+        """
+        Brings the text of the visible cells and the scrollbar up to date.
+        """
+        self._stale = False
+        count = len(self._cell_items)
+        visible = self._get_visible_entities(count)
+        for row_idx, (items, shown) in enumerate(zip(self._cell_items, self._cell_text)):
+            if row_idx < len(visible):
+                texts = self._get_row_text(*visible[row_idx])
+            else:
+                texts = [""] * len(items)
+            for col_idx, text in enumerate(texts):
+                if shown[col_idx] != text:
+                    self.itemconfigure(items[col_idx], text=text)
+                    shown[col_idx] = text
+
+        # Show how much of the table is visible along the right edge, if not all of it
+        total = len(self._entities)
+        if total <= count:
+            self.itemconfigure(self._scrollbar, state="hidden")
+            return
+        width, height = self._size
+        top = self.get_bbox((1, 0))[1]
+        span = height - top
+        self.coords(self._scrollbar,
+                    width - self.SCROLLBAR_WIDTH, top + span * self._first_row // total,
+                    width, top + span * (self._first_row + count) // total)
+        self.itemconfigure(self._scrollbar, state="normal")
+
 
 # 4.2.3 ButtonPanel(tk.Frame)
 class ButtonPanel(tk.Frame):
@@ -1251,6 +3247,8 @@ class SlugDungeon:
     initializing the game, managing the graphical user interface, processing user
     input, and controlling game interactions.
     """
+    whole_map_class: type = DungeonMap  # Draws levels shown whole, e.g. RasterDungeonMap
+
     def __init__(self, root: tk.Tk, filename: str) -> None:
         """
         Initializes the SlugDungeon game with the main window and level file.
@@ -1260,7 +3258,7 @@ class SlugDungeon:
             filename (str): The path to the level file to load.
         """
         self.root = root
-        self.model = load_level(filename)  # Load the game model based on the level file
+        self.model = LEVEL_CACHE.load_level(filename)  # Load the game model based on the level file
         self.filename = filename
 
         # Set the main window size
@@ -1269,11 +3267,11 @@ class SlugDungeon:
         self.root.geometry(f"{window_width}x{window_height}")
 
         # Create and place DungeonMap
-        self.dungeon_map = DungeonMap(root, self.model.get_dimensions(), size=DUNGEON_MAP_SIZE)
-        self.dungeon_map.grid(row=0, column=0, rowspan=2, padx=5, pady=5)
+        self.dungeon_map: Optional[DungeonMap] = None
+        self._place_dungeon_map()
 
         # Create and place SlugInfo
-        self.slug_info = DungeonInfo(root, dimensions=(7, 5), size=SLUG_INFO_SIZE)
+        self.slug_info = SlugInfoTable(root, dimensions=(7, 5), size=SLUG_INFO_SIZE)
         self.slug_info.grid(row=0, column=1, padx=5, pady=5)
 
         # Create and place PlayerInfo
@@ -1288,20 +3286,25 @@ class SlugDungeon:
         self.root.bind("<KeyPress>", self.handle_key_press)
 
         # Initial redraw
-        self.redraw()
+        self.redraw(full=True)
         self.root.update_idletasks()
 
-    def redraw(self) -> None:
+    def redraw(self, full: bool = False) -> None:
         """
         Redraws the game interface, including the dungeon map, slug information,
         and player information.
+
+        Args:
+            full (bool): Whether to draw the whole map from scratch, e.g. after a new
+                model was loaded, instead of only the cells that changed.
         """
-        # Clear and redraw DungeonMap
-        self.dungeon_map.redraw(self.model.get_tiles(),
-                                self.model.get_player_position(), self.model.get_slugs())
+        # Redraw the changed cells of DungeonMap
+        changed = self.model.pop_changed_cells()
+        self.dungeon_map.redraw(self.model.get_tiles(), self.model.get_player_position(),
+                                self.model.get_slugs(), None if full else changed)
 
-        # Clear and redraw SlugInfo
-        self.slug_info.redraw(self.model.get_slugs())
+        # Update the visible rows of SlugInfo
+        self.slug_info.redraw(self.model.get_slugs(), self.model.get_player_position())
 
         # Clear and redraw PlayerInfo
         player_data = {self.model.get_player_position(): self.model.get_player()}
@@ -1327,20 +3330,40 @@ class SlugDungeon:
         }
 
         if key in movement:
-            move_delta = movement[key]
-            self.model.handle_player_move(move_delta)
-            self.redraw()
-            self.root.update_idletasks()
-
-            # Check for win or loss conditions
-            if self.model.has_won() or self.model.has_lost():
-                title = WIN_TITLE if self.model.has_won() else LOSE_TITLE
-                message = WIN_MESSAGE if self.model.has_won() else LOSE_MESSAGE
-                if messagebox.askyesno(title, message):
-                    self.model = load_level(self.filename)  # Reload the level
-                    self.redraw()  # Update the view
-                else:
-                    self.root.destroy()
+            self.play_move(movement[key])
+
+    def play_move(self, move_delta: Position) -> None:
+        """
+        Plays one move of the player and shows its outcome.
+
+        Args:
+            move_delta (Position): The change in position for the player's move.
+        """
+        self.model.handle_player_move(move_delta)
+        self.finish_turn()
+
+    def finish_turn(self) -> bool:
+        """
+        Shows the state of the model after a turn, and handles a win or loss by
+        offering to restart the level or closing the game.
+
+        Returns:
+            bool: True if the same game goes on, False if it was restarted or closed.
+        """
+        self.redraw()
+        self.root.update_idletasks()
+
+        # Check for win or loss conditions
+        if self.model.has_won() or self.model.has_lost():
+            title = WIN_TITLE if self.model.has_won() else LOSE_TITLE
+            message = WIN_MESSAGE if self.model.has_won() else LOSE_MESSAGE
+            if messagebox.askyesno(title, message):
+                self.model = LEVEL_CACHE.load_level(self.filename)  # Restart from the cached level
+                self.redraw(full=True)  # Update the view
+            else:
+                self.root.destroy()
+            return False
+        return True
 
     def load_level(self) -> None:
         """
@@ -1352,22 +3375,119 @@ class SlugDungeon:
         )
 
         # Load the new game model
-        self.model = load_level(filename)
+        self.model = LEVEL_CACHE.load_level(filename)
+        self._place_dungeon_map()
         self.dungeon_map.set_dimensions((len(self.model.get_tiles()), len(self.model.get_tiles()[0])))
-        self.redraw()
+        self.redraw(full=True)
+
+    def _place_dungeon_map(self) -> None:
+        """
+        Creates and places the map for the current level: a ViewportDungeonMap that
+        follows the player if the level has more than MAX_WHOLE_MAP_CELLS rows or
+        columns, or a whole_map_class map of the whole level otherwise. The existing
+        map is kept if it is of the right kind.
+        """
+        dimensions = self.model.get_dimensions()
+        if max(dimensions) > MAX_WHOLE_MAP_CELLS:
+            map_class = ViewportDungeonMap
+        else:
+            map_class = self.whole_map_class
+        if type(self.dungeon_map) is map_class:
+            return
+        if self.dungeon_map is not None:
+            self.dungeon_map.destroy()
+        self.dungeon_map = map_class(self.root, dimensions, size=DUNGEON_MAP_SIZE)
+        self.dungeon_map.grid(row=0, column=0, rowspan=2, padx=5, pady=5)
+
+
+class ThreadedSlugDungeon(SlugDungeon):
+    """
+    A SlugDungeon controller that plays each turn on a worker thread, so a slow turn
+    on a big map does not freeze the window. Key presses made while a turn is being
+    played are coalesced: only the latest is played next. The model is only ever
+    used by one thread at a time: the slug table is paused while a turn is played,
+    and the views are only updated on the Tk thread, from the model of a finished
+    turn.
+    """
+    POLL_INTERVAL = 10  # Milliseconds between checks for a finished turn
+
+    def __init__(self, root: tk.Tk, filename: str) -> None:
+        """
+        Starts the worker thread and initializes the game as SlugDungeon does.
+
+        Args:
+            root (tk.Tk): The root Tkinter window.
+            filename (str): The path to the level file to load.
+        """
+        self._turns: queue.Queue = queue.Queue()  # (model, move) for the worker to play
+        self._finished: queue.Queue = queue.Queue()  # (model, error) of each played turn
+        self._busy = False  # Whether the worker is playing a turn
+        self._pending_move: Optional[Position] = None  # Latest move pressed during the turn
+        threading.Thread(target=self._play_turns, daemon=True).start()
+        super().__init__(root, filename)
+
+    def _play_turns(self) -> None:
+        """
+        Plays the turns handed to the worker thread, forever.
+        """
+        while True:
+            model, move_delta = self._turns.get()
+            try:
+                model.handle_player_move(move_delta)
+            except Exception as error:
+                self._finished.put((model, error))
+            else:
+                self._finished.put((model, None))
+
+    def play_move(self, move_delta: Position) -> None:
+        """
+        Hands the move to the worker thread, or keeps it for later if a turn is
+        already being played.
+
+        Args:
+            move_delta (Position): The change in position for the player's move.
+        """
+        if self._busy:
+            self._pending_move = move_delta  # Replaces any earlier pending move
+            return
+        self._busy = True
+        self.slug_info.set_paused(True)  # Its rows show slugs the turn changes
+        self._turns.put((self.model, move_delta))
+        self.root.after(self.POLL_INTERVAL, self._check_turn)
+
+    def _check_turn(self) -> None:
+        """
+        Shows the outcome of a finished turn on the Tk thread and starts the pending
+        move, or checks again later if the turn is still being played.
+        """
+        try:
+            model, error = self._finished.get_nowait()
+        except queue.Empty:
+            self.root.after(self.POLL_INTERVAL, self._check_turn)
+            return
+
+        self._busy = False
+        self.slug_info.set_paused(False)
+        move_delta, self._pending_move = self._pending_move, None
+        if error is not None:
+            raise error
+        # A level loaded during the turn replaces the model, and its pending move with it
+        if model is self.model and self.finish_turn() and move_delta is not None:
+            self.play_move(move_delta)
 
 
 #4.4 play_game(root: tk.Tk, file_path: str) -> None
-def play_game(root: tk.Tk, file_path: str) -> None:
+def play_game(root: tk.Tk, file_path: str, threaded: bool = False) -> None:
     """
     Play the SlugDungeon game.
 
     Args:
         root (tk.Tk): The root window
         file_path (str): Path to the level file
+        threaded (bool): Whether to play turns on a worker thread (ThreadedSlugDungeon)
     """
     root.title("Slug Dungeon")
-    SlugDungeon(root, file_path)
+    (ThreadedSlugDungeon if threaded else SlugDungeon)(root, file_path)
     root.mainloop()
 
 
@@ -0,0 +1,340 @@
+"""
+Benchmarks of Slug Dungeon at increasing map sizes.
+
+Synthetic levels are generated with a configurable size, wall density, slug mix
+and weapon density. At each size the suite times load_level, end_turn,
+handle_player_move and DungeonMap.redraw (in a withdrawn Tk window, so nothing
+is shown, or without a display in a stand-in for Tk that counts the drawing
+commands instead of running them), and writes the results as JSON. Given the JSON of an earlier run as a
+baseline, it reports every timing that got slower by more than a threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+from collections import Counter
+from typing import Callable, NamedTuple, Optional
+
+from a2 import *
+
+MOVES = list(POSITION_DELTAS) + [(0, 0)]
+SLUG_SYMBOLS = (NICE_SLUG_SYMBOL, ANGRY_SLUG_SYMBOL, SCARED_SLUG_SYMBOL)
+DEFAULT_SIZES = ((25, 25), (100, 100), (300, 300))
+
+
+class LevelConfig(NamedTuple):
+    """
+    The make-up of a generated level. Densities are the chance of each inner cell
+    being a wall, a slug or a weapon.
+    """
+    wall_density: float = 0.15
+    slug_density: float = 0.05
+    slug_mix: tuple[float, float, float] = (1.0, 1.0, 1.0)  # Weights of Nice, Angry, Scared slugs
+    weapon_density: float = 0.02
+    player_health: int = 20
+    seed: int = 0
+
+
+def generate_level(filename: str, rows: int, cols: int,
+                   config: LevelConfig = LevelConfig()) -> None:
+    """
+    Writes a random level surrounded by walls, with the player in the top left
+    corner and the goal in the bottom right one.
+
+    Args:
+        filename (str): The path to write the level to.
+        rows (int): The number of rows, at least 3.
+        cols (int): The number of columns, at least 4.
+        config (LevelConfig): The make-up of the level.
+    """
+    rng = random.Random(config.seed)
+    weapon_symbols = list(TILE_WEAPONS)
+    with open(filename, 'w') as file:
+        file.write(f"{config.player_health}\n")
+        for row in range(rows):
+            line = []
+            for col in range(cols):
+                if row in (0, rows - 1) or col in (0, cols - 1):
+                    line.append(WALL_TILE)
+                elif (row, col) == (1, 1):
+                    line.append(PLAYER_SYMBOL)
+                elif (row, col) == (rows - 2, cols - 2):
+                    line.append(GOAL_TILE)
+                else:
+                    roll = rng.random()
+                    if roll < config.wall_density:
+                        line.append(WALL_TILE)
+                    elif roll < config.wall_density + config.slug_density:
+                        line.append(rng.choices(SLUG_SYMBOLS, config.slug_mix)[0])
+                    elif roll < config.wall_density + config.slug_density + config.weapon_density:
+                        line.append(rng.choice(weapon_symbols))
+                    else:
+                        line.append(FLOOR_TILE)
+            file.write("".join(line) + "\n")
+
+
+class RecordingTk:
+    """
+    Stands in for a Tk window where there is no display. Widgets made in it build
+    their Tcl commands as usual, but the commands are counted instead of run, so a
+    redraw is timed without Tk's own drawing.
+    """
+    def __init__(self) -> None:
+        self.tk = self  # Widgets send their commands to their master's interpreter
+        self._w = '.'
+        self._last_child_ids = None
+        self.children = {}
+        self.calls: Counter[str] = Counter()  # Number of each widget command, e.g. "create rectangle"
+        self._items = 0  # Last canvas item id handed out
+
+    def call(self, *args) -> object:
+        """
+        Counts a Tcl command, returning a new item id for the canvas create commands.
+        """
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        if len(args) > 1 and args[0].startswith('.'):
+            command = args[1] if args[1] != 'create' else f"create {args[2]}"
+            self.calls[command] += 1
+            if args[1] == 'create':
+                self._items += 1
+                return self._items
+        return ''
+
+    def getint(self, value: object) -> int:
+        return int(value)
+
+    def getdouble(self, value: object) -> float:
+        return float(value)
+
+    def splitlist(self, value: object) -> tuple:
+        return value if isinstance(value, tuple) else ()
+
+    def createcommand(self, name: str, function: Callable) -> None:
+        pass
+
+    def deletecommand(self, name: str) -> None:
+        pass
+
+    def withdraw(self) -> None:
+        pass
+
+    def destroy(self) -> None:
+        self.children.clear()
+
+
+def _summarise(times: list[float]) -> dict[str, float]:
+    """
+    Returns the median, fastest and number of a list of timings, in seconds.
+    """
+    return {"median": statistics.median(times), "min": min(times), "runs": len(times)}
+
+
+def _time(function: Callable[[], object]) -> float:
+    """
+    Returns the seconds one call of the function takes.
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def benchmark_level(filename: str, repeat: int = 5, turns: int = 50,
+                    root: Optional[tk.Tk] = None) -> dict[str, dict[str, float]]:
+    """
+    Times the game on one level.
+
+    Args:
+        filename (str): The path to the level file.
+        repeat (int): The number of times to load the level.
+        turns (int): The number of turns to time end_turn and handle_player_move over.
+        root (Optional[tk.Tk]): A window, or a RecordingTk, to draw the map in, or
+            None to skip redraws.
+
+    Returns:
+        dict[str, dict[str, float]]: The timings of each operation.
+    """
+    results = {"load_level": _summarise([_time(lambda: load_level(filename))
+                                         for _ in range(repeat)])}
+
+    model = load_level(filename)
+    results["end_turn"] = _summarise([_time(model.end_turn) for _ in range(turns)])
+
+    rng = random.Random(0)
+    model = load_level(filename)
+    moves = [rng.choice(MOVES) for _ in range(turns)]
+    results["handle_player_move"] = _summarise(
+        [_time(lambda: model.handle_player_move(move)) for move in moves])
+
+    if root is not None:
+        model = load_level(filename)
+        dungeon_map = DungeonMap(root, model.get_dimensions(), size=DUNGEON_MAP_SIZE)
+
+        def redraw(full: bool) -> None:
+            changed = model.pop_changed_cells()
+            dungeon_map.redraw(model.get_tiles(), model.get_player_position(),
+                               model.get_slugs(), None if full else changed)
+            dungeon_map.update_idletasks()
+
+        full_times = [_time(lambda: redraw(True)) for _ in range(repeat)]
+        turn_times = []
+        for move in moves:
+            model.handle_player_move(move)
+            turn_times.append(_time(lambda: redraw(False)))
+        dungeon_map.destroy()
+        results["redraw_full"] = _summarise(full_times)
+        results["redraw_turn"] = _summarise(turn_times)
+    return results
+
+
+def run_benchmarks(sizes: list[tuple[int, int]], config: LevelConfig = LevelConfig(),
+                   repeat: int = 5, turns: int = 50, redraw: bool = True) -> dict[str, object]:
+    """
+    Generates a level of each size and benchmarks it.
+
+    Args:
+        sizes (list[tuple[int, int]]): The (rows, columns) of each level.
+        config (LevelConfig): The make-up of the levels.
+        repeat (int): The number of times to load each level.
+        turns (int): The number of turns to time on each level.
+        redraw (bool): Whether to time redraws. Without a display they are timed in a
+            RecordingTk, and the report gives the drawing commands each size sent.
+
+    Returns:
+        dict[str, object]: The run's settings and the timings at each size, keyed "ROWSxCOLS".
+    """
+    root = None
+    display = False
+    if redraw:
+        try:
+            root = tk.Tk()
+            root.withdraw()
+            display = True
+        except tk.TclError:
+            root = RecordingTk()  # No display
+
+
+    results = {}
+    canvas_calls = {}
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for rows, cols in sizes:
+                filename = os.path.join(directory, f"{rows}x{cols}.txt")
+                generate_level(filename, rows, cols, config)
+                results[f"{rows}x{cols}"] = benchmark_level(filename, repeat, turns, root)
+                if isinstance(root, RecordingTk):
+                    canvas_calls[f"{rows}x{cols}"] = dict(root.calls)
+                    root.calls.clear()
+    finally:
+        if root is not None:
+            root.destroy()
+
+    report = {
+        "python": platform.python_version(),
+        "config": config._asdict(),
+        "repeat": repeat,
+        "turns": turns,
+        "redraw": root is not None,
+        "display": display,
+        "results": results,
+    }
+    if canvas_calls:
+        report["canvas_calls"] = canvas_calls
+    return report
+
+
+def find_regressions(report: dict[str, object], baseline: dict[str, object],
+                     threshold: float = 0.25) -> list[dict[str, object]]:
+    """
+    Compares the median timings of a run with those of a baseline run.
+
+    Args:
+        report (dict[str, object]): The output of run_benchmarks.
+        baseline (dict[str, object]): An earlier output of run_benchmarks.
+        threshold (float): The fraction a median may grow by before it is a regression.
+            Redraws are only compared if both runs drew on a display, or neither did.
+
+    Returns:
+        list[dict[str, object]]: The size, operation, both medians and ratio of each
+        timing that regressed, worst first.
+    """
+    regressions = []
+    same_canvas = report.get("display") == baseline.get("display")
+    for size, timings in report["results"].items():
+        for operation, timing in timings.items():
+            if operation.startswith("redraw") and not same_canvas:
+                continue
+            before = baseline["results"].get(size, {}).get(operation)
+            if before is None or before["median"] <= 0:
+                continue
+            ratio = timing["median"] / before["median"]
+            if ratio > 1 + threshold:
+                regressions.append({"size": size, "operation": operation,
+                                    "baseline": before["median"], "median": timing["median"],
+                                    "ratio": ratio})
+    regressions.sort(key=lambda regression: regression["ratio"], reverse=True)
+    return regressions
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    """
+    Parses a "ROWSxCOLS" size argument.
+    """
+    try:
+        rows, cols = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}") from None
+    if rows < 3 or cols < 4:
+        raise argparse.ArgumentTypeError("levels must be at least 3x4")
+    return rows, cols
+
+
+def main() -> None:
+    """
+    Runs the benchmarks from the command line, prints or writes the JSON report,
+    and exits with status 1 if any timing regressed against the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Slug Dungeon on generated levels.")
+    parser.add_argument("--sizes", type=_parse_size, nargs="+",
+                        default=list(DEFAULT_SIZES), metavar="ROWSxCOLS")
+    defaults = LevelConfig()
+    parser.add_argument("--walls", type=float, default=defaults.wall_density)
+    parser.add_argument("--slugs", type=float, default=defaults.slug_density)
+    parser.add_argument("--slug-mix", type=float, nargs=3, default=defaults.slug_mix,
+                        metavar=("NICE", "ANGRY", "SCARED"))
+    parser.add_argument("--weapons", type=float, default=defaults.weapon_density)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--no-redraw", action="store_true", help="skip the redraw timings")
+    parser.add_argument("--output", metavar="FILE", help="write the report to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="report of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown allowed before a timing is a regression (default 0.25)")
+    args = parser.parse_args()
+
+    config = LevelConfig(args.walls, args.slugs, tuple(args.slug_mix), args.weapons,
+                         seed=args.seed)
+    report = run_benchmarks(args.sizes, config, args.repeat, args.turns, not args.no_redraw)
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            report["regressions"] = find_regressions(report, json.load(file), args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
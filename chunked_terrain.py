@@ -0,0 +1,492 @@
+"""
+Chunked, lazily loaded terrain for levels too big to hold in memory.
+
+The terrain is split into CHUNK_SIZE x CHUNK_SIZE chunks. A chunk's tiles and
+occupancy flags are only built when a cell in it is first used, from a backing
+source: a level file read through a memory map, or a procedural generator.
+At most `capacity` chunks are kept; beyond that the least recently used chunk
+is dropped, unless the player or a slug stands in it. Weapons the game has
+moved are kept by the model, and put back when a dropped chunk is loaded again.
+
+The model sees the chunks through ChunkedTiles, which stands in for its
+list[list[Tile]], and ChunkedOccupancy, which stands in for its flat occupancy
+bytearray, so it runs unchanged on terrain of any size.
+"""
+import mmap
+import random
+from collections import OrderedDict
+from typing import Callable, Iterator, Mapping, Optional
+
+from a2 import *
+
+CHUNK_SHIFT = 6
+CHUNK_SIZE = 1 << CHUNK_SHIFT  # Rows and columns of a chunk
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# 1 for the occupancy flags that keep a chunk loaded, for bytearray.translate
+PINNED_FLAGS = bytes(1 if flags & (SLUG_CELL | PLAYER_CELL) else 0 for flags in range(256))
+
+# Reads the level symbols of a block of cells: (first row, first col, rows, cols) -> rows of symbols
+ChunkReader = Callable[[int, int, int, int], list[str]]
+
+
+class LevelFileSource:
+    """
+    Reads chunks straight out of a text level file whose rows all have the same length.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Maps the level file into memory and measures its rows.
+
+        Args:
+            filename (str): The path to the level file.
+
+        Raises:
+            LevelError: If the level has no rows or its rows differ in length.
+        """
+        self._filename = filename
+        with open(filename, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = self._buffer
+        self._start = buffer.find(b"\n") + 1  # Rows start after the health line
+        if self._start == 0 or self._start == len(buffer):
+            raise LevelError(filename, 2, None, "the level has no rows")
+        first_end = buffer.find(b"\n", self._start)
+        if first_end < 0:
+            first_end = len(buffer)
+        self._cols = first_end - self._start
+        if buffer[first_end - 1:first_end] == b"\r":
+            self._cols -= 1
+        self._stride = first_end + 1 - self._start  # Bytes per row, with the line ending
+        rows, extra = divmod(len(buffer) - self._start + 1, self._stride)
+        if extra > 1:
+            raise LevelError(filename, rows + 2, None, "every row must have the same length")
+        self._rows = rows
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """
+        Returns the number of rows and columns of the level.
+        """
+        return self._rows, self._cols
+
+    def read(self, row: int, col: int, rows: int, cols: int) -> list[str]:
+        """
+        Returns the level symbols of a block of cells, one string per row.
+        """
+        buffer = self._buffer
+        start = self._start + row * self._stride + col
+        return [buffer[offset:offset + cols].decode("latin-1")
+                for offset in range(start, start + rows * self._stride, self._stride)]
+
+    def read_entities(self) -> tuple[int, Optional[Position], dict[Position, Slug]]:
+        """
+        Scans the level once for the player's health and position and the slugs.
+
+        Returns:
+            tuple[int, Optional[Position], dict[Position, Slug]]: The player's health,
+            the player's position and a new slug at each slug's position.
+        """
+        buffer = self._buffer
+        player_health = int(buffer[:self._start].strip() or 0)
+        slug_symbols = {symbol.encode("latin-1"): slug_class
+                        for symbol, (_, _, _, slug_class) in LEVEL_SYMBOLS.items()
+                        if slug_class is not None}
+        player_position = None
+        slugs = {}
+        for row in range(self._rows):
+            start = self._start + row * self._stride
+            line = buffer[start:start + self._cols]
+            col = line.find(PLAYER_SYMBOL.encode("latin-1"))
+            if col >= 0 and player_position is None:
+                player_position = (row, col)
+            for symbol, slug_class in slug_symbols.items():
+                col = line.find(symbol)
+                while col >= 0:
+                    slugs[(row, col)] = slug_class()
+                    col = line.find(symbol, col + 1)
+        return player_health, player_position, dict(sorted(slugs.items()))
+
+
+class ScatteredDungeon:
+    """
+    A procedural generator of endless open dungeons: walls, weapons and goals are
+    scattered at random, the same way every time for the same seed.
+    """
+
+    def __init__(self, seed: int = 0, wall_density: float = 0.2,
+                 weapon_density: float = 0.01, goal_density: float = 0.0,
+                 start: Optional[Position] = None) -> None:
+        """
+        Initializes the generator.
+
+        Args:
+            seed (int): Chooses the dungeon.
+            wall_density (float): The chance of each cell being a wall.
+            weapon_density (float): The chance of each cell holding a weapon.
+            goal_density (float): The chance of each cell being a goal.
+            start (Optional[Position]): A cell whose neighbourhood is kept clear for the player.
+        """
+        self._seed = seed
+        self._densities = (wall_density, weapon_density, goal_density)
+        self._start = start
+
+    def __call__(self, row: int, col: int, rows: int, cols: int) -> list[str]:
+        """
+        Returns the level symbols of a block of cells, one string per row. The same
+        cells always get the same symbols, as each block is seeded by its position.
+        """
+        rng = random.Random(hash((self._seed, row, col)))
+        wall_density, weapon_density, goal_density = self._densities
+        weapons = list(TILE_WEAPONS)
+        lines = []
+        for cell_row in range(row, row + rows):
+            line = []
+            for cell_col in range(col, col + cols):
+                roll = rng.random()
+                if (self._start is not None and abs(cell_row - self._start[0]) <= 1
+                        and abs(cell_col - self._start[1]) <= 1):
+                    line.append(FLOOR_TILE)
+                elif roll < wall_density:
+                    line.append(WALL_TILE)
+                elif roll < wall_density + weapon_density:
+                    line.append(rng.choice(weapons))
+                elif roll < wall_density + weapon_density + goal_density:
+                    line.append(GOAL_TILE)
+                else:
+                    line.append(FLOOR_TILE)
+            lines.append("".join(line))
+        return lines
+
+
+class ChunkStore:
+    """
+    The loaded chunks of a terrain, each holding the tiles and occupancy flags of
+    its cells, evicted least recently used first.
+    """
+
+    def __init__(self, reader: ChunkReader, dimensions: tuple[int, int],
+                 capacity: int = 256) -> None:
+        """
+        Initializes an empty store.
+
+        Args:
+            reader (ChunkReader): Reads the level symbols of the cells of a chunk.
+            dimensions (tuple[int, int]): The number of rows and columns of the terrain.
+            capacity (int): The most chunks to keep loaded, besides those with the
+                player or a slug in them.
+        """
+        self._reader = reader
+        self._rows, self._cols = dimensions
+        self._capacity = capacity
+        self._chunks: OrderedDict[tuple[int, int], tuple[bytearray, list[list[Tile]]]] = OrderedDict()
+        self._last_key: Optional[tuple[int, int]] = None  # The chunk used last, skips the LRU update
+        self._last_chunk: Optional[tuple[bytearray, list[list[Tile]]]] = None
+        self._weapons: Mapping[Position, Optional[Weapon]] = {}  # Weapons the game has moved
+        self.loads = 0  # Number of chunks loaded, including reloads
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """
+        Returns the number of rows and columns of the terrain.
+        """
+        return self._rows, self._cols
+
+    def set_weapons(self, weapons: Mapping[Position, Optional[Weapon]]) -> None:
+        """
+        Sets the weapons the game has moved, by cell, to apply to chunks as they load.
+        The mapping is read, not copied, so it should be the model's own.
+
+        Args:
+            weapons (Mapping[Position, Optional[Weapon]]): The weapon now on each changed cell.
+        """
+        self._weapons = weapons
+
+    def get_chunk(self, row: int, col: int) -> tuple[bytearray, list[list[Tile]]]:
+        """
+        Returns the occupancy flags and tiles of the chunk holding a cell, loading it
+        if needed.
+
+        Args:
+            row (int): The row of the cell.
+            col (int): The column of the cell.
+
+        Returns:
+            tuple[bytearray, list[list[Tile]]]: The flags and tiles of the chunk, indexed
+            by the cell's row and column within it.
+        """
+        key = (row >> CHUNK_SHIFT, col >> CHUNK_SHIFT)
+        if key == self._last_key:
+            return self._last_chunk
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._load(key)
+        else:
+            self._chunks.move_to_end(key)
+        self._last_key, self._last_chunk = key, chunk
+        return chunk
+
+    def _load(self, key: tuple[int, int]) -> tuple[bytearray, list[list[Tile]]]:
+        """
+        Builds a chunk from the reader, puts back the weapons the game has moved in it,
+        and makes room for it.
+        """
+        first_row, first_col = key[0] << CHUNK_SHIFT, key[1] << CHUNK_SHIFT
+        rows = min(CHUNK_SIZE, self._rows - first_row)
+        cols = min(CHUNK_SIZE, self._cols - first_col)
+        flags = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        tiles = []
+        for chunk_row, line in enumerate(self._reader(first_row, first_col, rows, cols)):
+            tile_row = []
+            base = chunk_row << CHUNK_SHIFT
+            for chunk_col, char in enumerate(line):
+                tile_symbol, is_blocking, weapon, _ = LEVEL_SYMBOLS.get(char, DEFAULT_LEVEL_SYMBOL)
+                tile = Tile(tile_symbol, is_blocking)
+                cell = 0
+                if is_blocking:
+                    cell |= WALL_CELL
+                if tile_symbol == GOAL_TILE:
+                    cell |= GOAL_CELL
+                if weapon is not None:
+                    tile.set_weapon(weapon)
+                    cell |= WEAPON_CELL
+                flags[base + chunk_col] = cell
+                tile_row.append(tile)
+            tiles.append(tile_row)
+
+        for (row, col), weapon in self._weapons.items():
+            if (row >> CHUNK_SHIFT, col >> CHUNK_SHIFT) == key:
+                tiles[row & CHUNK_MASK][col & CHUNK_MASK].set_weapon(weapon)
+                index = ((row & CHUNK_MASK) << CHUNK_SHIFT) + (col & CHUNK_MASK)
+                if weapon:
+                    flags[index] |= WEAPON_CELL
+                else:
+                    flags[index] &= ~WEAPON_CELL
+
+        chunk = (flags, tiles)
+        self._chunks[key] = chunk
+        self.loads += 1
+        self._evict(key)
+        return chunk
+
+    def _evict(self, loading: tuple[int, int]) -> None:
+        """
+        Drops the least recently used chunks over capacity that have neither the
+        player nor a slug in them. The chunk being loaded is kept, as the caller
+        is about to use it.
+
+        Args:
+            loading (tuple[int, int]): The key of the chunk being loaded.
+        """
+        excess = len(self._chunks) - self._capacity
+        if excess <= 0:
+            return
+        for key in list(self._chunks):
+            if excess <= 0:
+                break
+            flags, _ = self._chunks[key]
+            if key != loading and flags.translate(PINNED_FLAGS).find(1) < 0:
+                del self._chunks[key]
+                if key == self._last_key:
+                    self._last_key = self._last_chunk = None
+                excess -= 1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of chunks loaded.
+        """
+        return len(self._chunks)
+
+
+class ChunkedOccupancy:
+    """
+    The occupancy flags of a chunked terrain, indexed by flat cell index like the
+    model's bytearray.
+    """
+
+    def __init__(self, store: ChunkStore) -> None:
+        """
+        Initializes the flags over the given chunks.
+
+        Args:
+            store (ChunkStore): The chunks to read and write the flags of.
+        """
+        self._store = store
+        self._cols = store.get_dimensions()[1]
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Returns the flags of the cell at the flat index, loading its chunk if needed.
+        """
+        row, col = divmod(index, self._cols)
+        return self._store.get_chunk(row, col)[0][((row & CHUNK_MASK) << CHUNK_SHIFT)
+                                                  + (col & CHUNK_MASK)]
+
+    def __setitem__(self, index: int, flags: int) -> None:
+        """
+        Sets the flags of the cell at the flat index.
+        """
+        row, col = divmod(index, self._cols)
+        self._store.get_chunk(row, col)[0][((row & CHUNK_MASK) << CHUNK_SHIFT)
+                                           + (col & CHUNK_MASK)] = flags
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cells.
+        """
+        rows, cols = self._store.get_dimensions()
+        return rows * cols
+
+    def copy(self) -> 'ChunkedOccupancy':
+        """
+        Refuses to copy, as the flags of evicted chunks are rebuilt from the source.
+
+        Raises:
+            TypeError: Always.
+        """
+        raise TypeError("A model on chunked terrain cannot be cloned")
+
+
+class ChunkedRow:
+    """
+    One row of tiles of a chunked terrain.
+    """
+
+    def __init__(self, store: ChunkStore, row: int) -> None:
+        """
+        Initializes the row.
+
+        Args:
+            store (ChunkStore): The chunks to read the tiles of.
+            row (int): The index of the row.
+        """
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, col: int) -> Tile:
+        """
+        Returns the tile in the given column, loading its chunk if needed.
+        """
+        row = self._row
+        if col < 0:
+            col += self._store.get_dimensions()[1]
+        return self._store.get_chunk(row, col)[1][row & CHUNK_MASK][col & CHUNK_MASK]
+
+    def __setitem__(self, col: int, tile: Tile) -> None:
+        """
+        Replaces the tile in the given column.
+        """
+        row = self._row
+        self._store.get_chunk(row, col)[1][row & CHUNK_MASK][col & CHUNK_MASK] = tile
+
+    def __len__(self) -> int:
+        """
+        Returns the number of columns.
+        """
+        return self._store.get_dimensions()[1]
+
+    def __iter__(self) -> Iterator[Tile]:
+        """
+        Iterates over the tiles of the row.
+        """
+        for col in range(len(self)):
+            yield self[col]
+
+
+class ChunkedTiles:
+    """
+    The tiles of a chunked terrain, indexed like the list[list[Tile]] they stand in for.
+    Iterating over every tile loads every chunk, so views should only ask for the
+    cells they show, as ViewportDungeonMap does.
+    """
+
+    def __init__(self, store: ChunkStore) -> None:
+        """
+        Initializes the grid over the given chunks.
+
+        Args:
+            store (ChunkStore): The chunks to read the tiles of.
+        """
+        self._store = store
+
+    def __getitem__(self, row: int) -> ChunkedRow:
+        """
+        Returns a view of the tiles of the given row.
+        """
+        if row < 0:
+            row += len(self)
+        return ChunkedRow(self._store, row)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows.
+        """
+        return self._store.get_dimensions()[0]
+
+    def __iter__(self) -> Iterator[ChunkedRow]:
+        """
+        Iterates over the rows of tiles.
+        """
+        for row in range(len(self)):
+            yield self[row]
+
+
+def new_chunked_model(store: ChunkStore, slugs: dict[Position, Slug], player: Player,
+                      player_position: Position) -> SlugDungeonModel:
+    """
+    Builds a SlugDungeonModel on chunked terrain.
+
+    Args:
+        store (ChunkStore): The terrain.
+        slugs (dict[Position, Slug]): A dictionary mapping positions to slug entities.
+        player (Player): The player entity in the game.
+        player_position (Position): The starting position of the player.
+
+    Returns:
+        SlugDungeonModel: The game model.
+    """
+    model = SlugDungeonModel(ChunkedTiles(store), slugs, player, player_position,
+                             ChunkedOccupancy(store))
+    store.set_weapons(model._tile_weapons)
+    return model
+
+
+def load_chunked_level(filename: str, capacity: int = 256) -> SlugDungeonModel:
+    """
+    Loads a level file with rows of equal length onto chunked terrain. The file is
+    scanned once for the player and slugs; tiles are read as their chunks are used.
+
+    Args:
+        filename (str): The path to the level file.
+        capacity (int): The most chunks to keep loaded, besides those with the player
+            or a slug in them.
+
+    Returns:
+        SlugDungeonModel: The game model initialized from the file.
+    """
+    source = LevelFileSource(filename)
+    player_health, player_position, slugs = source.read_entities()
+    store = ChunkStore(source.read, source.get_dimensions(), capacity)
+    return new_chunked_model(store, slugs, Player(player_health), player_position)
+
+
+def new_procedural_model(reader: ChunkReader, player_position: Position,
+                         dimensions: tuple[int, int] = (1 << 20, 1 << 20),
+                         player_health: int = 20, capacity: int = 256) -> SlugDungeonModel:
+    """
+    Starts a game in a generated dungeon, by default over a million cells across,
+    so that it can be explored practically forever. Slugs placed by the generator
+    are ignored; the dungeon starts empty of them.
+
+    Args:
+        reader (ChunkReader): Generates the level symbols of the cells of a chunk,
+            such as a ScatteredDungeon.
+        player_position (Position): The starting position of the player.
+        dimensions (tuple[int, int]): The number of rows and columns of the dungeon.
+        player_health (int): The starting health of the player.
+        capacity (int): The most chunks to keep loaded, besides the player's.
+
+    Returns:
+        SlugDungeonModel: The game model.
+    """
+    store = ChunkStore(reader, dimensions, capacity)
+    return new_chunked_model(store, {}, Player(player_health), player_position)
@@ -0,0 +1,199 @@
+"""
+A compact binary level format and a memory-mapped loader for it.
+
+A compiled level is laid out as:
+
+- a header: magic, rows, columns, player health, player row and column
+  (-1 if there is no player) and the number of entity records;
+- the tile plane: one byte per cell, row by row, holding the WALL_CELL and
+  GOAL_CELL flags of the cell (0 for floor);
+- the entity table: one record per slug or weapon, giving its row, column
+  and level symbol.
+
+Loading maps the file into memory copy-on-write and builds the tile rows only
+when they are first used, so huge levels start without parsing any text. The
+mapped tile plane itself becomes the model's occupancy layer: only the pages
+the game writes flags to are copied, and the file is never changed.
+"""
+import mmap
+import os
+import re
+import struct
+import sys
+from typing import Iterator
+
+from a2 import *
+
+MAGIC = b"SLUGLVL\x01"
+HEADER = struct.Struct("<8sIIiiiI")  # magic, rows, cols, health, player row, player col, entities
+ENTITY = struct.Struct("<IIc")  # row, col, level symbol
+
+# Tile plane code of each tile symbol, and the tile each code stands for
+TILE_CODES = {WALL_TILE: WALL_CELL, GOAL_TILE: GOAL_CELL}
+CODE_TILES = {0: (FLOOR_TILE, False), WALL_CELL: (WALL_TILE, True), GOAL_CELL: (GOAL_TILE, False)}
+TILE_FLAGS = WALL_CELL | GOAL_CELL  # The occupancy flags that come from the tile plane
+
+
+def compile_level(filename: str, output: str) -> None:
+    """
+    Compiles a text level file into the binary format, streaming it row by row.
+    The level is validated as read_level does in strict mode.
+
+    Args:
+        filename (str): The path to the text level file.
+        output (str): The path to write the compiled level to. It is left as it was
+            if the level cannot be compiled.
+
+    Raises:
+        LevelError: If the text level is malformed.
+    """
+    translation = {}  # Level symbol -> tile plane byte, for str.translate
+    entity_symbols = ""
+    for symbol, (tile_symbol, _, weapon, slug_class) in LEVEL_SYMBOLS.items():
+        translation[ord(symbol)] = chr(TILE_CODES.get(tile_symbol, 0))
+        if weapon is not None or slug_class is not None:
+            entity_symbols += symbol
+    entity_pattern = re.compile(f"[{re.escape(entity_symbols)}]")
+    known_symbols = set(LEVEL_SYMBOLS)
+
+    entities = []
+    player_position = (-1, -1)
+    rows = cols = 0
+    # The level is written next to the output and only moved over it once complete
+    temporary = f"{output}.{os.getpid()}.tmp"
+    try:
+        with open(filename, 'r') as file, open(temporary, 'wb') as out:
+            player_health = read_player_health(file, filename, True)
+            out.write(bytes(HEADER.size))  # Filled in once the level has been read
+
+            for line_number, line in iter_level_rows(file, filename, True):
+                if not known_symbols.issuperset(line):
+                    col = next(col for col, char in enumerate(line) if char not in known_symbols)
+                    raise LevelError(filename, line_number, col + 1, f"unknown symbol {line[col]!r}")
+                col = line.find(PLAYER_SYMBOL)
+                if col >= 0:
+                    second = line.find(PLAYER_SYMBOL, col + 1)
+                    if player_position[0] >= 0 or second >= 0:
+                        duplicate = col if player_position[0] >= 0 else second
+                        raise LevelError(filename, line_number, duplicate + 1, "more than one player")
+                    player_position = (rows, col)
+                for match in entity_pattern.finditer(line):
+                    entities.append((rows, match.start(), match.group().encode("latin-1")))
+                out.write(line.translate(translation).encode("latin-1"))
+                rows += 1
+                cols = len(line)
+
+            if rows == 0:
+                raise LevelError(filename, 2, None, "the level has no rows")
+            if player_position[0] < 0:
+                raise LevelError(filename, rows + 1, None, "the level has no player")
+
+            for entity in entities:
+                out.write(ENTITY.pack(*entity))
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, rows, cols, player_health, *player_position, len(entities)))
+        os.replace(temporary, output)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class CompiledTiles:
+    """
+    A read-only grid of tiles backed by the tile plane of a compiled level.
+    Each row of Tile objects is built the first time it is used; the grid is
+    indexed like the list[list[Tile]] it stands in for. The plane may be the
+    model's occupancy layer, so only its wall and goal flags are read.
+    """
+
+    def __init__(self, plane: memoryview, dimensions: tuple[int, int],
+                 weapons: dict[int, list[tuple[int, Weapon]]]) -> None:
+        """
+        Initializes the grid over the given tile plane.
+
+        Args:
+            plane (memoryview): One tile code per cell, row by row, possibly with
+                other occupancy flags set.
+            dimensions (tuple[int, int]): The number of rows and columns.
+            weapons (dict[int, list[tuple[int, Weapon]]]): The columns and weapons of
+                the weapons lying in each row.
+        """
+        self._plane = plane
+        self._rows, self._cols = dimensions
+        self._weapons = weapons
+        self._tile_rows: list[Optional[list[Tile]]] = [None] * self._rows
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows.
+        """
+        return self._rows
+
+    def __getitem__(self, row: int) -> list[Tile]:
+        """
+        Returns the tiles of the given row, building them on first use.
+        """
+        if row < 0:
+            row += self._rows
+        tile_row = self._tile_rows[row]
+        if tile_row is None:
+            start = row * self._cols
+            tile_row = [Tile(*CODE_TILES[code & TILE_FLAGS])
+                        for code in self._plane[start:start + self._cols]]
+            for col, weapon in self._weapons.pop(row, ()):
+                tile_row[col].set_weapon(weapon)
+            self._tile_rows[row] = tile_row
+        return tile_row
+
+    def __iter__(self) -> Iterator[list[Tile]]:
+        """
+        Iterates over the rows of tiles.
+        """
+        for row in range(self._rows):
+            yield self[row]
+
+
+def load_compiled_level(filename: str) -> SlugDungeonModel:
+    """
+    Memory-maps a compiled level copy-on-write and builds the SlugDungeonModel from
+    it. The mapped tile plane is used as the model's occupancy layer without
+    copying it; tiles are only created as their rows are used.
+
+    Args:
+        filename (str): The path to the compiled level file.
+
+    Returns:
+        SlugDungeonModel: The game model initialized from the file.
+
+    Raises:
+        ValueError: If the file is not a compiled level.
+    """
+    with open(filename, 'rb') as file:
+        buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY))
+
+    magic, rows, cols, player_health, player_row, player_col, count = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{filename} is not a compiled Slug Dungeon level")
+    plane = buffer[HEADER.size:HEADER.size + rows * cols]  # Becomes the occupancy layer
+
+    slugs = {}
+    weapons: dict[int, list[tuple[int, Weapon]]] = {}
+    start = HEADER.size + rows * cols
+    for row, col, symbol in ENTITY.iter_unpack(buffer[start:start + count * ENTITY.size]):
+        _, _, weapon, slug_class = LEVEL_SYMBOLS[symbol.decode("latin-1")]
+        if weapon is not None:
+            weapons.setdefault(row, []).append((col, weapon))
+            plane[row * cols + col] |= WEAPON_CELL
+        else:
+            slugs[(row, col)] = slug_class()
+
+    player_position = (player_row, player_col) if player_row >= 0 else None
+    tiles = CompiledTiles(plane, (rows, cols), weapons)
+    return SlugDungeonModel(tiles, slugs, Player(player_health), player_position, plane)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python compiled_level.py LEVEL.txt OUTPUT")
+    compile_level(sys.argv[1], sys.argv[2])
@@ -0,0 +1,365 @@
+"""
+Optional profiling of Slug Dungeon turns and redraws.
+
+A Profiler times the phases of a turn (the model's end_turn, perform_attack and
+slug move queries) and of a redraw (DungeonMap.redraw and DungeonInfo.redraw)
+into latency histograms, and counts turns, slugs processed and canvas items
+created. It works by wrapping those methods while it is enabled and putting the
+originals back when it is disabled, so the game pays nothing for it otherwise.
+
+Metrics are exported to a pluggable sink: MemorySink, JsonLinesSink or
+PrometheusSink (the Prometheus text exposition format, for a textfile collector).
+"""
+import argparse
+import bisect
+import functools
+import json
+import os
+import time
+import tkinter as tk
+from typing import Callable, Optional, Protocol
+
+from a2 import *
+
+# Methods timed as each phase, along with their overrides in every subclass, such as
+# SlugInfoTable.redraw. Times are inclusive: end_turn contains the attacks and move
+# queries it makes, and an override calling its base method is timed once.
+PHASES = {
+    "end_turn": ((SlugDungeonModel, "end_turn"),),
+    "perform_attack": ((SlugDungeonModel, "perform_attack"),),
+    "get_valid_slug_positions": ((SlugDungeonModel, "get_valid_slug_positions"),
+                                 (SlugDungeonModel, "get_valid_slug_positions_at")),
+    "map_redraw": ((DungeonMap, "redraw"),),
+    "info_redraw": ((DungeonInfo, "redraw"),),
+}
+# Canvases whose item creation is counted, and the methods that create items
+CANVAS_CLASSES = (DungeonMap, DungeonInfo)
+CANVAS_CREATE_METHODS = ("create_rectangle", "create_oval", "create_text", "create_line",
+                         "create_polygon", "create_image")
+
+# Upper bounds of the latency histogram buckets, in seconds; a last bucket takes the rest
+BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+           0.1, 0.25, 0.5, 1.0)
+
+METRIC_PREFIX = "slug_dungeon"
+
+
+def _get_overriding_classes(base: type, name: str) -> list[type]:
+    """
+    Returns the base class and each of its subclasses that defines its own method
+    of the given name.
+    """
+    classes = [base]
+    pending = list(base.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if name in cls.__dict__:
+            classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+class MetricsSink(Protocol):
+    """
+    Receives each export of a profiler's metrics.
+    """
+
+    def write(self, metrics: dict[str, object]) -> None:
+        ...
+
+
+class Histogram:
+    """
+    Counts of observed latencies in the fixed BUCKETS, with their total.
+    """
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty histogram.
+        """
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Adds one latency to the histogram.
+
+        Args:
+            seconds (float): The latency to add.
+        """
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def to_dict(self) -> dict[str, object]:
+        """
+        Returns the histogram as plain data: the bucket bounds, the count in each
+        bucket (not cumulative), the number of latencies and their sum.
+        """
+        return {"buckets": list(BUCKETS), "counts": list(self.counts),
+                "count": self.count, "sum": self.sum}
+
+
+class MemorySink:
+    """
+    Keeps every export in a list, e.g. for tests or an in-game overlay.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the sink with no exports.
+        """
+        self.exports: list[dict[str, object]] = []
+
+    def write(self, metrics: dict[str, object]) -> None:
+        """
+        Stores one export of the metrics.
+        """
+        self.exports.append(metrics)
+
+
+class JsonLinesSink:
+    """
+    Appends every export to a file as one line of JSON.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Initializes the sink.
+
+        Args:
+            filename (str): The path of the file to append to.
+        """
+        self._filename = filename
+
+    def write(self, metrics: dict[str, object]) -> None:
+        """
+        Appends one export of the metrics, stamped with the time it was written.
+        """
+        with open(self._filename, 'a') as file:
+            file.write(json.dumps({"time": time.time(), **metrics}) + "\n")
+
+
+class PrometheusSink:
+    """
+    Rewrites a file in the Prometheus text exposition format on every export.
+    The file is replaced atomically, so a collector never reads half of it.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Initializes the sink.
+
+        Args:
+            filename (str): The path of the file to write.
+        """
+        self._filename = filename
+
+    def write(self, metrics: dict[str, object]) -> None:
+        """
+        Writes the latest metrics over the previous ones.
+        """
+        name = f"{METRIC_PREFIX}_phase_seconds"
+        lines = [f"# HELP {name} Latency of each turn and redraw phase.",
+                 f"# TYPE {name} histogram"]
+        for phase, histogram in metrics["phases"].items():
+            cumulative = 0
+            for bound, count in zip(histogram["buckets"] + ["+Inf"], histogram["counts"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {histogram["count"]}')
+
+        for counter, value in metrics["counters"].items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{counter}_total counter")
+            lines.append(f"{METRIC_PREFIX}_{counter}_total {value}")
+
+        name = f"{METRIC_PREFIX}_canvas_items_created_total"
+        lines.append(f"# TYPE {name} counter")
+        for view, value in metrics["canvas_items_created"].items():
+            lines.append(f'{name}{{view="{view}"}} {value}')
+
+        temporary = self._filename + ".tmp"
+        with open(temporary, 'w') as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temporary, self._filename)
+
+
+class Profiler:
+    """
+    Collects phase latencies and counters while enabled. Only one profiler can be
+    enabled at a time, since it wraps the methods of the game classes.
+    """
+    _active: Optional['Profiler'] = None
+
+    def __init__(self, sink: Optional[MetricsSink] = None,
+                 export_interval: Optional[int] = None) -> None:
+        """
+        Initializes a disabled profiler with no metrics.
+
+        Args:
+            sink (Optional[MetricsSink]): Where export() sends the metrics, such as a
+                MemorySink, JsonLinesSink or PrometheusSink.
+            export_interval (Optional[int]): Turns between automatic exports, or None
+                to export only when export() is called.
+        """
+        self._sink = sink
+        self._export_interval = export_interval
+        self._patched: list[tuple[type, str, Optional[Callable]]] = []  # Class, name, own method
+        self._histograms = {phase: Histogram() for phase in PHASES}
+        self._counters = {"turns": 0, "slugs_processed": 0}
+        self._canvas_items = {cls.__name__: 0 for cls in CANVAS_CLASSES}
+
+    def reset(self) -> None:
+        """
+        Clears the collected metrics. The wrappers keep recording into the same
+        objects, so this also works while the profiler is enabled.
+        """
+        for histogram in self._histograms.values():
+            histogram.__init__()
+        for metrics in (self._counters, self._canvas_items):
+            for name in metrics:
+                metrics[name] = 0
+
+    def enable(self) -> None:
+        """
+        Starts profiling by wrapping the timed and counted methods.
+
+        Raises:
+            RuntimeError: If another profiler is enabled.
+        """
+        if Profiler._active is self:
+            return
+        if Profiler._active is not None:
+            raise RuntimeError("Another profiler is already enabled")
+        Profiler._active = self
+
+        for phase, methods in PHASES.items():
+            nesting = [0]  # Calls of the phase in progress, shared by all its wrappers
+            for base, name in methods:
+                for cls in _get_overriding_classes(base, name):
+                    self._patch(cls, name, self._timed(phase, getattr(cls, name),
+                                                       name == "end_turn", nesting))
+        for cls in CANVAS_CLASSES:
+            for name in CANVAS_CREATE_METHODS:
+                if hasattr(cls, name):
+                    self._patch(cls, name, self._counted(cls.__name__, getattr(cls, name)))
+
+    def disable(self) -> None:
+        """
+        Stops profiling and puts the original methods back. The metrics are kept.
+        """
+        for cls, name, own in reversed(self._patched):
+            if own is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, own)
+        self._patched.clear()
+        if Profiler._active is self:
+            Profiler._active = None
+
+    def __enter__(self) -> 'Profiler':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def _patch(self, cls: type, name: str, method: Callable) -> None:
+        """
+        Replaces a method of a class, remembering how to put it back.
+        """
+        self._patched.append((cls, name, cls.__dict__.get(name)))
+        setattr(cls, name, method)
+
+    def _timed(self, phase: str, method: Callable, is_turn: bool,
+               nesting: list[int]) -> Callable:
+        """
+        Wraps a method to add its latency to the phase's histogram, unless it was
+        called from within another method of the same phase. The end_turn wrapper
+        also counts turns and slugs, and exports when an export is due.
+        """
+        observe = self._histograms[phase].observe
+        counters = self._counters
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if nesting[0]:
+                return method(*args, **kwargs)
+            if is_turn:
+                counters["turns"] += 1
+                counters["slugs_processed"] += args[0].get_slug_count()
+            nesting[0] += 1
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+                nesting[0] -= 1
+                if (is_turn and self._export_interval
+                        and counters["turns"] % self._export_interval == 0):
+                    self.export()
+        return timed
+
+    def _counted(self, view: str, method: Callable) -> Callable:
+        """
+        Wraps a canvas item creation method to count the items created by the view.
+        """
+        canvas_items = self._canvas_items
+
+        @functools.wraps(method)
+        def counted(*args, **kwargs):
+            canvas_items[view] += 1
+            return method(*args, **kwargs)
+        return counted
+
+    def get_metrics(self) -> dict[str, object]:
+        """
+        Returns the metrics collected so far as plain data.
+
+        Returns:
+            dict[str, object]: The histogram of each phase, the counters, and the
+            canvas items created by each view.
+        """
+        return {
+            "phases": {phase: histogram.to_dict() for phase, histogram in self._histograms.items()},
+            "counters": dict(self._counters),
+            "canvas_items_created": dict(self._canvas_items),
+        }
+
+    def export(self) -> None:
+        """
+        Sends the metrics collected so far to the sink, if there is one.
+        """
+        if self._sink is not None:
+            self._sink.write(self.get_metrics())
+
+
+def main() -> None:
+    """
+    Plays a level with profiling enabled, exporting the metrics as the game runs
+    and when the window is closed.
+    """
+    parser = argparse.ArgumentParser(description="Play Slug Dungeon with profiling.")
+    parser.add_argument("level", help="path to the level file")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--jsonl", metavar="FILE", help="append metrics to FILE as JSON lines")
+    output.add_argument("--prometheus", metavar="FILE",
+                        help="write metrics to FILE in the Prometheus text format")
+    parser.add_argument("--interval", type=int, default=100,
+                        help="turns between exports (default 100)")
+    args = parser.parse_args()
+
+    sink = JsonLinesSink(args.jsonl) if args.jsonl else PrometheusSink(args.prometheus)
+    with Profiler(sink, args.interval) as profiler:
+        try:
+            play_game(tk.Tk(), args.level)
+        finally:
+            profiler.export()
+
+
+if __name__ == "__main__":
+    main()
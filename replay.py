@@ -0,0 +1,378 @@
+"""
+Deterministic replay logs of Slug Dungeon games.
+
+A replay log records every call to SlugDungeonModel.handle_player_move. It is
+written append-only and laid out as:
+
+- a header: magic, the SHA-256 hash of the level file played and the model's
+  settings, i.e. whether the flow field AI is on and the active radius;
+- one byte per move, the index of its delta in MOVES;
+- now and then a checkpoint: the CHECKPOINT byte, the turn it was taken after,
+  the length of its payload and the payload, the model state encoded as JSON.
+
+A Replayer loads a log and fast-forwards a model to any turn, starting from the
+nearest checkpoint at or before it rather than from the first move.
+"""
+import bisect
+import hashlib
+import json
+import struct
+import sys
+from typing import Optional
+
+from a2 import *
+
+MAGIC = b"SLUGRPL\x02"
+OLD_MAGIC = b"SLUGRPL\x01"  # Logs without settings, recorded on default models
+SETTINGS = struct.Struct("<?i")  # flow field AI, active radius or NO_RADIUS
+NO_RADIUS = -1
+MOVES = list(POSITION_DELTAS) + [(0, 0)]
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+CHECKPOINT = 0xFF  # Marks a checkpoint record; move codes are below it
+CHECKPOINT_HEADER = struct.Struct("<II")  # turn, payload length
+
+# Symbols used to encode slugs and weapons in checkpoints, and the reverse
+SLUG_CLASSES = {symbol: slug_class for symbol, (_, _, _, slug_class) in LEVEL_SYMBOLS.items()
+                if slug_class is not None}
+SLUG_SYMBOLS = {slug_class: symbol for symbol, slug_class in SLUG_CLASSES.items()}
+WEAPON_SYMBOLS = {type(weapon): symbol for symbol, weapon in TILE_WEAPONS.items()}
+
+
+def level_hash(filename: str) -> bytes:
+    """
+    Returns the SHA-256 hash of a level file, which ties a log to its level.
+
+    Args:
+        filename (str): The path to the level file.
+
+    Returns:
+        bytes: The 32 byte digest.
+    """
+    with open(filename, 'rb') as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def encode_checkpoint(model: SlugDungeonModel) -> bytes:
+    """
+    Encodes the mutable state of the model, as captured by snapshot(), as JSON.
+
+    Args:
+        model (SlugDungeonModel): The model to encode.
+
+    Returns:
+        bytes: The encoded state.
+    """
+    snapshot = model.snapshot()
+    health, poison, weapon = snapshot.player_state
+    state = {
+        "player": [health, poison, _weapon_symbol(weapon)],
+        "position": snapshot.player_position,
+        "past_position": snapshot.player_past_position,
+        "slugs": [[*position, SLUG_SYMBOLS[type(slug)], slug_health, slug_poison, can_move]
+                  for position, slug, slug_health, slug_poison, can_move in snapshot.slugs],
+        "weapons": [[*position, _weapon_symbol(weapon)]
+                    for position, weapon in snapshot.tile_weapons.items()],
+    }
+    return json.dumps(state, separators=(",", ":")).encode()
+
+
+def decode_checkpoint(model: SlugDungeonModel, payload: bytes) -> None:
+    """
+    Puts a freshly loaded model of the log's level into an encoded state.
+
+    Args:
+        model (SlugDungeonModel): A model of the level, at its starting state.
+        payload (bytes): The state encoded by encode_checkpoint.
+    """
+    state = json.loads(payload)
+    health, poison, weapon = state["player"]
+    slugs = []
+    for row, col, symbol, slug_health, slug_poison, can_move in state["slugs"]:
+        slugs.append(((row, col), SLUG_CLASSES[symbol](), slug_health, slug_poison, can_move))
+
+    model.restore(ModelSnapshot(
+        (health, poison, TILE_WEAPONS.get(weapon)),
+        tuple(state["position"]),
+        tuple(state["past_position"]),
+        tuple(slugs),
+        {(row, col): TILE_WEAPONS.get(symbol) for row, col, symbol in state["weapons"]},
+    ))
+
+
+def _weapon_symbol(weapon: Optional[Weapon]) -> Optional[str]:
+    """
+    Returns the level symbol of the weapon's kind, or None if there is no weapon.
+    """
+    return None if weapon is None else WEAPON_SYMBOLS[type(weapon)]
+
+
+class ReplayRecorder:
+    """
+    Writes a replay log of a model's moves as they are made.
+    """
+
+    def __init__(self, model: SlugDungeonModel, level_filename: str, log_filename: str,
+                 checkpoint_interval: Optional[int] = 1000) -> None:
+        """
+        Starts a new log and attaches to the model, which must be at the start of
+        the level. The model's settings are written to the log, so they must not
+        change while it is recorded.
+
+        Args:
+            model (SlugDungeonModel): The model whose moves to record.
+            level_filename (str): The path to the level file the model was loaded from.
+            log_filename (str): The path to write the log to.
+            checkpoint_interval (Optional[int]): Moves between checkpoints, or None for
+                no checkpoints.
+        """
+        self._model = model
+        self._checkpoint_interval = checkpoint_interval
+        self._turn = 0
+        self._file = open(log_filename, 'wb')
+        radius = model.get_active_radius()
+        self._file.write(MAGIC + level_hash(level_filename) + SETTINGS.pack(
+            model.get_flow_field_ai(), NO_RADIUS if radius is None else radius))
+        model.set_move_recorder(self.record)
+
+    def record(self, position_delta: Position) -> None:
+        """
+        Appends a move to the log, followed by a checkpoint when one is due.
+
+        Args:
+            position_delta (Position): The delta passed to handle_player_move.
+
+        Raises:
+            ValueError: If the delta is not one of MOVES.
+        """
+        code = MOVE_CODES.get(tuple(position_delta))
+        if code is None:
+            raise ValueError(f"Cannot record the move {position_delta!r}")
+        self._file.write(bytes((code,)))
+        self._turn += 1
+        if self._checkpoint_interval and self._turn % self._checkpoint_interval == 0:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """
+        Appends a checkpoint of the model's current state to the log.
+        """
+        payload = encode_checkpoint(self._model)
+        self._file.write(bytes((CHECKPOINT,)))
+        self._file.write(CHECKPOINT_HEADER.pack(self._turn, len(payload)) + payload)
+        self._file.flush()  # A crash loses at most the moves since the last checkpoint
+
+    def close(self) -> None:
+        """
+        Detaches from the model and closes the log.
+        """
+        self._model.set_move_recorder(None)
+        self._file.close()
+
+    def __enter__(self) -> 'ReplayRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ReplayLog:
+    """
+    The moves and checkpoints read from a replay log.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Reads a replay log. Checkpoint payloads are only decoded when used. A log
+        that ends in the middle of a checkpoint, as one left by a crash while
+        recording does, is read up to its last complete record.
+
+        Args:
+            filename (str): The path to the log.
+
+        Raises:
+            ValueError: If the file is not a replay log or is damaged.
+        """
+        with open(filename, 'rb') as file:
+            data = file.read()
+        magic = data[:len(MAGIC)]
+        header_size = len(MAGIC) + 32 + (SETTINGS.size if magic == MAGIC else 0)
+        if magic not in (MAGIC, OLD_MAGIC) or len(data) < header_size:
+            raise ValueError(f"{filename} is not a Slug Dungeon replay log")
+        self._level_hash = data[len(MAGIC):len(MAGIC) + 32]
+        self._flow_field_ai = False
+        self._active_radius = None
+        if magic == MAGIC:
+            self._flow_field_ai, radius = SETTINGS.unpack_from(data, len(MAGIC) + 32)
+            self._active_radius = None if radius == NO_RADIUS else radius
+        self._moves = bytearray()
+        self._checkpoints: dict[int, bytes] = {}  # Turn -> payload
+
+        offset = header_size
+        while offset < len(data):
+            end = data.find(CHECKPOINT, offset)
+            if end < 0:
+                end = len(data)
+            self._moves += data[offset:end]
+            offset = end
+            if offset < len(data):
+                header_end = offset + 1 + CHECKPOINT_HEADER.size
+                if header_end > len(data):
+                    break  # Cut short in the checkpoint header
+                turn, length = CHECKPOINT_HEADER.unpack_from(data, offset + 1)
+                if turn != len(self._moves):
+                    raise ValueError(f"{filename} has a damaged checkpoint")
+                if header_end + length > len(data):
+                    break  # Cut short in the checkpoint payload
+                self._checkpoints[turn] = data[header_end:header_end + length]
+                offset = header_end + length
+        if max(self._moves, default=0) >= len(MOVES):
+            raise ValueError(f"{filename} contains an unknown move")
+        self._checkpoint_turns = sorted(self._checkpoints)
+
+    def get_level_hash(self) -> bytes:
+        """
+        Returns the SHA-256 hash of the level file the log was recorded on.
+        """
+        return self._level_hash
+
+    def get_settings(self) -> tuple[bool, Optional[int]]:
+        """
+        Returns whether the flow field AI was on and the active radius of the model
+        the log was recorded on.
+        """
+        return self._flow_field_ai, self._active_radius
+
+    def __len__(self) -> int:
+        """
+        Returns the number of moves in the log.
+        """
+        return len(self._moves)
+
+    def get_moves(self, start: int, stop: int) -> list[Position]:
+        """
+        Returns the deltas of the moves made from turn start up to turn stop.
+        """
+        return [MOVES[code] for code in self._moves[start:stop]]
+
+    def get_checkpoint(self, turn: int) -> tuple[int, Optional[bytes]]:
+        """
+        Finds the latest checkpoint taken at or before the given turn.
+
+        Args:
+            turn (int): The number of moves to replay.
+
+        Returns:
+            tuple[int, Optional[bytes]]: The turn of the checkpoint and its payload,
+            or (0, None) if there is none, meaning the start of the level.
+        """
+        index = bisect.bisect_right(self._checkpoint_turns, turn) - 1
+        if index < 0:
+            return 0, None
+        checkpoint_turn = self._checkpoint_turns[index]
+        return checkpoint_turn, self._checkpoints[checkpoint_turn]
+
+
+class Replayer:
+    """
+    Replays a log headlessly, seeking to any turn.
+    """
+
+    def __init__(self, log_filename: str, level_filename: str) -> None:
+        """
+        Reads the log and checks that it was recorded on the given level. The
+        level is replayed with the settings the log was recorded with.
+
+        Args:
+            log_filename (str): The path to the replay log.
+            level_filename (str): The path to the level file.
+
+        Raises:
+            ValueError: If the log is damaged or was recorded on a different level.
+        """
+        self._log = ReplayLog(log_filename)
+        if self._log.get_level_hash() != level_hash(level_filename):
+            raise ValueError(f"{log_filename} was not recorded on {level_filename}")
+        self._level_filename = level_filename
+        self._model = self._load_model()
+        self._turn = 0
+
+    def _load_model(self) -> SlugDungeonModel:
+        """
+        Returns a model of the level at its start, with the settings it was recorded with.
+        """
+        model = LEVEL_CACHE.load_level(self._level_filename)
+        flow_field_ai, active_radius = self._log.get_settings()
+        model.set_flow_field_ai(flow_field_ai)
+        model.set_active_radius(active_radius)
+        return model
+
+    def get_log(self) -> ReplayLog:
+        """
+        Returns the log being replayed.
+        """
+        return self._log
+
+    def get_model(self) -> SlugDungeonModel:
+        """
+        Returns the model in the state after the current turn.
+        """
+        return self._model
+
+    def get_turn(self) -> int:
+        """
+        Returns the number of moves replayed so far.
+        """
+        return self._turn
+
+    def seek(self, turn: int) -> SlugDungeonModel:
+        """
+        Brings the model to its state after the given number of moves. It starts
+        from the nearest checkpoint at or before the turn, unless the model is
+        already between that checkpoint and the turn.
+
+        Args:
+            turn (int): The number of moves to replay, from 0 to len(log).
+
+        Returns:
+            SlugDungeonModel: The model after the turn.
+
+        Raises:
+            IndexError: If the turn is outside the log.
+        """
+        if not 0 <= turn <= len(self._log):
+            raise IndexError(f"turn {turn} is outside the log of {len(self._log)} moves")
+        checkpoint_turn, payload = self._log.get_checkpoint(turn)
+        if not checkpoint_turn <= self._turn <= turn:
+            self._model = self._load_model()
+            if payload is not None:
+                decode_checkpoint(self._model, payload)
+            self._turn = checkpoint_turn
+
+        model = self._model
+        for move in self._log.get_moves(self._turn, turn):
+            model.handle_player_move(move)
+        self._turn = turn
+        return model
+
+
+def main() -> None:
+    """
+    Replays a log to the turn given on the command line and prints the game state.
+    """
+    if len(sys.argv) not in (3, 4):
+        sys.exit("usage: python replay.py LOG LEVEL.txt [TURN]")
+    replayer = Replayer(sys.argv[1], sys.argv[2])
+    turn = int(sys.argv[3]) if len(sys.argv) == 4 else len(replayer.get_log())
+    model = replayer.seek(turn)
+    player = model.get_player()
+    print(f"turn {turn} of {len(replayer.get_log())}")
+    print(f"player at {model.get_player_position()}: {player.get_health()} health, "
+          f"{player.get_poison()} poison, {player.get_weapon()}")
+    for position, slug in model.get_slugs().items():
+        print(f"{position}: {slug!r}")
+    if model.has_won() or model.has_lost():
+        print("won" if model.has_won() else "lost")
+
+
+if __name__ == "__main__":
+    main()
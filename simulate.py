@@ -0,0 +1,213 @@
+"""
+Headless batch simulation of Slug Dungeon levels.
+
+Games are driven straight through SlugDungeonModel without creating a Tk window,
+so levels can be played against scripted or random move sequences on a machine
+with no display. Many games are spread across a process pool and summarised.
+
+The model lives in a2 next to the views, and a2 and the course's support module
+import tkinter. Every worker process therefore still imports tkinter, which must
+be installed, although no display is needed as no window is ever opened.
+"""
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from a2 import *
+
+# Keys accepted in move scripts, matching SlugDungeon.handle_key_press
+MOVE_KEYS = {
+    'a': POSITION_DELTAS[1],  # Move left
+    'd': POSITION_DELTAS[0],  # Move right
+    'w': POSITION_DELTAS[3],  # Move up
+    's': POSITION_DELTAS[2],  # Move down
+    ' ': (0, 0),  # Stay in place
+    '.': (0, 0),  # Stay in place (for scripts stored one per line)
+}
+STAY = (0, 0)
+
+# A policy picks the next move from the model and the number of moves made so far
+Policy = Callable[[SlugDungeonModel, int], Optional[Position]]
+
+
+class GameResult(NamedTuple):
+    """
+    The outcome of one headless game.
+    """
+    outcome: str  # WON, LOST or UNFINISHED
+    moves: int  # Number of moves the policy made
+    player_health: int  # Player health when the game stopped
+    slugs_left: int  # Number of slugs still alive when the game stopped
+
+
+class ScriptPolicy:
+    """
+    Plays a fixed sequence of moves, then stops.
+    """
+
+    def __init__(self, script: str) -> None:
+        """
+        Initializes the policy from a string of move keys.
+
+        Args:
+            script (str): Move keys from MOVE_KEYS, e.g. "ddssw.".
+
+        Raises:
+            ValueError: If the script contains an unknown key.
+        """
+        try:
+            self._moves = [MOVE_KEYS[key] for key in script.lower()]
+        except KeyError as error:
+            raise ValueError(f"Unknown move key {error.args[0]!r} in script") from None
+
+    def __call__(self, model: SlugDungeonModel, turn: int) -> Optional[Position]:
+        """
+        Returns the move for the given turn, or None once the script runs out.
+        """
+        return self._moves[turn] if turn < len(self._moves) else None
+
+    def get_moves(self) -> list[Position]:
+        """
+        Returns the whole script as position deltas.
+        """
+        return self._moves
+
+
+class RandomPolicy:
+    """
+    Plays uniformly random moves (including staying put) from a seeded generator.
+    """
+
+    def __init__(self, seed: int) -> None:
+        """
+        Initializes the policy with the seed for its random generator.
+
+        Args:
+            seed (int): The random seed, so that games can be reproduced.
+        """
+        self._random = random.Random(seed)
+        self._moves = list(POSITION_DELTAS) + [STAY]
+
+    def __call__(self, model: SlugDungeonModel, turn: int) -> Optional[Position]:
+        """
+        Returns a random move.
+        """
+        return self._random.choice(self._moves)
+
+
+def run_game(filename: str, policy: Policy, max_moves: int = 1000) -> GameResult:
+    """
+    Plays one game of the given level until it is won, lost, the policy stops,
+    or max_moves moves have been made.
+
+    Args:
+        filename (str): The path to the level file.
+        policy (Policy): Chooses each move; returning None stops the game.
+        max_moves (int): The most moves to make before giving up.
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    model = load_level(filename)
+    if isinstance(policy, ScriptPolicy):
+        # The moves are known up front, so play them in one batch
+        result = model.handle_player_moves(policy.get_moves()[:max_moves])
+        return GameResult(result.outcome, result.moves, result.player_health, result.slugs_left)
+
+    moves = 0
+    outcome = UNFINISHED
+    while moves < max_moves:
+        move = policy(model, moves)
+        if move is None:
+            break
+        model.handle_player_move(move)
+        moves += 1
+        if model.has_won():
+            outcome = WON
+            break
+        if model.has_lost():
+            outcome = LOST
+            break
+
+    return GameResult(outcome, moves, model.get_player().get_health(), len(model.get_slugs()))
+
+
+def _run_game_job(job: tuple[str, Policy, int]) -> GameResult:
+    """
+    Unpacks a job for the process pool and plays it.
+    """
+    return run_game(*job)
+
+
+def run_games(filename: str, policies: Sequence[Policy], max_moves: int = 1000,
+              workers: Optional[int] = None) -> list[GameResult]:
+    """
+    Plays one game of the level per policy, spread across a pool of worker processes.
+    Policies must be picklable, such as ScriptPolicy and RandomPolicy.
+
+    Args:
+        filename (str): The path to the level file.
+        policies (Sequence[Policy]): One policy per game.
+        max_moves (int): The most moves to make in each game.
+        workers (Optional[int]): Number of worker processes; defaults to every core.
+
+    Returns:
+        list[GameResult]: The result of each game, in the order of the policies.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [(filename, policy, max_moves) for policy in policies]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_run_game_job, jobs, chunksize=chunksize))
+
+
+def summarise(results: Sequence[GameResult]) -> dict[str, object]:
+    """
+    Aggregates game results into counts and averages.
+
+    Args:
+        results (Sequence[GameResult]): The games to summarise.
+
+    Returns:
+        dict[str, object]: Game, win, loss and unfinished counts, and the mean
+        number of moves of won games.
+    """
+    won = [result for result in results if result.outcome == WON]
+    return {
+        "games": len(results),
+        WON: len(won),
+        LOST: sum(result.outcome == LOST for result in results),
+        UNFINISHED: sum(result.outcome == UNFINISHED for result in results),
+        "mean_moves_to_win": sum(result.moves for result in won) / len(won) if won else None,
+    }
+
+
+def main() -> None:
+    """
+    Runs a batch of headless games from the command line and prints a JSON summary.
+    """
+    parser = argparse.ArgumentParser(description="Play Slug Dungeon levels headlessly.")
+    parser.add_argument("level", help="path to the level file")
+    parser.add_argument("--random", type=int, default=0, metavar="N",
+                        help="number of random games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first random game")
+    parser.add_argument("--scripts", metavar="FILE",
+                        help="file of move scripts, one per line, using the keys wasd and '.'")
+    parser.add_argument("--max-moves", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    policies: list[Policy] = [RandomPolicy(args.seed + i) for i in range(args.random)]
+    if args.scripts:
+        with open(args.scripts, 'r') as file:
+            policies.extend(ScriptPolicy(line.rstrip("\n")) for line in file if line.strip())
+
+    results = run_games(args.level, policies, args.max_moves, args.workers)
+    print(json.dumps(summarise(results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Finds the shortest winning move sequence for a Slug Dungeon level.
+
+The solver runs an A* search over game states. It moves one model between
+states with snapshot() and restore(), and keeps a transposition table of every
+state it has seen so that duplicate states are pruned.
+"""
+import heapq
+import sys
+from collections import deque
+from typing import NamedTuple, Optional
+
+from a2 import *
+from simulate import MOVE_KEYS
+
+MOVES = list(POSITION_DELTAS) + [(0, 0)]
+MOVE_NAMES = {move: key for key, move in MOVE_KEYS.items()}  # '.' (the last) for staying put
+
+
+class SolveResult(NamedTuple):
+    """
+    The outcome of a search.
+    """
+    moves: Optional[list[Position]]  # Shortest winning moves, or None if none was found
+    states: int  # Number of distinct states stored in the transposition table
+    complete: bool  # False if the search stopped at its state or move limit
+
+
+def state_key(snapshot: ModelSnapshot) -> tuple:
+    """
+    Returns a hashable key that is equal for game states that play out identically.
+    It covers the player's position, health, poison and weapon, each slug's kind,
+    position, health, poison and move parity in dict order, and the weapons lying
+    on the cells the game has changed. Weapons are told apart by get_weapon_kind,
+    i.e. by class and range.
+
+    Args:
+        snapshot (ModelSnapshot): The state to describe.
+
+    Returns:
+        tuple: The key of the state.
+    """
+    health, poison, weapon = snapshot.player_state
+    return (
+        snapshot.player_position, health, poison, get_weapon_kind(weapon),
+        tuple((position, type(slug), slug_health, slug_poison, can_move)
+              for position, slug, slug_health, slug_poison, can_move in snapshot.slugs),
+        frozenset((position, get_weapon_kind(weapon))
+                  for position, weapon in snapshot.tile_weapons.items()),
+    )
+
+
+def goal_distances(model: SlugDungeonModel) -> list[Optional[int]]:
+    """
+    Returns the fewest moves from each cell to a goal tile, walking around walls
+    but ignoring slugs, found by a breadth-first search out from every goal.
+
+    Args:
+        model (SlugDungeonModel): The level to measure.
+
+    Returns:
+        list[Optional[int]]: The distance of each cell, row by row, or None where
+        no goal can be reached.
+    """
+    rows, cols = model.get_dimensions()
+    distances: list[Optional[int]] = [None] * (rows * cols)
+    queue = deque()
+    for row in range(rows):
+        for col in range(cols):
+            if model.get_occupancy((row, col)) & GOAL_CELL:
+                distances[row * cols + col] = 0
+                queue.append((row, col))
+
+    while queue:
+        row, col = queue.popleft()
+        distance = distances[row * cols + col] + 1
+        for d_row, d_col in POSITION_DELTAS:
+            neighbour = (row + d_row, col + d_col)
+            index = neighbour[0] * cols + neighbour[1]
+            if (not model.get_occupancy(neighbour) & WALL_CELL
+                    and distances[index] is None):
+                distances[index] = distance
+                queue.append(neighbour)
+    return distances
+
+
+def solve(model: SlugDungeonModel, max_states: int = 1_000_000,
+          max_moves: Optional[int] = None) -> SolveResult:
+    """
+    Searches for the shortest sequence of moves that wins the game from the model's
+    current state. The model is left in its starting state.
+
+    The heuristic is the walking distance to the nearest goal ignoring slugs, and at
+    least one move while slugs remain. Both are lower bounds on the moves still
+    needed, so the first win found is a shortest one.
+
+    Args:
+        model (SlugDungeonModel): The game to solve.
+        max_states (int): The most states to keep in the transposition table.
+        max_moves (Optional[int]): The longest move sequence to consider.
+
+    Returns:
+        SolveResult: The winning moves, if any, and how the search went.
+    """
+    cols = model.get_dimensions()[1]
+    distances = goal_distances(model)
+
+    def heuristic(snapshot: ModelSnapshot) -> Optional[int]:
+        row, col = snapshot.player_position
+        distance = distances[row * cols + col]
+        if distance is None:
+            return None
+        return max(distance, 1 if snapshot.slugs else 0)
+
+    start = model.snapshot()
+    best_moves = {state_key(start): 0}  # Transposition table: state -> fewest moves to reach it
+    counter = 0  # Breaks ties between equal estimates in insertion order
+    frontier = [(heuristic(start) or 0, counter, 0, start, None)]
+    complete = True
+
+    try:
+        while frontier:
+            _, _, moves_made, snapshot, path = heapq.heappop(frontier)
+            model.restore(snapshot)
+            if model.has_won():
+                return SolveResult(_unwind(path), len(best_moves), True)
+            if max_moves is not None and moves_made >= max_moves:
+                complete = False
+                continue
+
+            for move in MOVES:
+                model.restore(snapshot)
+                model.handle_player_move(move)
+                if model.has_lost() and not model.has_won():
+                    continue
+                child = model.snapshot()
+                estimate = heuristic(child)
+                if estimate is None:
+                    continue
+                key = state_key(child)
+                known = best_moves.get(key)
+                if known is not None and known <= moves_made + 1:
+                    continue
+                if known is None and len(best_moves) >= max_states:
+                    complete = False
+                    continue
+                best_moves[key] = moves_made + 1
+                counter += 1
+                heapq.heappush(frontier, (moves_made + 1 + estimate, counter, moves_made + 1,
+                                          child, (move, path)))
+    finally:
+        model.restore(start)
+
+    return SolveResult(None, len(best_moves), complete)
+
+
+def _unwind(path: Optional[tuple]) -> list[Position]:
+    """
+    Turns a linked (move, parent) path into the list of moves from the start.
+    """
+    moves = []
+    while path is not None:
+        move, path = path
+        moves.append(move)
+    moves.reverse()
+    return moves
+
+
+def main() -> None:
+    """
+    Solves the level given on the command line and prints the winning moves as a
+    script of wasd keys ('.' for staying put).
+    """
+    if len(sys.argv) != 2:
+        sys.exit("usage: python solver.py LEVEL.txt")
+    result = solve(load_level(sys.argv[1]))
+    if result.moves is not None:
+        print("".join(MOVE_NAMES[move] for move in result.moves))
+    elif result.complete:
+        sys.exit(f"unwinnable ({result.states} states searched)")
+    else:
+        sys.exit(f"gave up after {result.states} states")
+
+
+if __name__ == "__main__":
+    main()
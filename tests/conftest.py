@@ -0,0 +1,55 @@
+"""
+Shared fixtures for the Slug Dungeon tests. The game modules live in the
+repository root, next to the course's support.py.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import LevelConfig, generate_level  # noqa: E402
+from a2 import POSITION_DELTAS  # noqa: E402
+
+MOVES = list(POSITION_DELTAS) + [(0, 0)]
+
+
+@pytest.fixture
+def make_level(tmp_path):
+    """
+    Returns a function that writes a generated level and returns its path.
+    """
+    def make(rows: int = 12, cols: int = 12, **config) -> str:
+        filename = str(tmp_path / f"level_{rows}x{cols}_{len(os.listdir(tmp_path))}.txt")
+        generate_level(filename, rows, cols, LevelConfig(**config))
+        return filename
+    return make
+
+
+def game_state(model) -> tuple:
+    """
+    Returns the player, slugs, moved weapons and outcome of a game, for comparing games.
+    """
+    snapshot = model.snapshot()
+    health, poison, weapon = snapshot.player_state
+    return (health, poison, type(weapon), snapshot.player_position,
+            [(position, type(slug), *state) for position, slug, *state in snapshot.slugs],
+            sorted((position, type(weapon)) for position, weapon in snapshot.tile_weapons.items()),
+            model.has_won(), model.has_lost())
+
+
+def tile_symbols(model) -> list:
+    """
+    Returns the symbol and weapon kind of every tile of a game.
+    """
+    return [[(tile.get_symbol(), type(tile.get_weapon())) for tile in row] for row in model.get_tiles()]
+
+
+def random_moves(seed: int, count: int) -> list:
+    """
+    Returns a reproducible list of random player moves.
+    """
+    rng = random.Random(seed)
+    return [rng.choice(MOVES) for _ in range(count)]
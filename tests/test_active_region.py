@@ -0,0 +1,73 @@
+"""
+Tests of active region simulation.
+"""
+import random
+
+import pytest
+
+from a2 import *
+from conftest import game_state, random_moves
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_unbounded_radius_plays_like_default(make_level, seed):
+    level = make_level(25, 25, slug_density=0.15, player_health=300, seed=seed)
+    expected = read_level(level)
+    model = read_level(level)
+    model.set_active_radius(10 ** 6)
+    for move in random_moves(seed, 100):
+        expected.handle_player_move(move)
+        model.handle_player_move(move)
+        assert game_state(model) == game_state(expected)
+
+
+def test_slugs_outside_radius_stay_put(make_level):
+    model = read_level(make_level(40, 40, slug_density=0.1, player_health=10 ** 6, seed=3))
+    model.set_active_radius(5)
+    for move in random_moves(6, 60):
+        row, col = model.get_player_position()
+        before = {slug: position for position, slug in model.get_slugs().items()
+                  if max(abs(position[0] - row), abs(position[1] - col)) > 6}
+        model.handle_player_move(move)
+        after = {slug: position for position, slug in model.get_slugs().items()}
+        assert all(after[slug] == position for slug, position in before.items() if slug in after)
+
+
+@pytest.mark.parametrize("seed, slug_mix", [(0, (1.0, 0.0, 0.0)), (1, (1.0, 0.0, 0.0)),
+                                            (2, (1.0, 0.0, 0.0)), (3, (1.0, 1.0, 1.0))])
+def test_dormant_slugs_catch_up(make_level, tmp_path, seed, slug_mix):
+    # Every slug is walled in, so dormant slugs end up where they would have moved to
+    # and only their poison, health and turn of death can go wrong
+    level = make_level(30, 30, wall_density=0.0, slug_density=0.0, weapon_density=0.0,
+                       player_health=10 ** 6, seed=seed)
+    with open(level) as file:
+        health, *rows = file.read().split("\n")
+    rows = [list(row) for row in rows if row]
+    symbols = [symbol for symbol, weight in zip("NAL", slug_mix) if weight]
+    for index, (row, col) in enumerate((row, col) for row in range(4, 27, 4)
+                                       for col in range(4, 27, 4)):
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            rows[r][c] = WALL_TILE
+        rows[row][col] = symbols[index % len(symbols)]
+    level = str(tmp_path / "walled.txt")
+    with open(level, 'w') as file:
+        file.write(health + "\n" + "\n".join("".join(row) for row in rows) + "\n")
+
+    expected = read_level(level)
+    model = read_level(level)
+    for game in (expected, model):
+        game.get_player().equip(PoisonDart())
+        # Some slugs start poisoned enough to die asleep, before the player comes by
+        for index, slug in enumerate(game.get_slugs().values()):
+            slug.apply_effects({'poison': index % 6})
+    model.set_active_radius(2)
+    # Runs of moves take the player away from poisoned slugs and back again
+    rng = random.Random(seed)
+    moves = [move for move in random_moves(seed, 150) for _ in range(rng.randint(1, 6))]
+    for turn, move in enumerate(moves, start=1):
+        expected.handle_player_move(move)
+        model.handle_player_move(move)
+        assert model.get_slugs().keys() == expected.get_slugs().keys(), turn
+        if turn % 50 == 0:
+            assert game_state(model) == game_state(expected), turn
+    assert game_state(model) == game_state(expected)
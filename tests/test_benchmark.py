@@ -0,0 +1,21 @@
+"""
+Tests of the benchmark suite.
+"""
+from benchmark import run_benchmarks, find_regressions
+
+
+def test_redraws_timed_without_display():
+    report = run_benchmarks([(10, 12)], repeat=1, turns=5)
+    assert report["redraw"]
+    assert {"redraw_full", "redraw_turn"} <= report["results"]["10x12"].keys()
+    if not report["display"]:
+        assert report["canvas_calls"]["10x12"]["create rectangle"] >= 10 * 12
+
+
+def test_redraws_on_other_canvas_not_compared():
+    report = run_benchmarks([(10, 12)], repeat=1, turns=5)
+    baseline = {**report, "display": not report["display"], "results": {"10x12": {
+        operation: {**timing, "median": timing["median"] / 100}
+        for operation, timing in report["results"]["10x12"].items()}}}
+    operations = {regression["operation"] for regression in find_regressions(report, baseline)}
+    assert operations and not any(operation.startswith("redraw") for operation in operations)
@@ -0,0 +1,34 @@
+"""
+Tests of games on chunked terrain.
+"""
+from a2 import *
+from chunked_terrain import CHUNK_SIZE, ScatteredDungeon, load_chunked_level, new_procedural_model
+from conftest import game_state, random_moves, tile_symbols
+
+
+def test_chunked_level_plays_like_text_level(make_level):
+    level = make_level(2 * CHUNK_SIZE + 10, 2 * CHUNK_SIZE + 5, wall_density=0.05,
+                       slug_density=0.002, weapon_density=0.05, player_health=1000)
+    expected = read_level(level)
+    model = load_chunked_level(level, capacity=1)  # Drops chunks as the player leaves them
+    assert tile_symbols(model) == tile_symbols(expected)
+    moves = [move for move in random_moves(4, 200) for _ in range(3)]  # Runs go further
+    for move in moves:
+        expected.handle_player_move(move)
+        model.handle_player_move(move)
+        assert game_state(model) == game_state(expected)
+    assert tile_symbols(model) == tile_symbols(expected)
+
+
+def test_procedural_dungeon_is_reproducible():
+    start = (5000, 5000)
+    models = [new_procedural_model(ScatteredDungeon(7, start=start), start, capacity=2)
+              for _ in range(2)]
+    for move in random_moves(5, 300):
+        for model in models:
+            model.handle_player_move(move)
+    assert game_state(models[0]) == game_state(models[1])
+    row, col = models[0].get_player_position()
+    nearby = [(r, c) for r in range(row - 3, row + 4) for c in range(col - 3, col + 4)]
+    assert ([str(models[0].get_tile(position)) for position in nearby]
+            == [str(models[1].get_tile(position)) for position in nearby])
@@ -0,0 +1,64 @@
+"""
+Tests of compiling levels and loading compiled levels.
+"""
+import mmap
+import os
+
+import pytest
+
+from a2 import *
+from compiled_level import compile_level, load_compiled_level
+from conftest import game_state, random_moves, tile_symbols
+
+
+def test_failed_compile_leaves_output(make_level, tmp_path):
+    output = str(tmp_path / "level.lvl")
+    compile_level(make_level(), output)
+    with open(output, 'rb') as file:
+        compiled = file.read()
+
+    broken = tmp_path / "broken.txt"
+    broken.write_text("20\n#####\n#P  #\n#P  #\n#####\n")
+    with pytest.raises(LevelError):
+        compile_level(str(broken), output)
+    with open(output, 'rb') as file:
+        assert file.read() == compiled
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_failed_compile_writes_nothing(tmp_path):
+    broken = tmp_path / "broken.txt"
+    broken.write_text("20\n#####\n#P x#\n#####\n")
+    with pytest.raises(LevelError):
+        compile_level(str(broken), str(tmp_path / "level.lvl"))
+    assert os.listdir(tmp_path) == ["broken.txt"]
+
+
+def test_compiled_level_plays_like_text_level(make_level, tmp_path):
+    level = make_level(30, 40, slug_density=0.1, weapon_density=0.1, player_health=100)
+    output = str(tmp_path / "level.lvl")
+    compile_level(level, output)
+    expected = read_level(level)
+    model = load_compiled_level(output)
+    assert model.get_dimensions() == expected.get_dimensions()
+    assert tile_symbols(model) == tile_symbols(expected)
+    assert game_state(model) == game_state(expected)
+    for move in random_moves(3, 80):
+        expected.handle_player_move(move)
+        model.handle_player_move(move)
+        assert game_state(model) == game_state(expected)
+
+
+def test_game_maps_level_without_changing_it(make_level, tmp_path):
+    output = str(tmp_path / "level.lvl")
+    compile_level(make_level(20, 20, slug_density=0.1, weapon_density=0.1), output)
+    with open(output, 'rb') as file:
+        compiled = file.read()
+    model = load_compiled_level(output)
+    assert isinstance(model.get_occupancy_layer().obj, mmap.mmap)
+    for move in random_moves(8, 50):
+        model.handle_player_move(move)
+    clone = model.clone()
+    clone.handle_player_move((0, 1))
+    with open(output, 'rb') as file:
+        assert file.read() == compiled
@@ -0,0 +1,76 @@
+"""
+Tests of the SlugDungeonModel event stream.
+"""
+from a2 import *
+from conftest import random_moves
+
+
+class EventMirror:
+    """
+    Rebuilds slug positions and the player's state from the events alone.
+    """
+
+    def __init__(self, model):
+        self.positions = {id(slug): position for position, slug in model.get_slugs().items()}
+        self.player = model.get_player()
+        self.player_position = model.get_player_position()
+        self.health = self.player.get_health()
+        self.kinds = set()
+
+    def __call__(self, event):
+        self.kinds.add(type(event))
+        if isinstance(event, Moved):
+            if event.entity is self.player:
+                assert self.player_position == event.old_position
+                self.player_position = event.new_position
+            else:
+                assert self.positions[id(event.entity)] == event.old_position
+                self.positions[id(event.entity)] = event.new_position
+        elif isinstance(event, Damaged) and event.entity is self.player:
+            self.health -= event.amount
+        elif isinstance(event, (Died, Removed)) and event.entity is not self.player:
+            assert self.positions.pop(id(event.entity)) == event.position
+
+
+def play_mirrored(model, moves):
+    mirror = EventMirror(model)
+    model.add_listener(mirror)
+    for move in moves:
+        model.handle_player_move(move)
+        assert mirror.positions == {id(slug): position
+                                    for position, slug in model.get_slugs().items()}
+        assert mirror.player_position == model.get_player_position()
+        assert mirror.health == model.get_player().get_health()
+        if model.has_won() or model.has_lost():
+            break
+    return mirror
+
+
+def test_events_replay_to_model_state(make_level):
+    kinds = set()
+    for seed in range(20):
+        level = make_level(12, 12, slug_density=0.3, wall_density=0.1, seed=seed,
+                           player_health=60)
+        kinds |= play_mirrored(load_level(level), random_moves(seed, 150)).kinds
+    # Slugs moving onto the same cell must have happened, and been reported
+    assert Removed in kinds
+    assert {Moved, Attacked, Damaged, TurnEnded} <= kinds
+
+
+def test_events_replay_with_active_region(make_level):
+    for seed in range(10):
+        level = make_level(20, 20, slug_density=0.2, seed=seed, player_health=60)
+        model = load_level(level)
+        model.set_active_radius(4)
+        play_mirrored(model, random_moves(seed, 150))
+
+
+def test_no_events_after_remove_listener(make_level):
+    model = load_level(make_level(seed=1))
+    events = []
+    model.add_listener(events.append)
+    model.handle_player_move((0, 0))
+    model.remove_listener(events.append)
+    count = len(events)
+    model.handle_player_move((0, 0))
+    assert len(events) == count > 0
@@ -0,0 +1,112 @@
+"""
+Tests of SlugDungeonModel's bookkeeping of its cells.
+"""
+from a2 import *
+from conftest import game_state, random_moves, tile_symbols
+
+
+def test_changed_cells_collected_only_once_asked(make_level):
+    model = read_level(make_level(slug_density=0.1, player_health=1000))
+    for move in random_moves(0, 50):
+        model.handle_player_move(move)
+    assert model.pop_changed_cells() == set()
+
+    before = model.get_player_position()
+    for move in random_moves(1, 20):
+        model.handle_player_move(move)
+        if model.get_player_position() != before:
+            break
+    assert {before, model.get_player_position()} <= model.pop_changed_cells()
+
+
+def test_weapon_set_through_model_is_picked_up(tmp_path):
+    level = tmp_path / "level.txt"
+    level.write_text("20\n######\n#P  G#\n######\n")
+    model = read_level(str(level))
+    model.pop_changed_cells()
+    model.set_tile_weapon((1, 3), PoisonSword())
+    assert model.get_occupancy((1, 3)) & WEAPON_CELL
+    assert model.pop_changed_cells() == {(1, 3)}
+
+    model.handle_player_move((0, 1))
+    assert model.get_player().get_weapon() is None
+    model.handle_player_move((0, 1))
+    assert isinstance(model.get_player().get_weapon(), PoisonSword)
+    assert model.get_tile((1, 3)).get_weapon() is None
+    assert not model.get_occupancy((1, 3)) & WEAPON_CELL
+
+
+class Bow(Weapon):
+    """
+    A weapon whose range is set per instance.
+    """
+
+    def __init__(self, weapon_range: int):
+        self._range = weapon_range
+
+
+def test_restore_returns_to_snapshot(make_level):
+    level = make_level(20, 20, slug_density=0.1, weapon_density=0.1, player_health=100)
+    model = read_level(level)
+    start = model.snapshot()
+    moves = random_moves(7, 80)
+    for move in moves:
+        model.handle_player_move(move)
+    middle = model.snapshot()
+    state = game_state(model)
+
+    model.restore(start)
+    fresh = read_level(level)
+    assert game_state(model) == game_state(fresh)
+    assert tile_symbols(model) == tile_symbols(fresh)
+    for move in moves:
+        model.handle_player_move(move)
+    model.restore(middle)
+    assert game_state(model) == state
+
+
+def test_weapon_put_back_is_unchanged(tmp_path):
+    level = tmp_path / "level.txt"
+    level.write_text("20\n######\n#PS G#\n######\n")
+    model = read_level(str(level))
+    start = model.snapshot()
+    model.handle_player_move((0, 1))
+    assert model.snapshot().tile_weapons == {(1, 2): None}
+    model.set_tile_weapon((1, 2), PoisonSword())
+    assert model.snapshot().tile_weapons == start.tile_weapons == {}
+
+
+def test_weapon_of_other_range_is_changed():
+    tiles = [[create_tile(symbol) for symbol in row] for row in ("####", "#  #", "####")]
+    tiles[1][2].set_weapon(Bow(2))
+    model = SlugDungeonModel(tiles, {}, Player(20), (1, 1))
+    start = model.snapshot()
+    model.set_tile_weapon((1, 2), Bow(3))
+    assert (1, 2) in model.snapshot().tile_weapons
+    model.restore(start)
+    assert model.get_tile((1, 2)).get_weapon().get_range() == 2
+
+
+class LeftSlug(Slug):
+    """
+    A slug that only knows choose_move, always taking the leftmost candidate.
+    """
+    def choose_move(self, candidates, current_position, player_position):
+        return min(candidates, key=lambda pos: pos[1], default=current_position)
+
+
+def test_flow_field_ai_falls_back_to_choose_move():
+    tiles = [[create_tile(symbol) for symbol in row] for row in ("#######", "#     #", "#######")]
+    model = SlugDungeonModel(tiles, {(1, 4): LeftSlug(5)}, Player(20), (1, 1))
+    model.set_flow_field_ai(True)
+    model.handle_player_move((0, 0))
+    assert list(model.get_slugs()) == [(1, 3)]
+
+
+def test_field_hook_walks_around_walls():
+    candidates = [(1, 5), (2, 4)]
+    walked = {(1, 5): 2, (2, 4): 9}.get  # (2, 4) is nearer, but behind a wall
+    assert AngrySlug().choose_move(candidates, (1, 4), (1, 1)) == (2, 4)
+    assert AngrySlug().choose_move_with_field(candidates, (1, 4), (1, 1), walked) == (1, 5)
+    assert ScaredSlug().choose_move(candidates, (1, 4), (1, 1)) == (1, 5)
+    assert ScaredSlug().choose_move_with_field(candidates, (1, 4), (1, 1), walked) == (2, 4)
@@ -0,0 +1,60 @@
+"""
+Tests of the turn and redraw profiler.
+"""
+import pytest
+
+from a2 import *
+from benchmark import RecordingTk
+from conftest import random_moves
+from profiling import PHASES, MemorySink, Profiler, _get_overriding_classes
+
+
+def get_methods() -> dict[tuple[type, str], object]:
+    """
+    Returns every method the profiler wraps, as each class defines it.
+    """
+    return {(cls, name): cls.__dict__[name]
+            for methods in PHASES.values() for base, name in methods
+            for cls in _get_overriding_classes(base, name)}
+
+
+def test_profiler_records_turns_and_redraws(make_level):
+    model = read_level(make_level(12, 12, slug_density=0.15, player_health=1000))
+    dungeon_map = DungeonMap(RecordingTk(), model.get_dimensions(), size=DUNGEON_MAP_SIZE)
+    originals = get_methods()
+    sink = MemorySink()
+    slugs = 0
+
+    with Profiler(sink) as profiler:
+        assert SlugDungeonModel.end_turn is not originals[(SlugDungeonModel, "end_turn")]
+        for move in random_moves(9, 30):
+            turns = profiler.get_metrics()["counters"]["turns"]
+            count = model.get_slug_count()
+            model.handle_player_move(move)
+            if profiler.get_metrics()["counters"]["turns"] > turns:
+                slugs += count
+            dungeon_map.redraw(model.get_tiles(), model.get_player_position(), model.get_slugs())
+        profiler.export()
+
+    metrics = sink.exports[-1]
+    phases = metrics["phases"]
+    turns = metrics["counters"]["turns"]
+    assert 0 < turns <= 30
+    assert phases["end_turn"]["count"] == turns
+    assert phases["perform_attack"]["count"] >= turns
+    assert phases["get_valid_slug_positions"]["count"] > 0
+    assert phases["map_redraw"]["count"] == 30
+    assert all(sum(phase["counts"]) == phase["count"] for phase in phases.values())
+    assert metrics["counters"]["slugs_processed"] == slugs > 0
+    assert metrics["canvas_items_created"]["DungeonMap"] > 0
+
+    assert get_methods() == originals
+    assert SlugDungeonModel.end_turn is originals[(SlugDungeonModel, "end_turn")]
+    assert "redraw" not in ViewportDungeonMap.__dict__ or (
+        ViewportDungeonMap.redraw is originals[(ViewportDungeonMap, "redraw")])
+
+
+def test_only_one_profiler_enabled():
+    with Profiler():
+        with pytest.raises(RuntimeError):
+            Profiler().enable()
@@ -0,0 +1,74 @@
+"""
+Tests of recording and replaying games.
+"""
+import pytest
+
+from a2 import *
+from conftest import random_moves
+from replay import CHECKPOINT, CHECKPOINT_HEADER, ReplayLog, Replayer, ReplayRecorder, encode_checkpoint
+
+
+@pytest.mark.parametrize("flow_field_ai, active_radius", [(False, None), (True, 4), (False, 6)])
+def test_replay_reproduces_game(make_level, tmp_path, flow_field_ai, active_radius):
+    level = make_level(20, 20, slug_density=0.1, player_health=200)
+    log = str(tmp_path / "game.log")
+    model = read_level(level)
+    model.set_flow_field_ai(flow_field_ai)
+    model.set_active_radius(active_radius)
+    states = [encode_checkpoint(model)]
+    with ReplayRecorder(model, level, log, checkpoint_interval=7):
+        for move in random_moves(2, 60):
+            model.handle_player_move(move)
+            states.append(encode_checkpoint(model))
+
+    replayer = Replayer(log, level)
+    assert replayer.get_log().get_settings() == (flow_field_ai, active_radius)
+    for turn in (60, 15, 3, 0, 44):
+        assert encode_checkpoint(replayer.seek(turn)) == states[turn], turn
+
+
+def test_replay_rejects_other_level(make_level, tmp_path):
+    level = make_level()
+    log = str(tmp_path / "game.log")
+    model = read_level(level)
+    with ReplayRecorder(model, level, log):
+        model.handle_player_move((0, 1))
+    with pytest.raises(ValueError):
+        Replayer(log, make_level(seed=1))
+
+
+def record_game(level: str, log: str, moves: int) -> list[bytes]:
+    """
+    Records random moves with a checkpoint every 7, returning the state after each turn.
+    """
+    model = read_level(level)
+    states = [encode_checkpoint(model)]
+    with ReplayRecorder(model, level, log, checkpoint_interval=7):
+        for move in random_moves(4, moves):
+            model.handle_player_move(move)
+            states.append(encode_checkpoint(model))
+    return states
+
+
+@pytest.mark.parametrize("cut", [1, 5, CHECKPOINT_HEADER.size + 1, CHECKPOINT_HEADER.size + 6])
+def test_log_cut_short_in_checkpoint_replays_complete_records(make_level, tmp_path, cut):
+    level = make_level(20, 20, slug_density=0.1, player_health=200)
+    log = tmp_path / "game.log"
+    states = record_game(level, str(log), 28)
+    data = log.read_bytes()
+    log.write_bytes(data[:data.rindex(CHECKPOINT) + cut])  # In the checkpoint after move 28
+
+    replayer = Replayer(str(log), level)
+    assert len(replayer.get_log()) == 28
+    assert replayer.get_log().get_checkpoint(28)[0] == 21
+    assert encode_checkpoint(replayer.seek(28)) == states[28]
+
+
+def test_checkpoint_is_flushed(make_level, tmp_path):
+    level = make_level()
+    log = str(tmp_path / "game.log")
+    model = read_level(level)
+    with ReplayRecorder(model, level, log, checkpoint_interval=7):
+        for move in random_moves(4, 7):
+            model.handle_player_move(move)
+        assert ReplayLog(log).get_checkpoint(7) == (7, encode_checkpoint(model))
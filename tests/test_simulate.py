@@ -0,0 +1,21 @@
+"""
+Tests of headless batch simulation.
+"""
+from a2 import *
+from simulate import RandomPolicy, ScriptPolicy, run_game, run_games, summarise
+
+
+def test_pool_matches_serial_play(make_level):
+    level = make_level(12, 12, slug_density=0.1, player_health=15)
+    policies = [RandomPolicy(seed) for seed in range(10)] + [ScriptPolicy("ddssddss"),
+                                                             ScriptPolicy("")]
+    serial = [run_game(level, policy, 150) for policy in policies]
+    # The serial games used up the random generators, so the pool gets fresh ones
+    policies = [RandomPolicy(seed) for seed in range(10)] + [ScriptPolicy("ddssddss"),
+                                                             ScriptPolicy("")]
+    pooled = run_games(level, policies, 150, workers=2)
+    assert pooled == serial
+    summary = summarise(pooled)
+    assert summary == summarise(serial)
+    assert summary[WON] + summary[LOST] + summary[UNFINISHED] == summary["games"] == 12
+    assert summary[LOST] and summary[UNFINISHED]
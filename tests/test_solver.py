@@ -0,0 +1,56 @@
+"""
+Tests of the A* solver.
+"""
+from a2 import *
+from conftest import random_moves
+from solver import solve, state_key
+
+
+def test_state_key_depends_only_on_state(make_level):
+    model = load_level(make_level(10, 10, weapon_density=0.3, slug_density=0.0, seed=2))
+    start = model.snapshot()
+    for move in random_moves(0, 200):
+        model.handle_player_move(move)
+        if model.snapshot().tile_weapons:
+            break
+    assert model.snapshot().tile_weapons, "the player should have picked up a weapon"
+    model.restore(start)
+    assert model.snapshot().tile_weapons == {}
+    assert state_key(model.snapshot()) == state_key(start)
+
+
+class Bow(Weapon):
+    """
+    A weapon whose range is set per instance.
+    """
+
+    def __init__(self, weapon_range: int):
+        self._range = weapon_range
+
+
+def test_state_key_tells_weapon_ranges_apart(tmp_path):
+    level = tmp_path / "level.txt"
+    level.write_text("20\n#####\n#P G#\n#####\n")
+    model = read_level(str(level))
+    model.get_player().equip(Bow(2))
+    short = state_key(model.snapshot())
+    model.get_player().equip(Bow(3))
+    assert state_key(model.snapshot()) != short
+
+
+def test_solution_wins(make_level):
+    solved = 0
+    for seed in range(5):
+        level = make_level(6, 7, slug_density=0.05, wall_density=0.1, seed=seed,
+                           player_health=50)
+        model = load_level(level)
+        result = solve(model, max_states=2_000)
+        if result.moves is None:
+            continue
+        replay = load_level(level)
+        for move in result.moves:
+            replay.handle_player_move(move)
+        assert replay.has_won()
+        solved += 1
+    assert solved
+
@@ -0,0 +1,113 @@
+"""
+Tests of ThreadedSlugDungeon, driven without a Tk mainloop: root.after only queues
+its callbacks, which the test runs itself while the worker thread plays the turns.
+"""
+import time
+
+import pytest
+
+from a2 import *
+from conftest import game_state, random_moves
+
+
+class QueueingRoot:
+    """
+    Stands in for the Tk root, keeping the callbacks passed to after().
+    """
+    def __init__(self) -> None:
+        self.callbacks = []
+
+    def after(self, delay: int, callback) -> None:
+        self.callbacks.append(callback)
+
+    def update_idletasks(self) -> None:
+        pass
+
+
+class PausedTable:
+    """
+    Stands in for the slug table, recording when it is paused.
+    """
+    def __init__(self) -> None:
+        self.paused = []
+
+    def set_paused(self, paused: bool) -> None:
+        self.paused.append(paused)
+
+
+def make_game(filename: str) -> ThreadedSlugDungeon:
+    """
+    Returns a ThreadedSlugDungeon with its worker thread running but no window.
+    """
+    game = ThreadedSlugDungeon.__new__(ThreadedSlugDungeon)
+    game.root = QueueingRoot()
+    game.slug_info = PausedTable()
+    game.redraw = lambda full=False: None
+    game.filename = filename
+    game.model = load_level(filename)
+    # Only the parts of __init__ that do not build the window
+    game._turns, game._finished = queue.Queue(), queue.Queue()
+    game._busy, game._pending_move = False, None
+    threading.Thread(target=game._play_turns, daemon=True).start()
+    return game
+
+
+def record_moves(model: SlugDungeonModel) -> list:
+    """
+    Makes the model record each move it is asked to play, and returns the record.
+    """
+    played = []
+    handle_player_move = model.handle_player_move
+
+    def recording(position_delta):
+        played.append(position_delta)
+        handle_player_move(position_delta)
+    model.handle_player_move = recording
+    return played
+
+
+def run_callbacks(game: ThreadedSlugDungeon, timeout: float = 5) -> None:
+    """
+    Runs the callbacks the game passed to after() until no turn is being played.
+    """
+    deadline = time.monotonic() + timeout
+    while game.root.callbacks or game._busy:
+        assert time.monotonic() < deadline, "turn never finished"
+        if game.root.callbacks:
+            game.root.callbacks.pop(0)()
+        else:
+            time.sleep(0.001)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_move_pressed_during_turn_is_played_next(make_level, seed):
+    filename = make_level(10, 10, slug_density=0.1, player_health=1000)
+    game = make_game(filename)
+    played = record_moves(game.model)
+    reference = load_level(filename)
+
+    for first, second in zip(*[iter(random_moves(seed, 20))] * 2):
+        game.play_move(first)
+        game.play_move(second)  # Pressed while the first is still being played
+        assert game._pending_move == second
+        run_callbacks(game)
+        reference.handle_player_move(first)
+        reference.handle_player_move(second)
+        assert not (reference.has_won() or reference.has_lost())  # No dialog to answer
+
+    assert played == random_moves(seed, 20)
+    assert game_state(game.model) == game_state(reference)
+    assert game.slug_info.paused == [True, False] * 20
+
+
+def test_moves_pressed_during_turn_are_coalesced(make_level):
+    filename = make_level(10, 10, slug_density=0.1, player_health=1000)
+    game = make_game(filename)
+    played = record_moves(game.model)
+    moves = random_moves(5, 4)
+
+    for move in moves:
+        game.play_move(move)
+    run_callbacks(game)
+
+    assert played == [moves[0], moves[-1]]
@@ -0,0 +1,42 @@
+"""
+Tests of the NumPy turn engine against SlugDungeonModel's own turns.
+"""
+import pytest
+
+from a2 import *
+from conftest import random_moves
+from replay import encode_checkpoint
+
+np = pytest.importorskip("numpy")
+from vector_engine import VectorTurnEngine  # noqa: E402
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_engine_plays_like_model(make_level, seed):
+    level = make_level(15, 18, slug_density=0.2, weapon_density=0.05, player_health=60,
+                       seed=seed)
+    expected = read_level(level)
+    model = read_level(level)
+    engine = VectorTurnEngine(model)
+    for turn, move in enumerate(random_moves(seed, 120), start=1):
+        expected.handle_player_move(move)
+        engine.handle_player_move(move)
+        engine.sync()
+        assert encode_checkpoint(model) == encode_checkpoint(expected), turn
+        assert model.snapshot().tile_weapons.keys() == expected.snapshot().tile_weapons.keys()
+        assert engine.has_won() == expected.has_won()
+        assert engine.has_lost() == expected.has_lost()
+        if expected.has_won() or expected.has_lost():
+            break
+
+
+def test_engine_refuses_other_modes(make_level):
+    level = make_level()
+    model = read_level(level)
+    model.set_flow_field_ai(True)
+    with pytest.raises(ValueError):
+        VectorTurnEngine(model)
+    model = read_level(level)
+    model.set_active_radius(3)
+    with pytest.raises(ValueError):
+        VectorTurnEngine(model)
@@ -0,0 +1,39 @@
+"""
+Tests of the views, drawn in a RecordingTk so that no display is needed.
+"""
+import pytest
+
+from a2 import *
+from benchmark import RecordingTk
+
+
+class ChangingSlug(AngrySlug):
+    """
+    A slug that must not be read, as if another thread were changing it.
+    """
+    readable = True
+
+    def get_health(self) -> int:
+        assert self.readable, "read while paused"
+        return super().get_health()
+
+
+@pytest.fixture
+def table():
+    return SlugInfoTable(RecordingTk(), dimensions=(7, 5), size=SLUG_INFO_SIZE)
+
+
+def test_paused_table_does_not_read_slugs(table):
+    slugs = {(row, 1): ChangingSlug() for row in range(10)}
+    table.redraw(slugs, (0, 0))
+    table.set_paused(True)
+    ChangingSlug.readable = False
+    try:
+        table.scroll(2)
+        assert table._cell_text[0][1] == "(0, 1)"
+        table.sort_by("health")
+        table.scroll(3)
+    finally:
+        ChangingSlug.readable = True
+    table.set_paused(False)
+    assert table._cell_text[0][1] == "(3, 1)"
@@ -0,0 +1,50 @@
+"""
+Tests of weapon targeting and attacks.
+"""
+from a2 import *
+
+
+class Bow(Weapon):
+    """
+    A weapon written the way the original Weapon class documented: its properties
+    are set on the instance.
+    """
+
+    def __init__(self):
+        self._name = "Bow"
+        self._range = 3
+
+
+def write_level(tmp_path, rows: list[str]) -> str:
+    filename = str(tmp_path / "level.txt")
+    with open(filename, 'w') as file:
+        file.write("20\n" + "\n".join(rows) + "\n")
+    return filename
+
+
+def test_instance_range_targets():
+    targets = Bow().get_targets((5, 5))
+    assert len(targets) == 12
+    assert {(8, 5), (2, 5), (5, 8), (5, 2)} <= set(targets)
+
+
+def test_class_targets_are_a_cross():
+    for weapon_class in (PoisonDart, PoisonSword, HealingRock):
+        weapon = weapon_class()
+        reach = weapon.get_reach()
+        targets = weapon.get_targets((4, 4))
+        assert len(targets) == 4 * reach
+        assert all(abs(row - 4) + abs(col - 4) <= reach and (row == 4 or col == 4)
+                   for row, col in targets)
+
+
+def test_slug_with_instance_range_hits_player(tmp_path):
+    # The slug stands three cells from the player, beyond PoisonSword's reach
+    model = read_level(write_level(tmp_path, ["#######", "#P  A #", "#######"]))
+    slug = model.get_slugs()[(1, 4)]
+    slug.equip(Bow())
+    events = []
+    model.add_listener(events.append)
+    model.perform_attack(slug, (1, 4))
+    assert any(isinstance(event, Attacked) and event.target is model.get_player()
+               for event in events)
@@ -0,0 +1,327 @@
+"""
+A vectorised turn engine for SlugDungeonModel.
+
+Slug state is kept in parallel NumPy arrays (position, health, poison, kind,
+move parity and weapon) so that poison, movement and attacks are applied to
+every slug at once. Results are identical to SlugDungeonModel.end_turn, which
+processes slugs one at a time in dict order.
+"""
+from typing import Optional
+
+import numpy as np
+
+from a2 import *
+
+# Kinds of slug the engine knows how to move, keyed by their choose_move method
+NICE_KIND = 0
+ANGRY_KIND = 1
+SCARED_KIND = 2
+SLUG_KINDS = {
+    NiceSlug.choose_move: NICE_KIND,
+    AngrySlug.choose_move: ANGRY_KIND,
+    ScaredSlug.choose_move: SCARED_KIND,
+}
+
+NO_SLUG = -1  # Marks an empty cell in the slug index grid
+
+
+class VectorTurnEngine:
+    """
+    Runs turns of a SlugDungeonModel on NumPy arrays instead of slug objects.
+
+    While the engine is driving a model, the model's slug objects, slug dictionary and
+    the player's past position are only brought up to date by sync(). The player,
+    tiles and weapons on tiles are updated in place on the model every turn.
+    """
+
+    def __init__(self, model: SlugDungeonModel) -> None:
+        """
+        Builds the slug arrays from the current state of the model.
+
+        Args:
+            model (SlugDungeonModel): The model to drive.
+
+        Raises:
+            ValueError: If the model contains a slug or weapon the engine cannot simulate,
+                or uses the distance field AI or active region simulation.
+        """
+        if model.get_flow_field_ai():
+            raise ValueError("Cannot vectorise the distance field AI")
+        if model.get_active_radius() is not None:
+            raise ValueError("Cannot vectorise active region simulation")
+        self._model = model
+        self._rows, self._cols = model.get_dimensions()
+        self._weapon_kinds: dict[tuple[type, int], int] = {}  # (type, range) -> weapon index
+
+        cells = self._rows * self._cols
+        self._walls = (np.frombuffer(model.get_occupancy_layer(), dtype=np.uint8) & WALL_CELL) != 0
+        self._player_past_position = model.snapshot().player_past_position
+
+        slugs = model.get_slugs()
+        self._objects = np.empty(len(slugs), dtype=object)
+        self._objects[:] = list(slugs.values())
+        self._position = np.array([row * self._cols + col for row, col in slugs],
+                                  dtype=np.int64)
+        self._health = np.array([slug.get_health() for slug in slugs.values()], dtype=np.int64)
+        self._max_health = np.array([slug.get_max_health() for slug in slugs.values()],
+                                    dtype=np.int64)
+        self._poison = np.array([slug.get_poison() for slug in slugs.values()], dtype=np.int64)
+        self._kind = np.array([self._get_kind(slug) for slug in slugs.values()], dtype=np.int8)
+        self._can_move = np.array([slug.can_move() for slug in slugs.values()], dtype=bool)
+        self._weapon = np.array([self._get_weapon_index(slug.get_weapon())
+                                 for slug in slugs.values()], dtype=np.int64)
+        self._present = np.ones(len(slugs), dtype=bool)  # False once killed by the player
+        self._build_weapon_table()
+
+        self._slug_at = np.full(cells, NO_SLUG, dtype=np.int64)
+        self._slug_at[self._position] = np.arange(len(self._position))
+
+    @staticmethod
+    def _get_kind(slug: Slug) -> int:
+        """
+        Returns the kind code used for the given slug's movement.
+
+        Args:
+            slug (Slug): The slug to classify.
+
+        Returns:
+            int: One of NICE_KIND, ANGRY_KIND or SCARED_KIND.
+        """
+        kind = SLUG_KINDS.get(type(slug).choose_move)
+        if kind is None:
+            raise ValueError(f"Cannot vectorise the movement of {slug!r}")
+        return kind
+
+    def _get_weapon_index(self, weapon: Optional[Weapon]) -> int:
+        """
+        Returns the index of the weapon's kind in the engine's weapon table, adding it if needed.
+
+        Args:
+            weapon (Optional[Weapon]): The weapon carried by a slug.
+
+        Returns:
+            int: The index into the weapon table, or -1 if the slug is unarmed.
+        """
+        if weapon is None:
+            return -1
+        if type(weapon).get_targets is not Weapon.get_targets:
+            raise ValueError(f"Cannot vectorise the targets of {weapon!r}")
+        return self._weapon_kinds.setdefault(get_weapon_kind(weapon), len(self._weapon_kinds))
+
+    def _build_weapon_table(self) -> None:
+        """
+        Builds the per-weapon range array for the weapons carried by slugs.
+        An extra trailing entry with range 0 stands for an unarmed slug.
+        """
+        ranges = [weapon_range for _, weapon_range in self._weapon_kinds]
+        self._weapon_range = np.array(ranges + [0], dtype=np.int64)
+
+    def handle_player_move(self, position_delta: Position) -> None:
+        """
+        Moves the player based on the given position delta, picking up weapons and
+        triggering attacks as necessary, as SlugDungeonModel.handle_player_move does.
+
+        Args:
+            position_delta (Position): The change in position for the player's move.
+        """
+        model = self._model
+        row = model.get_player_position()[0] + position_delta[0]
+        col = model.get_player_position()[1] + position_delta[1]
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return
+        index = row * self._cols + col
+        if self._walls[index] or self._slug_at[index] != NO_SLUG:
+            return
+
+        model._move_player((row, col))
+        self._player_attack()
+        self.end_turn()
+
+    def _player_attack(self) -> None:
+        """
+        Applies the player's weapon effects to every slug in range.
+        """
+        model = self._model
+        player = model.get_player()
+        effects = player.get_weapon_effect()
+        damage = effects.get('damage', 0)
+        healing = effects.get('healing', 0)
+        poison = effects.get('poison', 0)
+
+        for row, col in player.get_weapon_targets(model.get_player_position()):
+            if not (0 <= row < self._rows and 0 <= col < self._cols):
+                continue
+            index = row * self._cols + col
+            slug = self._slug_at[index]
+            if slug == NO_SLUG:
+                continue
+            health = max(0, int(self._health[slug]) - damage)
+            self._health[slug] = min(int(self._max_health[slug]), health + healing)
+            self._poison[slug] += poison
+            if self._health[slug] <= 0:
+                self._write_back(slug)
+                model.set_tile_weapon((row, col), self._objects[slug].get_weapon())
+                self._present[slug] = False
+                self._slug_at[index] = NO_SLUG
+
+    def end_turn(self) -> None:
+        """
+        Handles end of turn actions including applying poison effects, slug movements
+        and slug attacks for every slug at once.
+        """
+        model = self._model
+        player = model.get_player()
+        player.apply_poison()
+        cols = self._cols
+
+        # Poison every slug
+        health, poison = self._health, self._poison
+        poisoned = poison > 0
+        health[poisoned] = np.maximum(0, health[poisoned] - poison[poisoned])
+        poison[poisoned] -= 1
+
+        present = self._present
+        alive = present & (health > 0)
+        for slug in np.flatnonzero(present & ~alive):
+            self._write_back(slug)
+            weapon = self._objects[slug].get_weapon()
+            if weapon:
+                model.set_tile_weapon(divmod(int(self._position[slug]), cols), weapon)
+
+        # Choose moves against the positions held at the start of the turn
+        new_position = self._position.copy()
+        movers = np.flatnonzero(alive & self._can_move & (self._kind != NICE_KIND))
+        if len(movers):
+            new_position[movers] = self._choose_moves(movers)
+
+        # Attack the player from the new positions, in dict order
+        player_row, player_col = model.get_player_position()
+        attack_range = self._weapon_range[self._weapon]
+        row_diff = np.abs(new_position // cols - player_row)
+        col_diff = np.abs(new_position % cols - player_col)
+        in_range = (((row_diff == 0) & (col_diff >= 1) & (col_diff <= attack_range))
+                    | ((col_diff == 0) & (row_diff >= 1) & (row_diff <= attack_range)))
+        for slug in np.flatnonzero(alive & in_range):
+            player.apply_effects(self._objects[slug].get_weapon_effect())
+
+        self._can_move[alive] = ~self._can_move[alive]
+        self._rebuild(np.flatnonzero(alive), new_position)
+        self._player_past_position = model.get_player_position()
+
+    def _choose_moves(self, movers: np.ndarray) -> np.ndarray:
+        """
+        Chooses the new position of each moving slug, as AngrySlug.choose_move and
+        ScaredSlug.choose_move would from the candidates given by the model.
+
+        Args:
+            movers (np.ndarray): Indices of the slugs that move this turn.
+
+        Returns:
+            np.ndarray: The chosen flat position of each moving slug.
+        """
+        rows, cols = self._rows, self._cols
+        blocked = self._walls.copy()
+        blocked[self._position[self._present]] = True
+        player_row, player_col = self._model.get_player_position()
+        blocked[player_row * cols + player_col] = True
+
+        current = self._position[movers]
+        deltas = np.array([(0, 0)] + list(POSITION_DELTAS), dtype=np.int64)
+        candidate_row = (current // cols)[:, None] + deltas[:, 0]
+        candidate_col = (current % cols)[:, None] + deltas[:, 1]
+        valid = ((candidate_row >= 0) & (candidate_row < rows)
+                 & (candidate_col >= 0) & (candidate_col < cols))
+        candidate = np.where(valid, candidate_row * cols + candidate_col, 0)
+        valid &= ~blocked[candidate]
+        valid[:, 0] = True  # Staying put is always a candidate
+
+        past_row, past_col = self._player_past_position
+        distance = (candidate_row - past_row) ** 2 + (candidate_col - past_col) ** 2
+
+        # AngrySlugs take the closest candidate, breaking ties on (row, column)
+        side = max(rows, cols) + 2
+        closest = (distance * side + (candidate_row + 1)) * side + (candidate_col + 1)
+        closest = np.where(valid, closest, np.iinfo(np.int64).max).argmin(axis=1)
+        # ScaredSlugs take the first of the farthest candidates
+        farthest = np.where(valid, distance, -1).argmax(axis=1)
+
+        choice = np.where(self._kind[movers] == ANGRY_KIND, closest, farthest)
+        return candidate[np.arange(len(movers)), choice]
+
+    def _rebuild(self, survivors: np.ndarray, new_position: np.ndarray) -> None:
+        """
+        Compacts the slug arrays to the surviving slugs at their new positions.
+        When two slugs end on the same cell the later one in dict order replaces the
+        earlier one and takes its place in the order, as assigning into a dict does.
+
+        Args:
+            survivors (np.ndarray): Indices of the slugs still alive, in dict order.
+            new_position (np.ndarray): The flat position of every slug after moving.
+        """
+        self._slug_at[self._position] = NO_SLUG
+        positions = new_position[survivors]
+        cells, first = np.unique(positions, return_index=True)
+        if len(cells) == len(positions):
+            keep = survivors
+        else:
+            last = len(positions) - 1 - np.unique(positions[::-1], return_index=True)[1]
+            keep = survivors[last[np.argsort(first)]]
+            for slug in np.setdiff1d(survivors, keep):
+                self._write_back(slug)
+
+        self._position = new_position[keep]
+        self._health = self._health[keep]
+        self._max_health = self._max_health[keep]
+        self._poison = self._poison[keep]
+        self._kind = self._kind[keep]
+        self._can_move = self._can_move[keep]
+        self._weapon = self._weapon[keep]
+        self._objects = self._objects[keep]
+        self._present = np.ones(len(keep), dtype=bool)
+        self._slug_at[self._position] = np.arange(len(keep))
+
+    def _write_back(self, slug: int) -> None:
+        """
+        Copies the array state of one slug back onto its slug object.
+
+        Args:
+            slug (int): The index of the slug in the engine's arrays.
+        """
+        obj = self._objects[slug]
+        obj._health = int(self._health[slug])
+        obj._poison = int(self._poison[slug])
+        obj.can_move_next_turn = bool(self._can_move[slug])
+
+    def sync(self) -> None:
+        """
+        Writes the slug arrays and the player's past position back to the model, by
+        restoring the model to a snapshot of the engine's state.
+        """
+        cols = self._cols
+        present = np.flatnonzero(self._present)
+        positions = [divmod(position, cols) for position in self._position[present].tolist()]
+        slugs = tuple(zip(positions, self._objects[present], self._health[present].tolist(),
+                          self._poison[present].tolist(), self._can_move[present].tolist()))
+        model = self._model
+        model.restore(model.snapshot()._replace(player_past_position=self._player_past_position,
+                                                slugs=slugs))
+
+    def has_won(self) -> bool:
+        """
+        Checks if the player has won the game (all slugs are defeated, and the player is on the goal).
+
+        Returns:
+            bool: True if the player has won, False otherwise.
+        """
+        model = self._model
+        return (not self._present.any()
+                and bool(model.get_occupancy(model.get_player_position()) & GOAL_CELL))
+
+    def has_lost(self) -> bool:
+        """
+        Checks if the player has lost the game (player health is 0 or below).
+
+        Returns:
+            bool: True if the player has lost, False otherwise.
+        """
+        return self._model.has_lost()